@@ -6,6 +6,7 @@ executing `historical_runner.py` in parallel using multiprocessing.
 
 Output:
   - validation_data.json (list of 100 results)
+  - per-target yield volatility (CV), aggregated as results stream in
 
 Notes on year range:
   We use Python's range semantics (start inclusive, end exclusive):
@@ -22,6 +23,8 @@ from dataclasses import dataclass
 from multiprocessing import cpu_count, get_context
 from typing import Any
 
+from physics_engine import YieldAccumulator
+
 
 @dataclass(frozen=True)
 class Target:
@@ -112,7 +115,11 @@ def main() -> None:
 
     ctx = get_context("spawn")
     with ctx.Pool(processes=processes) as pool:
-        results = list(pool.imap_unordered(_run_one, jobs))
+        results = []
+        volatility: dict[str, YieldAccumulator] = {t.name: YieldAccumulator() for t in TARGETS}
+        for result in pool.imap_unordered(_run_one, jobs):
+            volatility[result["target"]["name"]].update(result["yield_pct"])
+            results.append(result)
 
     # Stable ordering (by location then year) for diff-friendly output.
     results.sort(key=lambda r: (r["target"]["name"], r["year"]))
@@ -123,6 +130,9 @@ def main() -> None:
 
     print(f"Wrote {len(results)} results to {OUTPUT_FILE}")
 
+    for name, acc in volatility.items():
+        print(f"  {name}: mean_yield={acc.mean:.2f}%, volatility_cv={acc.cv():.2f}% (n={acc.count})")
+
 
 if __name__ == "__main__":
     main()
@@ -11,7 +11,7 @@ import pandas as pd
 from supabase import create_client, Client
 import requests
 
-from physics_engine import simulate_maize_yield
+from physics_engine import calculate_paired_yield
 
 
 def run_batch_job(job_id: str) -> Dict[str, Any]:
@@ -54,6 +54,13 @@ def run_batch_job(job_id: str) -> Dict[str, Any]:
         STRESS_TEMP = 35.0
         STRESS_RAIN = 400.0
         
+        # The stress scenario is the same for every asset: evaluate both seed types once
+        stress = calculate_paired_yield(temp=STRESS_TEMP, rain=STRESS_RAIN, crop_type='maize')
+        standard_yield = stress.standard_yield
+        resilient_yield = stress.resilient_yield
+        avoided_loss = stress.avoided_loss
+        percentage_improvement = stress.percentage_improvement
+        
         processed_count = 0
         errors = []
         
@@ -63,23 +70,6 @@ def run_batch_job(job_id: str) -> Dict[str, Any]:
                 asset_id = asset['id']
                 print(f"[BATCH] Processing asset {asset_id}", file=sys.stderr, flush=True)
                 
-                # Run predictions for both seed types
-                standard_yield = simulate_maize_yield(
-                    temp=STRESS_TEMP,
-                    rain=STRESS_RAIN,
-                    seed_type=0  # Standard seed
-                )
-                
-                resilient_yield = simulate_maize_yield(
-                    temp=STRESS_TEMP,
-                    rain=STRESS_RAIN,
-                    seed_type=1  # Resilient seed
-                )
-                
-                # Calculate avoided loss
-                avoided_loss = resilient_yield - standard_yield
-                percentage_improvement = (avoided_loss / standard_yield * 100) if standard_yield > 0 else 0.0
-                
                 # Update the asset record in Supabase
                 update_data = {
                     'standard_yield': round(standard_yield, 2),
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the physics engine with regression baselines.
+
+Measures throughput (yield evaluations per second) of each evaluation path:
+  - scalar:        calculate_yield, one call per input
+  - batch:         calculate_yield_batch
+  - sensitivities: calculate_yield_batch(..., sensitivities=True)
+  - paired:        calculate_paired_yield_batch (two evaluations per input)
+  - lookup:        calculate_yield_batch(..., method='lookup') (needs the surfaces)
+
+Inputs cycle through all five crops and both seed types, so every parameter
+row and branch is exercised. The scalar path is capped at --max-scalar-size
+inputs because it is several orders of magnitude slower.
+
+Record a baseline:
+  python benchmark_physics.py run --output physics_benchmark.json
+
+Check for regressions against it (exit code 1 if any case is slower than
+the baseline by more than --threshold):
+  python benchmark_physics.py compare --baseline physics_benchmark.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from physics_engine import (
+    CROP_NAMES,
+    calculate_paired_yield_batch,
+    calculate_yield,
+    calculate_yield_batch,
+)
+
+
+MODES = ('scalar', 'batch', 'sensitivities', 'paired', 'lookup')
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_MAX_SCALAR_SIZE = 100_000
+DEFAULT_REPEATS = 3
+DEFAULT_THRESHOLD_PCT = 20.0
+DEFAULT_BASELINE_PATH = 'physics_benchmark.json'
+
+
+def _make_inputs(size: int, random_seed: int = 0) -> dict:
+    """Random climate inputs cycling through every crop and seed type."""
+    rng = np.random.default_rng(random_seed)
+    index = np.arange(size)
+    return {
+        'temp': rng.uniform(10.0, 45.0, size),
+        'rain': rng.uniform(0.0, 4000.0, size),
+        'seed_type': index % 2,
+        'crop_type': (index // 2) % len(CROP_NAMES),
+        'temp_delta': rng.uniform(-3.0, 5.0, size),
+        'rain_pct_change': rng.uniform(-50.0, 50.0, size),
+    }
+
+
+def _run_mode(mode: str, inputs: dict) -> None:
+    if mode == 'scalar':
+        for temp, rain, seed_type, code, temp_delta, rain_pct in zip(
+            inputs['temp'].tolist(),
+            inputs['rain'].tolist(),
+            inputs['seed_type'].tolist(),
+            inputs['crop_type'].tolist(),
+            inputs['temp_delta'].tolist(),
+            inputs['rain_pct_change'].tolist(),
+        ):
+            calculate_yield(temp, rain, seed_type, CROP_NAMES[code], temp_delta, rain_pct)
+    elif mode == 'batch':
+        calculate_yield_batch(**inputs)
+    elif mode == 'sensitivities':
+        calculate_yield_batch(**inputs, sensitivities=True)
+    elif mode == 'paired':
+        calculate_paired_yield_batch(
+            inputs['temp'], inputs['rain'], inputs['crop_type'], inputs['temp_delta'], inputs['rain_pct_change']
+        )
+    elif mode == 'lookup':
+        calculate_yield_batch(**inputs, method='lookup')
+    else:
+        raise ValueError(f"Unsupported mode: {mode}. Use one of {', '.join(MODES)}")
+
+
+def _lookup_available() -> bool:
+    from yield_lookup import load_yield_surfaces
+
+    try:
+        load_yield_surfaces()
+    except (FileNotFoundError, ValueError):
+        return False
+    return True
+
+
+def run_benchmarks(
+    modes=MODES,
+    sizes=DEFAULT_SIZES,
+    repeats: int = DEFAULT_REPEATS,
+    max_scalar_size: int = DEFAULT_MAX_SCALAR_SIZE,
+) -> dict:
+    """
+    Time every (mode, size) case and return the results.
+
+    Each case reports the best of `repeats` timings (least disturbed by
+    other load) after one untimed warm-up run.
+
+    Returns:
+        Dictionary with environment metadata and a 'cases' mapping of
+        'mode/size' to seconds, evaluations per second and ns per evaluation
+    """
+    cases = {}
+    skipped = []
+
+    if 'lookup' in modes and not _lookup_available():
+        skipped.append('lookup (surfaces not built; run `python yield_lookup.py --build`)')
+        modes = [mode for mode in modes if mode != 'lookup']
+        print(f"  skipping {skipped[-1]}", file=sys.stderr, flush=True)
+
+    for size in sizes:
+        inputs = _make_inputs(size)
+        for mode in modes:
+            if mode == 'scalar' and size > max_scalar_size:
+                continue
+
+            _run_mode(mode, _make_inputs(min(size, 1_000)))  # Warm-up
+
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                _run_mode(mode, inputs)
+                timings.append(time.perf_counter() - start)
+
+            best = min(timings)
+            evaluations = size * 2 if mode == 'paired' else size
+            cases[f'{mode}/{size}'] = {
+                'mode': mode,
+                'size': size,
+                'seconds': round(best, 6),
+                'evals_per_sec': round(evaluations / best, 1),
+                'ns_per_eval': round(best / evaluations * 1e9, 2),
+            }
+            print(
+                f"  {mode:>13} n={size:>10,}: {evaluations / best:>14,.0f} evals/s "
+                f"({best / evaluations * 1e9:,.1f} ns/eval)",
+                file=sys.stderr,
+                flush=True,
+            )
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'skipped': skipped,
+        'cases': cases,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold_pct: float = DEFAULT_THRESHOLD_PCT) -> dict:
+    """
+    Compare throughput case by case against a baseline.
+
+    A case regresses when its throughput drops by more than `threshold_pct`
+    percent. Cases present in only one of the two runs are ignored.
+
+    Returns:
+        Dictionary with per-case throughput change and the list of regressions
+    """
+    comparisons = {}
+    regressions = []
+
+    for key, base_case in baseline['cases'].items():
+        if key not in current['cases']:
+            continue
+        change_pct = (current['cases'][key]['evals_per_sec'] / base_case['evals_per_sec'] - 1.0) * 100
+        comparisons[key] = {
+            'baseline_evals_per_sec': base_case['evals_per_sec'],
+            'current_evals_per_sec': current['cases'][key]['evals_per_sec'],
+            'change_pct': round(change_pct, 1),
+        }
+        if change_pct < -threshold_pct:
+            regressions.append(key)
+
+    return {
+        'threshold_pct': threshold_pct,
+        'comparisons': comparisons,
+        'regressions': regressions,
+    }
+
+
+def _parse_sizes(text: str) -> list[int]:
+    return [int(float(value)) for value in text.split(',')]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark physics engine evaluation paths')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (
+        ('run', 'Run the benchmarks and write the results as a baseline'),
+        ('compare', 'Run the benchmarks and compare them against a baseline'),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--modes', type=str, default=','.join(MODES),
+                         help=f"Comma-separated modes (default: {','.join(MODES)})")
+        sub.add_argument('--sizes', type=_parse_sizes, default=list(DEFAULT_SIZES),
+                         help='Comma-separated input sizes (default: 1e3,1e4,1e5,1e6,1e7)')
+        sub.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                         help=f'Timed runs per case; the best is kept (default: {DEFAULT_REPEATS})')
+        sub.add_argument('--max-scalar-size', type=int, default=DEFAULT_MAX_SCALAR_SIZE,
+                         help=f'Largest size run through the scalar path (default: {DEFAULT_MAX_SCALAR_SIZE:,})')
+
+    subparsers.choices['run'].add_argument('--output', type=str, default=DEFAULT_BASELINE_PATH,
+                                           help=f'Results JSON path (default: {DEFAULT_BASELINE_PATH})')
+    compare_parser = subparsers.choices['compare']
+    compare_parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE_PATH,
+                                help=f'Baseline JSON path (default: {DEFAULT_BASELINE_PATH})')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_PCT,
+                                help=f'Allowed throughput drop in percent (default: {DEFAULT_THRESHOLD_PCT})')
+
+    args = parser.parse_args()
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+
+    if args.command == 'compare' and not os.path.exists(args.baseline):
+        parser.error(f"Baseline {args.baseline} not found; record one with `python benchmark_physics.py run`")
+
+    results = run_benchmarks(modes, args.sizes, args.repeats, args.max_scalar_size)
+
+    if args.command == 'run':
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"Wrote {len(results['cases'])} benchmark cases to {args.output}")
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    report = compare_results(baseline, results, args.threshold)
+    for key, comparison in report['comparisons'].items():
+        flag = '  REGRESSION' if key in report['regressions'] else ''
+        print(f"{key:>24}: {comparison['change_pct']:+7.1f}%{flag}")
+
+    if report['regressions']:
+        print(f"{len(report['regressions'])} case(s) regressed by more than {args.threshold}%")
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold}%")
+
+
+if __name__ == '__main__':
+    main()
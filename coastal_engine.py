@@ -5,9 +5,15 @@
 import json
 import os
 import ee
+import numpy as np
 from gee_credentials import load_gee_credentials
 
 
+# Storm return periods (years) and their baseline surge heights (from research)
+RETURN_PERIODS_YEARS = (1, 10, 50, 100)
+BASE_SURGE_HEIGHTS_M = (0.6, 1.2, 1.9, 2.5)
+
+
 def authenticate_gee():
     """
     Authenticate with Google Earth Engine using service account.
@@ -121,10 +127,7 @@ def calculate_flood_frequency(slr_meters: float) -> dict:
     """
     # Baseline Surge Heights (from research)
     base_surges = {
-        '1yr': 0.6,
-        '10yr': 1.2,
-        '50yr': 1.9,
-        '100yr': 2.5
+        f'{period}yr': surge for period, surge in zip(RETURN_PERIODS_YEARS, BASE_SURGE_HEIGHTS_M)
     }
     
     # Calculate future depths by adding sea level rise
@@ -149,6 +152,38 @@ def calculate_flood_frequency(slr_meters: float) -> dict:
     }
 
 
+def calculate_flood_frequency_batch(slr_meters) -> np.ndarray:
+    """
+    Array form of `calculate_flood_frequency` for many SLR scenarios.
+    
+    Args:
+        slr_meters: Sea level rise in meters (scalar or array)
+    
+    Returns:
+        Future surge depths with shape (..., len(RETURN_PERIODS_YEARS)),
+        one column per return period
+    """
+    return np.asarray(slr_meters, dtype=float)[..., None] + np.asarray(BASE_SURGE_HEIGHTS_M)
+
+
+def calculate_return_period_flood_depths(elevation_m, slr_meters) -> np.ndarray:
+    """
+    Flood depth at each storm return period for arrays of sites and SLR scenarios.
+    
+    Depth is the future surge water level above ground, 0 where it stays
+    below the site elevation (same rule as `analyze_flood_risk`).
+    
+    Args:
+        elevation_m: Ground elevation per site in meters
+        slr_meters: Sea level rise in meters, broadcast against the sites
+    
+    Returns:
+        Flood depths with shape (..., len(RETURN_PERIODS_YEARS))
+    """
+    water_levels = calculate_flood_frequency_batch(slr_meters)
+    return np.maximum(0.0, water_levels - np.asarray(elevation_m, dtype=float)[..., None])
+
+
 def analyze_urban_impact(lat: float, lon: float, total_water_level: float) -> dict:
     """
     Analyze urban flood impact within a 5km buffer around a coastal location.
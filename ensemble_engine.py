@@ -0,0 +1,136 @@
+# =============================================================================
+# Ensemble Engine - Seeded Monte Carlo Climate Ensembles for Portfolio Risk
+# =============================================================================
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+from physics_engine import calculate_yield_batch
+
+
+# Natural year-to-year climate variability (uniform perturbation half-widths)
+DEFAULT_TEMP_VARIATION_C = 2.0      # ±2°C
+DEFAULT_RAIN_VARIATION_PCT = 15.0   # ±15%
+
+# Tonnage conversion: assume 1 hectare per location at 10 t/ha max potential
+MAX_POTENTIAL_TONS_PER_HA = 10.0
+
+DEFAULT_RANDOM_SEED = 42
+
+
+def simulate_yield_ensemble(
+    base_temps: Union[float, Sequence[float]],
+    base_rains: Union[float, Sequence[float]],
+    crop_type: str = 'maize',
+    seed_type: int = 1,
+    num_years: int = 10,
+    num_members: int = 1,
+    temp_variation_c: float = DEFAULT_TEMP_VARIATION_C,
+    rain_variation_pct: float = DEFAULT_RAIN_VARIATION_PCT,
+    random_seed: int = DEFAULT_RANDOM_SEED,
+    max_potential_tons: float = MAX_POTENTIAL_TONS_PER_HA,
+    confidence: float = 0.95,
+) -> Dict:
+    """
+    Simulate a climate ensemble for a portfolio of locations in one vectorized pass.
+
+    Draws num_members × num_years × num_locations temperature and rainfall
+    perturbations from a seeded generator and evaluates them with the batch
+    yield kernel. The same inputs and random_seed always give the same result.
+
+    Args:
+        base_temps: Baseline temperature per location (°C)
+        base_rains: Baseline rainfall per location (mm)
+        crop_type: Crop type (see physics_engine.CROP_CODES)
+        seed_type: 0 = Standard, 1 = Resilient
+        num_years: Simulated years per ensemble member
+        num_members: Ensemble members (independent perturbation sets)
+        temp_variation_c: Half-width of the uniform temperature perturbation (°C)
+        rain_variation_pct: Half-width of the uniform rainfall perturbation (%)
+        random_seed: Seed for the random generator
+        max_potential_tons: Tonnage at 100% yield per location
+        confidence: Confidence level for VaR/CVaR (e.g., 0.95)
+
+    Returns:
+        Dictionary with:
+        - 'locations': per-location arrays (mean yield, CV, tonnage, yield percentiles)
+        - 'portfolio': total tonnage distribution metrics, VaR and CVaR of tonnage
+    """
+    base_temps = np.atleast_1d(np.asarray(base_temps, dtype=float))
+    base_rains = np.atleast_1d(np.asarray(base_rains, dtype=float))
+    base_temps, base_rains = np.broadcast_arrays(base_temps, base_rains)
+    num_locations = base_temps.shape[0]
+
+    if num_years < 2 and num_members < 2:
+        raise ValueError("Ensemble needs at least 2 simulated years")
+    if not (0.0 < confidence < 1.0):
+        raise ValueError("confidence must be between 0 and 1")
+
+    rng = np.random.default_rng(random_seed)
+    shape = (num_members * num_years, num_locations)
+    temp_deltas = rng.uniform(-temp_variation_c, temp_variation_c, shape)
+    rain_pct_changes = rng.uniform(-rain_variation_pct, rain_variation_pct, shape)
+
+    # samples × locations yield matrix
+    yields = calculate_yield_batch(
+        temp=base_temps,
+        rain=base_rains,
+        seed_type=seed_type,
+        crop_type=crop_type,
+        temp_delta=temp_deltas,
+        rain_pct_change=rain_pct_changes,
+    )
+    del temp_deltas, rain_pct_changes
+
+    # ========== Per-location statistics ==========
+    mean_yield = yields.mean(axis=0)
+    std_yield = yields.std(axis=0, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        location_cv = np.where(mean_yield == 0, 0.0, std_yield / mean_yield * 100)
+    yield_p5, yield_p50, yield_p95 = np.percentile(yields, [5, 50, 95], axis=0)
+
+    # ========== Portfolio tonnage distribution ==========
+    tonnage_per_sample = yields.sum(axis=1) * (max_potential_tons / 100.0)
+    del yields
+
+    mean_tonnage = float(tonnage_per_sample.mean())
+    std_tonnage = float(tonnage_per_sample.std(ddof=1))
+    tail_pct = (1.0 - confidence) * 100
+    tonnage_p5, tonnage_p50, tonnage_p95, tonnage_tail = np.percentile(
+        tonnage_per_sample, [5, 50, 95, tail_pct]
+    )
+
+    # VaR: shortfall of the tail quantile below the expected tonnage.
+    # CVaR: expected shortfall across the tail beyond that quantile.
+    tail = tonnage_per_sample[tonnage_per_sample <= tonnage_tail]
+    var_tonnage = mean_tonnage - float(tonnage_tail)
+    cvar_tonnage = mean_tonnage - float(tail.mean())
+
+    return {
+        'locations': {
+            'mean_yield_pct': mean_yield,
+            'volatility_cv_pct': location_cv,
+            'tonnage': mean_yield / 100.0 * max_potential_tons,
+            'yield_p5': yield_p5,
+            'yield_p50': yield_p50,
+            'yield_p95': yield_p95,
+        },
+        'portfolio': {
+            'mean_tonnage': mean_tonnage,
+            'tonnage_cv_pct': (std_tonnage / mean_tonnage * 100) if mean_tonnage > 0 else 0.0,
+            'tonnage_p5': float(tonnage_p5),
+            'tonnage_p50': float(tonnage_p50),
+            'tonnage_p95': float(tonnage_p95),
+            'var_tonnage': var_tonnage,
+            'cvar_tonnage': cvar_tonnage,
+            'confidence': confidence,
+        },
+        'simulation': {
+            'num_locations': int(num_locations),
+            'num_years': int(num_years),
+            'num_members': int(num_members),
+            'num_samples': int(shape[0]),
+            'random_seed': int(random_seed),
+        },
+    }
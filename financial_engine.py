@@ -4,6 +4,8 @@
 
 from typing import Optional, List, Tuple
 
+import numpy as np
+
 
 def calculate_npv(cash_flows: List[float], discount_rate: float) -> float:
     """
@@ -98,21 +100,195 @@ def calculate_payback_period(cash_flows: List[float]) -> Optional[float]:
     return None
 
 
-def calculate_roi_metrics(cash_flows: List[float], discount_rate: float) -> dict:
+def calculate_discounted_payback_period(cash_flows: List[float], discount_rate: float) -> Optional[float]:
+    """
+    Calculate Discounted Payback Period.
+    
+    Year when the cumulative *discounted* cash flow turns positive, with the
+    same linear interpolation as `calculate_payback_period`.
+    
+    Args:
+        cash_flows: List of yearly cash flows
+        discount_rate: Discount rate as decimal (e.g., 0.10 for 10%)
+    
+    Returns:
+        Years until discounted payback (float) or None if never positive
+    """
+    discounted = [cash_flow / ((1 + discount_rate) ** t) for t, cash_flow in enumerate(cash_flows)]
+    return calculate_payback_period(discounted)
+
+
+def calculate_irr(cash_flows: List[float]) -> Optional[float]:
+    """
+    Calculate Internal Rate of Return (IRR): the rate at which NPV = 0.
+    
+    Uses the vectorized solver (`calculate_irr_batch`). Where the series has
+    several IRRs, the lowest one is returned.
+    
+    Args:
+        cash_flows: List of yearly cash flows
+    
+    Returns:
+        IRR as decimal (e.g., 0.15 for 15%) or None if there is no IRR
+    """
+    irr = float(calculate_irr_batch([cash_flows])['irr'][0])
+    return None if np.isnan(irr) else irr
+
+
+def annuity_factor(discount_rate, years):
+    """
+    Present value of 1 per year for years 1..N: (1 - (1 + r)^-N) / r.
+    
+    Args:
+        discount_rate: Discount rate as decimal (scalar or array)
+        years: Number of annual payments N (scalar or array)
+    
+    Returns:
+        Annuity factor (N when the rate is 0)
+    """
+    rate = np.asarray(discount_rate, dtype=float)
+    years = np.asarray(years, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (1.0 - (1.0 + rate) ** -years) / rate
+    factor = np.where(rate == 0, years, factor)
+    return float(factor) if factor.ndim == 0 else factor
+
+
+def calculate_annuity_metrics_batch(initial_investment, annual_net_benefit, years, discount_rate) -> dict:
+    """
+    NPV, BCR and payback for level-annuity projects in O(1) per project.
+    
+    Cash flows are [-initial_investment, A, A, ..., A] with A = annual_net_benefit
+    for `years` years, the structure built by `generate_cash_flows`. All
+    arguments broadcast, so a horizon sweep (e.g. years = 5..100) is one call.
+    
+    Returns:
+        Dictionary of unrounded arrays: 'npv', 'bcr', 'payback_period_years'
+        and 'discounted_payback_period_years' (NaN if never paid back)
+    """
+    year0 = -np.asarray(initial_investment, dtype=float)
+    annual = np.asarray(annual_net_benefit, dtype=float)
+    years = np.asarray(years, dtype=float)
+
+    pv_annual = annual * annuity_factor(discount_rate, years)
+    npv = year0 + pv_annual
+
+    # Same sign convention as calculate_bcr: positive flows are benefits
+    pv_benefits = np.where(year0 > 0, year0, 0.0) + np.where(annual > 0, pv_annual, 0.0)
+    pv_costs = np.where(year0 > 0, 0.0, -year0) + np.where(annual > 0, 0.0, -pv_annual)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bcr = np.where(pv_costs == 0, np.where(pv_benefits > 0, np.inf, 0.0), pv_benefits / pv_costs)
+
+    # Cumulative cash flow year0 + t * A reaches zero at t = -year0 / A
+    with np.errstate(divide='ignore', invalid='ignore'):
+        breakeven = -year0 / annual
+    payback = np.where(
+        year0 >= 0,
+        0.0,
+        np.where((annual > 0) & (breakeven <= years), breakeven, np.nan),
+    )
+
+    # Discounted payback: first year k with year0 + A * annuity_factor(r, k) >= 0,
+    # interpolated linearly within year k like the general path
+    rate = np.asarray(discount_rate, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coverage = -year0 * rate / annual
+        exact = np.where(rate == 0, breakeven, -np.log1p(-coverage) / np.log1p(rate))
+        year = np.maximum(np.ceil(exact - 1e-9), 1.0)
+        previous = year0 + annual * annuity_factor(rate, year - 1)
+        flow = annual / (1.0 + rate) ** year
+        discounted_payback = year - 1 + np.abs(previous) / flow
+    discounted_payback = np.where(
+        year0 >= 0,
+        0.0,
+        np.where((annual > 0) & (coverage < 1) & (year <= years), discounted_payback, np.nan),
+    )
+
+    return {
+        'npv': npv,
+        'bcr': bcr,
+        'payback_period_years': payback,
+        'discounted_payback_period_years': discounted_payback,
+    }
+
+
+def calculate_annuity_metrics(
+    initial_investment: float,
+    annual_net_benefit: float,
+    years: int,
+    discount_rate: float,
+    include_irr: bool = False
+) -> dict:
+    """
+    Closed-form `calculate_roi_metrics` for "-capex, then constant net benefit" flows.
+    
+    Equivalent to calculate_roi_metrics(generate_cash_flows(...), discount_rate)
+    but costs the same for a 100-year horizon as for a 10-year one.
+    
+    Args:
+        initial_investment: Year 0 investment (positive number, paid out)
+        annual_net_benefit: Net cash flow in each of years 1..N
+        years: Analysis period N in years
+        discount_rate: Discount rate as decimal (e.g., 0.10 for 10%)
+        include_irr: Also solve for the IRR (see `calculate_annuity_irr_batch`)
+    
+    Returns:
+        Dictionary with the same keys as `calculate_roi_metrics`
+    """
+    metrics = calculate_annuity_metrics_batch(initial_investment, annual_net_benefit, years, discount_rate)
+    payback_period = float(metrics['payback_period_years'])
+    discounted_payback = float(metrics['discounted_payback_period_years'])
+    
+    result = {
+        'npv': round(float(metrics['npv']), 2),
+        'bcr': round(float(metrics['bcr']), 2),
+        'payback_period_years': None if np.isnan(payback_period) else round(payback_period, 2),
+        'discounted_payback_period_years': None if np.isnan(discounted_payback) else round(discounted_payback, 2)
+    }
+    
+    if include_irr:
+        irr = calculate_annuity_irr_batch(initial_investment, annual_net_benefit, years)
+        irr_value = float(irr['irr'])
+        result['irr'] = None if np.isnan(irr_value) else round(irr_value, 4)
+        result['irr_status'] = str(irr['status'])
+    
+    return result
+
+
+def _level_annuity(cash_flows: List[float]) -> Optional[Tuple[float, float]]:
+    """Return (initial_investment, annual_net_benefit) if flows are Year 0 then a constant."""
+    if len(cash_flows) < 2:
+        return None
+    
+    annual = cash_flows[1]
+    for cash_flow in cash_flows[2:]:
+        if cash_flow != annual:
+            return None
+    
+    return -cash_flows[0], annual
+
+
+def calculate_roi_metrics(cash_flows: List[float], discount_rate: float, include_irr: bool = False) -> dict:
     """
     Calculate comprehensive ROI metrics.
     
-    Provides NPV, BCR, and Payback Period for financial decision-making.
+    Provides NPV, BCR, simple/discounted Payback Period and optionally IRR
+    for financial decision-making.
     
     Args:
         cash_flows: List of yearly cash flows (Year 0 = initial investment, usually negative)
         discount_rate: Discount rate as decimal (e.g., 0.10 for 10%)
+        include_irr: Also solve for the IRR (root search, so off by default)
     
     Returns:
         Dictionary with:
         - 'npv': Net Present Value
         - 'bcr': Benefit-Cost Ratio
         - 'payback_period_years': Years to payback (or None)
+        - 'discounted_payback_period_years': Years to discounted payback (or None)
+        - 'irr': Internal Rate of Return as decimal (or None; only with include_irr)
+        - 'irr_status': 'ok', 'no_irr' or 'multiple' (several IRRs; the lowest
+          is reported; only with include_irr)
     
     Example:
         >>> cash_flows = [-100000, 15000, 15000, 15000, 15000, 15000]
@@ -121,7 +297,17 @@ def calculate_roi_metrics(cash_flows: List[float], discount_rate: float) -> dict
         >>> print(f"NPV: ${metrics['npv']:,.2f}")
         >>> print(f"BCR: {metrics['bcr']:.2f}")
         >>> print(f"Payback: {metrics['payback_period_years']:.2f} years")
+    
+    Level-annuity flows (Year 0, then a constant amount) are recognised and
+    evaluated in closed form via `calculate_annuity_metrics`.
     """
+    annuity = _level_annuity(cash_flows)
+    if annuity is not None:
+        initial_investment, annual_net_benefit = annuity
+        return calculate_annuity_metrics(
+            initial_investment, annual_net_benefit, len(cash_flows) - 1, discount_rate, include_irr
+        )
+    
     # Calculate NPV
     npv = calculate_npv(cash_flows, discount_rate)
     
@@ -130,12 +316,23 @@ def calculate_roi_metrics(cash_flows: List[float], discount_rate: float) -> dict
     
     # Calculate Payback Period
     payback_period = calculate_payback_period(cash_flows)
+    discounted_payback = calculate_discounted_payback_period(cash_flows, discount_rate)
     
-    return {
+    result = {
         'npv': round(npv, 2),
         'bcr': round(bcr, 2),
-        'payback_period_years': round(payback_period, 2) if payback_period is not None else None
+        'payback_period_years': round(payback_period, 2) if payback_period is not None else None,
+        'discounted_payback_period_years': round(discounted_payback, 2) if discounted_payback is not None else None
     }
+    
+    # Calculate IRR
+    if include_irr:
+        irr = calculate_irr_batch([cash_flows])
+        irr_value = float(irr['irr'][0])
+        result['irr'] = None if np.isnan(irr_value) else round(irr_value, 4)
+        result['irr_status'] = str(irr['status'][0])
+    
+    return result
 
 
 def generate_cash_flows(
@@ -169,3 +366,638 @@ def generate_cash_flows(
         cash_flows.append(net_annual)
     
     return cash_flows
+
+
+def build_agricultural_cash_flows(
+    standard_yield,
+    resilient_yield,
+    price_per_ton,
+    capex,
+    opex,
+    yield_benefit_pct,
+    analysis_years: int = 10,
+    decimals: Optional[int] = 2,
+    yields_by_year: bool = False
+) -> dict:
+    """
+    Incremental and cumulative cash flows of the resilient-seed project.
+    
+    Business as usual sells the standard-seed yield; the project sells the
+    resilient-seed yield plus its yield benefit and pays OPEX each year:
+    - Year 0: -CAPEX (no revenue yet)
+    - Years 1-N: (resilient_yield * (1 + yield_benefit_pct/100) * price - OPEX)
+                 - standard_yield * price
+    
+    Inputs broadcast, so one call builds the flows for one site or for a
+    vector of sites/scenarios.
+    
+    Args:
+        standard_yield: Standard seed yield (BAU)
+        resilient_yield: Resilient seed yield (project)
+        price_per_ton: Crop price
+        capex: Initial investment
+        opex: Annual operating cost
+        yield_benefit_pct: Additional yield benefit of the project (%)
+        analysis_years: Years of benefits after Year 0
+        decimals: Round the reported flows and running totals to this many decimals,
+            as reported by /predict; None keeps full precision
+        yields_by_year: The yields have a trailing axis with one value per
+            year 1..N (e.g. from a climate trajectory) instead of one value
+            for every year
+    
+    Returns:
+        Dictionary with 'incremental' and 'cumulative' arrays of shape
+        (..., analysis_years + 1)
+    
+    Raises:
+        ValueError: If yields_by_year is set and the year axis is not analysis_years long
+    """
+    standard_yield = np.asarray(standard_yield, dtype=float)
+    resilient_yield = np.asarray(resilient_yield, dtype=float)
+    price_per_ton = np.asarray(price_per_ton, dtype=float)
+    capex = np.asarray(capex, dtype=float)
+    opex = np.asarray(opex, dtype=float)
+    yield_benefit_pct = np.asarray(yield_benefit_pct, dtype=float)
+    
+    if yields_by_year:
+        # Per-site parameters apply to every year of the trailing year axis
+        price_per_ton, opex, yield_benefit_pct = price_per_ton[..., None], opex[..., None], yield_benefit_pct[..., None]
+    
+    revenue_bau = standard_yield * price_per_ton
+    revenue_project = resilient_yield * (1 + (yield_benefit_pct / 100)) * price_per_ton
+    annual = (revenue_project - opex) - revenue_bau
+    
+    if yields_by_year:
+        if annual.shape[-1:] != (analysis_years,):
+            raise ValueError(f"Expected a trailing axis of {analysis_years} yearly yields, got shape {annual.shape}")
+    else:
+        annual = annual[..., None]
+    
+    shape = np.broadcast_shapes(annual.shape[:-1], capex.shape)
+    incremental = np.empty(shape + (analysis_years + 1,))
+    incremental[..., 0] = -capex
+    incremental[..., 1:] = annual
+    
+    # Running total accumulates the unrounded flows; only the reported values are rounded
+    cumulative = np.cumsum(incremental, axis=-1)
+    if decimals is not None:
+        incremental = np.round(incremental, decimals)
+        cumulative = np.round(cumulative, decimals)
+    
+    return {
+        'incremental': incremental,
+        'cumulative': cumulative
+    }
+
+
+# =============================================================================
+# Vectorized (Batch) Metrics over Scenario x Year Cash-Flow Matrices
+# =============================================================================
+
+def _as_cash_flow_matrix(cash_flows) -> np.ndarray:
+    """Coerce cash flows to a 2D (scenarios x years) float array."""
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    if cash_flows.ndim == 1:
+        cash_flows = cash_flows[None, :]
+    if cash_flows.ndim != 2:
+        raise ValueError("cash_flows must be a 1D series or a 2D (scenarios x years) matrix")
+    return cash_flows
+
+
+def discount_factor_matrix(discount_rates, num_years: int) -> np.ndarray:
+    """
+    Discount factors 1 / (1 + r)^t for t = 0 .. num_years - 1.
+    
+    Args:
+        discount_rates: Scalar or vector of discount rates (decimals)
+        num_years: Number of cash-flow periods (including Year 0)
+    
+    Returns:
+        Array of shape (num_years,) for a scalar rate, else (len(rates), num_years)
+    """
+    rates = np.asarray(discount_rates, dtype=float)
+    years = np.arange(num_years)
+    return 1.0 / (1.0 + rates[..., None]) ** years
+
+
+def _discounted(cash_flows: np.ndarray, discount_rates) -> np.ndarray:
+    """
+    Discount a (scenarios x years) matrix.
+    
+    Discount factors are computed once per distinct rate and gathered per
+    scenario, so 50k scenarios sharing a handful of rates cost a handful of
+    power evaluations.
+    """
+    rates = np.asarray(discount_rates, dtype=float)
+    num_years = cash_flows.shape[1]
+
+    if rates.ndim == 0:
+        return cash_flows * discount_factor_matrix(rates, num_years)
+
+    rates = np.broadcast_to(rates, cash_flows.shape[:1])
+    unique_rates, rate_index = np.unique(rates, return_inverse=True)
+    return cash_flows * discount_factor_matrix(unique_rates, num_years)[rate_index]
+
+
+def calculate_npv_batch(cash_flows, discount_rates) -> np.ndarray:
+    """
+    Vectorized `calculate_npv` over many cash-flow scenarios.
+    
+    Args:
+        cash_flows: (scenarios x years) matrix (a 1D series is one scenario)
+        discount_rates: Scalar rate or one rate per scenario (decimals)
+    
+    Returns:
+        NPV per scenario, shape (scenarios,)
+    """
+    cash_flows = _as_cash_flow_matrix(cash_flows)
+    return _discounted(cash_flows, discount_rates).sum(axis=1)
+
+
+def _bcr_from_discounted(discounted: np.ndarray) -> np.ndarray:
+    pv_benefits = np.where(discounted > 0, discounted, 0.0).sum(axis=1)
+    pv_costs = -np.where(discounted > 0, 0.0, discounted).sum(axis=1)
+
+    # Avoid division by zero
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bcr = pv_benefits / pv_costs
+    return np.where(pv_costs == 0, np.where(pv_benefits > 0, np.inf, 0.0), bcr)
+
+
+def calculate_bcr_batch(cash_flows, discount_rates) -> np.ndarray:
+    """
+    Vectorized `calculate_bcr` over many cash-flow scenarios.
+    
+    Returns:
+        BCR per scenario, shape (scenarios,); inf where there are benefits but
+        no costs and 0.0 where there are neither
+    """
+    cash_flows = _as_cash_flow_matrix(cash_flows)
+    return _bcr_from_discounted(_discounted(cash_flows, discount_rates))
+
+
+def calculate_payback_period_batch(cash_flows) -> np.ndarray:
+    """
+    Vectorized `calculate_payback_period` over many cash-flow scenarios.
+    
+    Returns:
+        Years to payback per scenario, shape (scenarios,); NaN where the
+        cumulative cash flow never turns positive (None in the scalar form)
+    """
+    cash_flows = _as_cash_flow_matrix(cash_flows)
+    cumulative = np.cumsum(cash_flows, axis=1)
+
+    recovered = cumulative >= 0
+    has_payback = recovered.any(axis=1)
+    year = np.argmax(recovered, axis=1)
+
+    rows = np.arange(cash_flows.shape[0])
+    cash_flow = cash_flows[rows, year]
+    cumulative_previous = cumulative[rows, year] - cash_flow
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interpolated = np.where(cash_flow != 0, year - 1 + np.abs(cumulative_previous) / cash_flow, year)
+
+    payback = np.where(year == 0, 0.0, interpolated)
+    return np.where(has_payback, payback, np.nan)
+
+
+def calculate_discounted_payback_period_batch(cash_flows, discount_rates) -> np.ndarray:
+    """
+    Vectorized `calculate_discounted_payback_period` over many cash-flow scenarios.
+    
+    Returns:
+        Years to discounted payback per scenario, shape (scenarios,); NaN if never
+    """
+    cash_flows = _as_cash_flow_matrix(cash_flows)
+    return calculate_payback_period_batch(_discounted(cash_flows, discount_rates))
+
+
+# IRR solver: rates scanned for sign changes of NPV(r) before root polishing
+IRR_STATUS_NAMES = ('ok', 'no_irr', 'multiple')
+IRR_SEARCH_GRID = np.concatenate([
+    np.linspace(-0.99, -0.2, 17)[:-1],
+    np.linspace(-0.2, 1.0, 121)[:-1],
+    np.geomspace(1.0, 10.0, 24),
+])
+
+
+def _npv_and_derivative(cash_flows: np.ndarray, rates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    NPV and dNPV/dr by Horner's rule in x = 1 / (1 + r).
+    
+    cash_flows is (scenarios x years); rates broadcasts against (scenarios, ...).
+    """
+    x = 1.0 / (1.0 + rates)
+    extra_dims = (1,) * (np.ndim(rates) - 1)
+    value = np.zeros(np.broadcast_shapes(x.shape, cash_flows.shape[:1] + extra_dims))
+    slope = np.zeros_like(value)
+
+    # Long series at rates near -100% overflow to +/-inf, which still has the right sign
+    with np.errstate(over='ignore', invalid='ignore'):
+        for t in range(cash_flows.shape[1] - 1, -1, -1):
+            slope = slope * x + value
+            value = value * x + cash_flows[:, t].reshape(cash_flows.shape[:1] + extra_dims)
+
+        # dNPV/dr = dNPV/dx * dx/dr, with dx/dr = -x^2
+        slope = -slope * x * x
+
+    return value, slope
+
+
+def calculate_irr_batch(cash_flows, tol: float = 1e-10, max_iter: int = 100) -> dict:
+    """
+    Internal Rate of Return for many cash-flow series at once.
+    
+    NPV is scanned on a fixed rate grid (-99% to 1000%) to bracket a sign
+    change for every series, then polished by Newton steps that fall back to
+    bisection whenever a step leaves the bracket, so every series converges.
+    
+    Conventional projects (one sign change in the cash flows) have exactly
+    one IRR (Descartes' rule of signs), so their status is exact. With more
+    sign changes, two IRRs closer together than the grid spacing (one
+    percentage point between -20% and 100%) produce no sign change on the
+    grid and are missed, so 'no_irr' and 'ok' are then not guaranteed.
+    
+    Args:
+        cash_flows: (scenarios x years) matrix (a 1D series is one scenario)
+        tol: Convergence tolerance on the rate
+        max_iter: Maximum Newton/bisection iterations
+    
+    Returns:
+        Dictionary with arrays of shape (scenarios,):
+        - 'irr': IRR as decimal (NaN where there is none)
+        - 'status': 'ok', 'no_irr' (NPV never changes sign between -99% and
+          1000%, or every cash flow is zero) or 'multiple' (several IRRs; the
+          lowest-rate IRR found is reported)
+    """
+    cash_flows = _as_cash_flow_matrix(cash_flows)
+    num_series = cash_flows.shape[0]
+
+    # ----- Bracket: sign changes of NPV along the rate grid -----
+    grid_npv, _ = _npv_and_derivative(cash_flows, IRR_SEARCH_GRID[None, :])
+    grid_sign = np.sign(grid_npv)
+    # All-zero series have NPV 0 at every rate but no meaningful IRR
+    all_zero = ~cash_flows.any(axis=1)
+    exact_root = (grid_sign == 0) & ~all_zero[:, None]
+    crossing = (grid_sign[:, :-1] * grid_sign[:, 1:]) < 0
+    num_roots = crossing.sum(axis=1) + exact_root.sum(axis=1)
+
+    has_crossing = crossing.any(axis=1)
+    first = np.argmax(crossing, axis=1)
+    low = IRR_SEARCH_GRID[first]
+    high = IRR_SEARCH_GRID[first + 1]
+    f_low = grid_npv[np.arange(num_series), first]
+
+    irr = np.full(num_series, np.nan)
+
+    # ----- Safeguarded Newton within each bracket -----
+    active = np.flatnonzero(has_crossing)
+    rate = (low + high) / 2.0
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+
+        value, slope = _npv_and_derivative(cash_flows[active], rate[active])
+
+        # Shrink the bracket around the root
+        same_side = np.sign(value) == np.sign(f_low[active])
+        low[active] = np.where(same_side, rate[active], low[active])
+        f_low[active] = np.where(same_side, value, f_low[active])
+        high[active] = np.where(same_side, high[active], rate[active])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = rate[active] - value / slope
+        outside = ~np.isfinite(newton) | (newton <= low[active]) | (newton >= high[active])
+        next_rate = np.where(outside, (low[active] + high[active]) / 2.0, newton)
+
+        converged = (np.abs(next_rate - rate[active]) <= tol * (1.0 + np.abs(rate[active]))) | (value == 0)
+        rate[active] = next_rate
+        irr[active[converged]] = next_rate[converged]
+        active = active[~converged]
+
+    # Unconverged after max_iter: report the bracket midpoint
+    irr[active] = (low[active] + high[active]) / 2.0
+
+    # Roots sitting exactly on a grid rate
+    on_grid = ~has_crossing & exact_root.any(axis=1)
+    irr[on_grid] = IRR_SEARCH_GRID[np.argmax(exact_root[on_grid], axis=1)]
+
+    status = np.where(num_roots == 0, 1, np.where(num_roots > 1, 2, 0))
+    return {
+        'irr': irr,
+        'status': np.array(IRR_STATUS_NAMES)[status],
+    }
+
+
+def calculate_annuity_irr_batch(initial_investment, annual_net_benefit, years, tol: float = 1e-12, max_iter: int = 100) -> dict:
+    """
+    IRR of level-annuity projects in O(1) per project.
+    
+    Solves annuity_factor(r, N) = initial_investment / annual_net_benefit
+    directly instead of expanding the N-year series. The annuity factor falls
+    monotonically with r, so the IRR is unique whenever the two amounts have
+    the same sign; it is found by Newton steps on the log of the factor,
+    safeguarded by bisection, until the residual or the bracket is below
+    `tol`. As
+    in `calculate_irr_batch`, only IRRs between -99% and 1000% are reported.
+    
+    Returns:
+        Dictionary with 'irr' (NaN where there is none) and 'status'
+        ('ok' or 'no_irr'), broadcast over the arguments
+    """
+    initial_investment = np.asarray(initial_investment, dtype=float)
+    annual = np.asarray(annual_net_benefit, dtype=float)
+    years = np.asarray(years, dtype=float)
+    shape = np.broadcast_shapes(initial_investment.shape, annual.shape, years.shape)
+    initial_investment, annual, years = (np.broadcast_to(a, shape).ravel() for a in (initial_investment, annual, years))
+    
+    def log_factor_and_slope(rate, n):
+        # log of the annuity factor and its derivative in r; logs keep long
+        # horizons finite near -100%, expm1/log1p keep rates near 0 accurate
+        with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+            growth = n * np.log1p(rate)
+            log_abs_expm1 = np.where(
+                -growth > 30.0, -growth + np.log1p(-np.exp(growth)), np.log(np.abs(np.expm1(-growth)))
+            )
+            log_factor = np.where(rate == 0, np.log(n), log_abs_expm1 - np.log(np.abs(rate)))
+            slope = np.where(rate == 0, -(n + 1) / 2.0, n / ((1.0 + rate) * np.expm1(growth)) - 1.0 / rate)
+        return log_factor, slope
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        target = initial_investment / annual
+        log_target = np.log(target)
+    low = np.full(target.shape, IRR_SEARCH_GRID[0])
+    high = np.full(target.shape, IRR_SEARCH_GRID[-1])
+    log_factor_low, _ = log_factor_and_slope(low, years)
+    log_factor_high, _ = log_factor_and_slope(high, years)
+    has_root = (annual != 0) & (target > 0) & (log_factor_high <= log_target) & (log_target <= log_factor_low)
+    
+    irr = np.full(target.shape, np.nan)
+    active = np.flatnonzero(has_root)
+    # Start inside the root's range: the IRR is below 1 / target when positive
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(target < years, 0.5 * np.minimum(1.0 / target, high), 0.0)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        
+        log_factor, slope = log_factor_and_slope(rate[active], years[active])
+        excess = log_factor - log_target[active]
+        
+        # Factor above target: the root is at a higher rate
+        above = excess > 0
+        low[active] = np.where(above, rate[active], low[active])
+        high[active] = np.where(above, high[active], rate[active])
+        
+        # Converged on the residual (relative error of the factor) or on the
+        # bracket, never on the step size alone
+        converged = (np.abs(excess) <= tol) | (high[active] - low[active] <= tol * (1.0 + np.abs(rate[active])))
+        irr[active[converged]] = rate[active][converged]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = rate[active] - excess / slope
+        outside = ~np.isfinite(newton) | (newton <= low[active]) | (newton >= high[active])
+        rate[active] = np.where(outside, (low[active] + high[active]) / 2.0, newton)
+        active = active[~converged]
+    
+    irr[active] = (low[active] + high[active]) / 2.0
+    status = np.array(IRR_STATUS_NAMES)[np.where(has_root, 0, 1)]
+    return {
+        'irr': irr.reshape(shape),
+        'status': status.reshape(shape),
+    }
+
+
+# Default NPV curve: 0% to 20% in 1-point steps
+NPV_CURVE_RATES = np.linspace(0.0, 0.20, 21)
+
+
+def calculate_npv_curve(cash_flows, rates=NPV_CURVE_RATES) -> dict:
+    """
+    NPV over a whole vector of discount rates in one Horner pass.
+    
+    The cash flows are the coefficients of a polynomial in x = 1 / (1 + r),
+    so every rate is evaluated together instead of one `calculate_npv` call
+    per rate. Sign changes along the curve bracket the IRR(s).
+    
+    Args:
+        cash_flows: One series or a (scenarios x years) matrix
+        rates: Ascending discount rates as decimals (> -1)
+    
+    Returns:
+        Dictionary with:
+        - 'rates': The evaluated rates
+        - 'npv': NPV per rate, shape (rates,) or (scenarios x rates)
+        - 'irr_brackets': (low_rate, high_rate) pairs enclosing a root of NPV
+          (low == high when NPV is exactly zero at a rate); a list per
+          scenario for a matrix
+    
+    Raises:
+        ValueError: If rates are not ascending or not above -100%
+    """
+    rates = np.atleast_1d(np.asarray(rates, dtype=float))
+    if rates.ndim != 1 or rates.size == 0:
+        raise ValueError("rates must be a non-empty 1D sequence")
+    if np.any(rates <= -1.0):
+        raise ValueError("rates must be greater than -1 (-100%)")
+    if np.any(np.diff(rates) <= 0):
+        raise ValueError("rates must be strictly ascending")
+    
+    single = np.ndim(cash_flows) == 1
+    cash_flows = _as_cash_flow_matrix(cash_flows)
+    npv, _ = _npv_and_derivative(cash_flows, rates[None, :])
+    
+    sign = np.sign(npv)
+    crossing = (sign[:, :-1] * sign[:, 1:]) < 0
+    brackets = []
+    for series_sign, series_crossing in zip(sign, crossing):
+        roots = [(float(rates[i]), float(rates[i])) for i in np.flatnonzero(series_sign == 0)]
+        roots += [(float(rates[i]), float(rates[i + 1])) for i in np.flatnonzero(series_crossing)]
+        brackets.append(sorted(roots))
+    
+    return {
+        'rates': rates,
+        'npv': npv[0] if single else npv,
+        'irr_brackets': brackets[0] if single else brackets,
+    }
+
+
+def calculate_roi_metrics_batch(cash_flows, discount_rates, include_irr: bool = False) -> dict:
+    """
+    Vectorized `calculate_roi_metrics` for a (scenarios x years) matrix.
+    
+    The discounted matrix is built once and shared by NPV, BCR and the
+    discounted payback. Values are not rounded.
+    
+    Returns:
+        Dictionary of arrays, shape (scenarios,):
+        - 'npv': Net Present Value
+        - 'bcr': Benefit-Cost Ratio
+        - 'payback_period_years': Years to payback (NaN if never)
+        - 'discounted_payback_period_years': Years to discounted payback (NaN if never)
+        - 'irr', 'irr_status': see `calculate_irr_batch` (only with include_irr=True)
+    """
+    cash_flows = _as_cash_flow_matrix(cash_flows)
+    discounted = _discounted(cash_flows, discount_rates)
+
+    metrics = {
+        'npv': discounted.sum(axis=1),
+        'bcr': _bcr_from_discounted(discounted),
+        'payback_period_years': calculate_payback_period_batch(cash_flows),
+        'discounted_payback_period_years': calculate_payback_period_batch(discounted),
+    }
+
+    if include_irr:
+        irr = calculate_irr_batch(cash_flows)
+        metrics['irr'] = irr['irr']
+        metrics['irr_status'] = irr['status']
+
+    return metrics
+
+
+# =============================================================================
+# Monte Carlo Financial Risk
+# =============================================================================
+
+DISTRIBUTION_TYPES = ('normal', 'uniform', 'triangular')
+
+
+def sample_distribution(spec, size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw samples from a parameter specification.
+    
+    A number is a fixed value. A dictionary selects a distribution:
+    - {'dist': 'normal', 'mean': m, 'std': s}
+    - {'dist': 'uniform', 'low': a, 'high': b}
+    - {'dist': 'triangular', 'low': a, 'mode': c, 'high': b}
+    
+    Raises:
+        ValueError: If the specification is not recognised or inconsistent
+    """
+    if not isinstance(spec, dict):
+        return np.full(size, float(spec))
+
+    dist = str(spec.get('dist', '')).lower()
+    try:
+        if dist == 'normal':
+            mean, std = float(spec['mean']), float(spec['std'])
+            if std < 0:
+                raise ValueError("normal distribution needs std >= 0")
+            return rng.normal(mean, std, size)
+        if dist == 'uniform':
+            low, high = float(spec['low']), float(spec['high'])
+            if high < low:
+                raise ValueError("uniform distribution needs low <= high")
+            return rng.uniform(low, high, size)
+        if dist == 'triangular':
+            low, mode, high = float(spec['low']), float(spec['mode']), float(spec['high'])
+            if not (low <= mode <= high) or low == high:
+                raise ValueError("triangular distribution needs low <= mode <= high and low < high")
+            return rng.triangular(low, mode, high, size)
+    except KeyError as missing:
+        raise ValueError(f"{dist} distribution is missing parameter {missing}") from None
+
+    raise ValueError(f"Unsupported distribution: {spec.get('dist')}. Use one of {', '.join(DISTRIBUTION_TYPES)}")
+
+
+def _quantiles_or_none(values: np.ndarray, probabilities) -> list:
+    """Quantiles of values where inf stands for 'never'; returned as None."""
+    quantiles = np.quantile(values, probabilities, method='inverted_cdf')
+    return [None if not np.isfinite(q) else round(float(q), 2) for q in quantiles]
+
+
+def calculate_roi_distribution(
+    standard_yield,
+    resilient_yield,
+    price_per_ton,
+    capex,
+    opex,
+    yield_benefit_pct,
+    discount_rate,
+    analysis_years: int = 10,
+    num_samples: int = 10000,
+    random_seed: int = 42,
+    histogram_bins: int = 20
+) -> dict:
+    """
+    Monte Carlo ROI for the agricultural adaptation project used by /predict.
+    
+    Every input may be a number or a distribution (see `sample_distribution`).
+    All draws are made up front and evaluated as one (samples x years)
+    incremental cash-flow matrix:
+    - Year 0: -CAPEX
+    - Years 1-N: resilient_yield * (1 + yield_benefit_pct/100) * price - OPEX
+                 - standard_yield * price
+    
+    Price, CAPEX and OPEX samples are floored at 0; discount rate samples are
+    clipped to [0, 1].
+    
+    Args:
+        standard_yield: Baseline (standard seed) yield
+        resilient_yield: Project (resilient seed) yield
+        price_per_ton: Crop price
+        capex: Initial investment
+        opex: Annual operating cost
+        yield_benefit_pct: Additional yield benefit of the project (%)
+        discount_rate: Discount rate as decimal
+        analysis_years: Years of benefits after Year 0
+        num_samples: Number of Monte Carlo draws
+        random_seed: Seed for the random generator
+        histogram_bins: Number of bins in the NPV histogram
+    
+    Returns:
+        Dictionary with NPV distribution summary and histogram, P(NPV > 0),
+        and P5/P50/P95 simple and discounted payback (None = never within the horizon)
+    """
+    if num_samples < 1:
+        raise ValueError("num_samples must be at least 1")
+    if analysis_years < 1:
+        raise ValueError("analysis_years must be at least 1")
+
+    rng = np.random.default_rng(random_seed)
+    standard = sample_distribution(standard_yield, num_samples, rng)
+    resilient = sample_distribution(resilient_yield, num_samples, rng)
+    price = np.maximum(sample_distribution(price_per_ton, num_samples, rng), 0.0)
+    capex_samples = np.maximum(sample_distribution(capex, num_samples, rng), 0.0)
+    opex_samples = np.maximum(sample_distribution(opex, num_samples, rng), 0.0)
+    benefit_pct = sample_distribution(yield_benefit_pct, num_samples, rng)
+    rates = np.clip(sample_distribution(discount_rate, num_samples, rng), 0.0, 1.0)
+
+    # samples x years incremental cash-flow matrix
+    cash_flows = build_agricultural_cash_flows(
+        standard, resilient, price, capex_samples, opex_samples, benefit_pct, analysis_years, decimals=None
+    )['incremental']
+
+    metrics = calculate_roi_metrics_batch(cash_flows, rates)
+    npv = metrics['npv']
+    payback = np.nan_to_num(metrics['payback_period_years'], nan=np.inf)
+    discounted_payback = np.nan_to_num(metrics['discounted_payback_period_years'], nan=np.inf)
+
+    p5, p50, p95 = np.percentile(npv, [5, 50, 95])
+    counts, edges = np.histogram(npv, bins=histogram_bins)
+
+    return {
+        'npv': {
+            'mean': round(float(npv.mean()), 2),
+            'std': round(float(npv.std()), 2),
+            'p5': round(float(p5), 2),
+            'p50': round(float(p50), 2),
+            'p95': round(float(p95), 2),
+            'min': round(float(npv.min()), 2),
+            'max': round(float(npv.max()), 2),
+            'histogram': {
+                'bin_edges': [round(float(edge), 2) for edge in edges],
+                'counts': counts.tolist()
+            }
+        },
+        'probability_npv_positive': round(float(np.mean(npv > 0)), 4),
+        'payback_period_years': dict(zip(('p5', 'p50', 'p95'), _quantiles_or_none(payback, [0.05, 0.5, 0.95]))),
+        'discounted_payback_period_years': dict(
+            zip(('p5', 'p50', 'p95'), _quantiles_or_none(discounted_payback, [0.05, 0.5, 0.95]))
+        ),
+        'probability_payback_within_horizon': round(float(np.mean(np.isfinite(payback))), 4),
+        'num_samples': int(num_samples),
+        'analysis_years': int(analysis_years),
+        'random_seed': int(random_seed)
+    }
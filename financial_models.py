@@ -2,9 +2,13 @@
 # Financial Models - Pydantic Schemas for Financial Analysis
 # =============================================================================
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional
 
+import numpy as np
+
+from infrastructure_constants import DAMAGE_CURVE_NAMES, INTERVENTION_SIZE_GRIDS
+
 
 class FinancialParams(BaseModel):
     """
@@ -93,6 +97,225 @@ class CashFlowRequest(BaseModel):
         }
 
 
+def _invalid_rows(mask: np.ndarray, limit: int = 5) -> str:
+    rows = np.flatnonzero(mask)
+    shown = ', '.join(str(row) for row in rows[:limit])
+    return shown + (f' (+{rows.size - limit} more)' if rows.size > limit else '')
+
+
+class BulkCashFlowRequest(BaseModel):
+    """
+    Columnar request model for many financial calculations at once.
+    
+    Instead of one CashFlowRequest per series, the series are the rows of a
+    single (requests x years) matrix and the discount rates a single column.
+    Both are validated as whole arrays, and the validated fields are NumPy
+    arrays ready for the vectorized financial engine.
+    """
+    cash_flows: np.ndarray = Field(
+        ...,
+        description="(requests x years) matrix of yearly cash flows, one row per request"
+    )
+    discount_rate: np.ndarray = Field(
+        ...,
+        description="Discount rate as decimal, one per request or a single rate for all"
+    )
+    
+    @field_validator('cash_flows', mode='before')
+    @classmethod
+    def _validate_cash_flows(cls, value):
+        try:
+            cash_flows = np.array(value, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError('cash_flows must be a matrix of numbers with the same number of years in every row')
+        
+        if cash_flows.ndim != 2 or cash_flows.shape[0] == 0:
+            raise ValueError('cash_flows must be a non-empty list of cash-flow lists')
+        if cash_flows.shape[1] < 2:
+            raise ValueError('Each cash-flow series needs at least 2 values')
+        
+        not_finite = ~np.isfinite(cash_flows).all(axis=1)
+        if not_finite.any():
+            raise ValueError(f'cash_flows has non-finite values in rows {_invalid_rows(not_finite)}')
+        
+        return cash_flows
+    
+    @field_validator('discount_rate', mode='before')
+    @classmethod
+    def _validate_discount_rate(cls, value):
+        try:
+            discount_rate = np.array(value, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError('discount_rate must be a number or a list of numbers')
+        
+        if discount_rate.ndim > 1:
+            raise ValueError('discount_rate must be a number or a list of numbers')
+        
+        out_of_range = ~((discount_rate >= 0.0) & (discount_rate <= 1.0))
+        if out_of_range.any():
+            raise ValueError(
+                f'discount_rate must be between 0.0 and 1.0 (rows {_invalid_rows(np.atleast_1d(out_of_range))})'
+            )
+        
+        return discount_rate
+    
+    @model_validator(mode='after')
+    def _broadcast_discount_rate(self):
+        num_requests = self.cash_flows.shape[0]
+        if self.discount_rate.ndim == 1 and self.discount_rate.size != num_requests:
+            raise ValueError(
+                f'discount_rate has {self.discount_rate.size} values for {num_requests} cash-flow series'
+            )
+        self.discount_rate = np.broadcast_to(self.discount_rate, (num_requests,))
+        return self
+    
+    @property
+    def num_requests(self) -> int:
+        return int(self.cash_flows.shape[0])
+    
+    class Config:
+        arbitrary_types_allowed = True
+        json_schema_extra = {
+            "example": {
+                "cash_flows": [
+                    [-100000, 15000, 15000, 15000, 15000, 15000],
+                    [-50000, 20000, 20000, 20000, 0, 0]
+                ],
+                "discount_rate": [0.10, 0.08]
+            }
+        }
+
+
+class BulkInfrastructureROIRequest(BaseModel):
+    """
+    Columnar request model for infrastructure ROI over a book of assets.
+    
+    Each field is a column with one value per asset, or a single value for
+    all assets. Columns are validated as whole arrays and broadcast to the
+    number of assets, ready for calculate_infrastructure_roi_batch.
+    """
+    flood_depth_m: np.ndarray = Field(
+        ...,
+        description="Expected flood depth in meters, one per asset"
+    )
+    asset_value: np.ndarray = Field(
+        ...,
+        description="Total asset value at risk"
+    )
+    daily_revenue: np.ndarray = Field(
+        ...,
+        description="Daily business revenue"
+    )
+    capex: np.ndarray = Field(
+        ...,
+        description="Initial capital expenditure of the intervention"
+    )
+    opex: np.ndarray = Field(
+        ...,
+        description="Annual operational cost of the intervention"
+    )
+    intervention_type: np.ndarray = Field(
+        ...,
+        description="'sea_wall' or 'drainage'"
+    )
+    wall_height_m: np.ndarray = Field(
+        default=np.array(2.0),
+        description="Sea wall height in meters"
+    )
+    drainage_reduction_m: np.ndarray = Field(
+        default=np.array(0.3),
+        description="Flood depth reduction from drainage in meters"
+    )
+    damage_curve: np.ndarray = Field(
+        default=np.array('generic'),
+        description="Depth-damage curve name"
+    )
+    discount_rate: np.ndarray = Field(
+        default=np.array(0.10),
+        description="Discount rate as decimal (e.g., 0.10 for 10%)"
+    )
+    analysis_years: int = Field(
+        default=20,
+        ge=1,
+        le=100,
+        description="Time horizon for analysis in years"
+    )
+    
+    @field_validator('flood_depth_m', 'asset_value', 'daily_revenue', 'capex', 'opex',
+                     'wall_height_m', 'drainage_reduction_m', 'discount_rate', mode='before')
+    @classmethod
+    def _validate_numeric_column(cls, value, info):
+        try:
+            column = np.array(value, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(f'{info.field_name} must be a number or a list of numbers')
+        
+        if column.ndim > 1:
+            raise ValueError(f'{info.field_name} must be a number or a list of numbers')
+        
+        if info.field_name == 'discount_rate':
+            requirement, valid = 'between 0.0 and 1.0', (column >= 0.0) & (column <= 1.0)
+        else:
+            requirement, valid = 'finite and non-negative', np.isfinite(column) & (column >= 0.0)
+        
+        if not valid.all():
+            raise ValueError(f'{info.field_name} must be {requirement} (rows {_invalid_rows(np.atleast_1d(~valid))})')
+        
+        return column
+    
+    @field_validator('intervention_type', 'damage_curve', mode='before')
+    @classmethod
+    def _validate_name_column(cls, value, info):
+        allowed = INTERVENTION_SIZE_GRIDS if info.field_name == 'intervention_type' else DAMAGE_CURVE_NAMES
+        column = np.array(value, dtype=object)
+        
+        if column.ndim > 1:
+            raise ValueError(f'{info.field_name} must be a name or a list of names')
+        
+        column = np.vectorize(lambda name: str(name).lower(), otypes=[object])(column) if column.size else column
+        invalid = ~np.isin(column, list(allowed))
+        if invalid.any():
+            raise ValueError(
+                f"{info.field_name} must be one of {', '.join(allowed)} (rows {_invalid_rows(np.atleast_1d(invalid))})"
+            )
+        
+        return column.astype(str)
+    
+    @model_validator(mode='after')
+    def _broadcast_columns(self):
+        if self.flood_depth_m.ndim != 1 or self.flood_depth_m.size == 0:
+            raise ValueError('flood_depth_m must be a non-empty list of depths')
+        
+        num_assets = self.flood_depth_m.size
+        for name in ('asset_value', 'daily_revenue', 'capex', 'opex', 'intervention_type',
+                     'wall_height_m', 'drainage_reduction_m', 'damage_curve', 'discount_rate'):
+            column = getattr(self, name)
+            if column.ndim == 1 and column.size != num_assets:
+                raise ValueError(f'{name} has {column.size} values for {num_assets} assets')
+            setattr(self, name, np.broadcast_to(column, (num_assets,)))
+        return self
+    
+    @property
+    def num_assets(self) -> int:
+        return int(self.flood_depth_m.size)
+    
+    class Config:
+        arbitrary_types_allowed = True
+        validate_default = True
+        json_schema_extra = {
+            "example": {
+                "flood_depth_m": [1.2, 0.4, 2.6],
+                "asset_value": [1000000, 250000, 4000000],
+                "daily_revenue": [5000, 800, 12000],
+                "capex": [150000, 20000, 600000],
+                "opex": [2000, 500, 8000],
+                "intervention_type": ["sea_wall", "drainage", "sea_wall"],
+                "damage_curve": "commercial",
+                "discount_rate": 0.10
+            }
+        }
+
+
 class ROIMetrics(BaseModel):
     """
     Return on Investment metrics for financial analysis.
@@ -111,10 +334,18 @@ class ROIMetrics(BaseModel):
         None,
         description="Years until cumulative cash flow turns positive (None if never positive)"
     )
+    discounted_payback_period_years: Optional[float] = Field(
+        None,
+        description="Years until cumulative discounted cash flow turns positive (None if never positive)"
+    )
     irr: Optional[float] = Field(
         None,
         description="Internal Rate of Return (IRR) as decimal (optional)"
     )
+    irr_status: Optional[str] = Field(
+        None,
+        description="'ok', 'no_irr', or 'multiple' (several IRRs; the lowest is reported)"
+    )
     
     class Config:
         json_schema_extra = {
@@ -122,6 +353,8 @@ class ROIMetrics(BaseModel):
                 "npv": 56862.0,
                 "bcr": 1.57,
                 "payback_period_years": 6.67,
-                "irr": 0.15
+                "discounted_payback_period_years": 9.12,
+                "irr": 0.15,
+                "irr_status": "ok"
             }
         }
@@ -6,9 +6,15 @@ import json
 import os
 import ee
 import math
+import numpy as np
 from gee_credentials import load_gee_credentials
 
 
+# Storm return periods (years) and their baseline rainfall depths in mm (from research)
+RETURN_PERIODS_YEARS = (1, 10, 50, 100)
+BASELINE_RAINFALL_DEPTHS_MM = (70.0, 121.5, 159.7, 179.4)
+
+
 def authenticate_gee():
     """
     Authenticate with Google Earth Engine using service account.
@@ -165,10 +171,7 @@ def calculate_rainfall_frequency(intensity_increase_pct: float) -> dict:
     """
     # Baseline Rainfall Depths (from research - in millimeters)
     baseline_depths = {
-        '1yr': 70.0,
-        '10yr': 121.5,
-        '50yr': 159.7,
-        '100yr': 179.4
+        f'{period}yr': depth for period, depth in zip(RETURN_PERIODS_YEARS, BASELINE_RAINFALL_DEPTHS_MM)
     }
     
     # Calculate future depths by applying intensity increase
@@ -194,6 +197,21 @@ def calculate_rainfall_frequency(intensity_increase_pct: float) -> dict:
     }
 
 
+def calculate_rainfall_frequency_batch(intensity_increase_pct) -> np.ndarray:
+    """
+    Array form of `calculate_rainfall_frequency` for many intensity scenarios.
+    
+    Args:
+        intensity_increase_pct: Percentage increase in rainfall intensity (scalar or array)
+    
+    Returns:
+        Future rainfall depths in mm with shape (..., len(RETURN_PERIODS_YEARS)),
+        one column per return period
+    """
+    scale = 1 + (np.asarray(intensity_increase_pct, dtype=float)[..., None] / 100)
+    return np.asarray(BASELINE_RAINFALL_DEPTHS_MM) * scale
+
+
 def analyze_infrastructure_risk(lat: float, lon: float, rain_intensity_pct: float) -> dict:
     """
     Analyze infrastructure flood risk using TWI-based flood mask and urban areas.
@@ -4,7 +4,7 @@
 
 import csv
 import random
-from physics_engine import simulate_maize_yield
+from physics_engine import calculate_yield_batch
 
 NUM_SAMPLES = 20000
 OUTPUT_FILE = "training_data.csv"
@@ -18,17 +18,23 @@ RAIN_MAX = 1500.0
 def main():
     random.seed(42)
     
+    temps = []
+    rains = []
+    seed_types = []
+    
+    for _ in range(NUM_SAMPLES):
+        temps.append(random.uniform(TEMP_MIN, TEMP_MAX))
+        rains.append(random.uniform(RAIN_MIN, RAIN_MAX))
+        seed_types.append(random.randint(0, 1))
+    
+    # Evaluate all samples in one vectorized pass
+    yields = calculate_yield_batch(temps, rains, seed_types, crop_type='maize')
+    
     with open(OUTPUT_FILE, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["temp", "rain", "seed_type", "yield"])
         
-        for _ in range(NUM_SAMPLES):
-            temp = random.uniform(TEMP_MIN, TEMP_MAX)
-            rain = random.uniform(RAIN_MIN, RAIN_MAX)
-            seed_type = random.randint(0, 1)
-            
-            yield_pct = simulate_maize_yield(temp, rain, seed_type)
-            
+        for temp, rain, seed_type, yield_pct in zip(temps, rains, seed_types, yields.tolist()):
             writer.writerow([round(temp, 2), round(rain, 2), seed_type, round(yield_pct, 4)])
     
     print(f"Generated {NUM_SAMPLES} samples and saved to {OUTPUT_FILE}")
@@ -37,8 +37,8 @@ import sys
 from datetime import datetime, timedelta
 
 # Import calculation engines
-from physics_engine import calculate_yield
-from financial_engine import calculate_roi_metrics, calculate_npv, calculate_payback_period
+from physics_engine import calculate_paired_yield
+from financial_engine import calculate_roi_metrics, calculate_npv, calculate_payback_period, build_agricultural_cash_flows
 
 
 def parse_arguments():
@@ -126,33 +126,18 @@ def run_agriculture_analysis(args, weather_data):
     temp_c = weather_data['max_temp_celsius']
     rain_mm = weather_data['total_precip_mm']
     
-    # Define seed types
-    SEED_TYPES = {
-        'standard': 0,
-        'resilient': 1
-    }
-    
-    # Calculate yields for both seed types
-    standard_yield = calculate_yield(
+    # Calculate yields for both seed types in one pass
+    paired = calculate_paired_yield(
         temp=temp_c,
         rain=rain_mm,
-        seed_type=SEED_TYPES['standard'],
         crop_type=args.crop_type,
         temp_delta=args.temp_delta,
         rain_pct_change=args.rain_pct_change
     )
-    
-    resilient_yield = calculate_yield(
-        temp=temp_c,
-        rain=rain_mm,
-        seed_type=SEED_TYPES['resilient'],
-        crop_type=args.crop_type,
-        temp_delta=args.temp_delta,
-        rain_pct_change=args.rain_pct_change
-    )
-    
-    avoided_loss = resilient_yield - standard_yield
-    percentage_improvement = (avoided_loss / standard_yield * 100) if standard_yield > 0 else 0.0
+    standard_yield = paired.standard_yield
+    resilient_yield = paired.resilient_yield
+    avoided_loss = paired.avoided_loss
+    percentage_improvement = paired.percentage_improvement
     
     # Calculate ROI (using research-based defaults)
     capex = 2000.0
@@ -174,25 +159,15 @@ def run_agriculture_analysis(args, weather_data):
     discount_rate = 0.10
     
     # Generate cash flows
-    incremental_cash_flows = []
-    for year in range(analysis_years + 1):
-        revenue_bau = standard_yield * price_per_ton
-        yield_project = resilient_yield * (1 + (yield_benefit_pct / 100))
-        revenue_project = yield_project * price_per_ton
-        
-        if year == 0:
-            cost_project = capex
-        else:
-            cost_project = opex
-        
-        net_project = revenue_project - cost_project
-        net_bau = revenue_bau
-        incremental = net_project - net_bau
-        
-        if year == 0:
-            incremental = -capex
-        
-        incremental_cash_flows.append(round(incremental, 2))
+    incremental_cash_flows = build_agricultural_cash_flows(
+        standard_yield=standard_yield,
+        resilient_yield=resilient_yield,
+        price_per_ton=price_per_ton,
+        capex=capex,
+        opex=opex,
+        yield_benefit_pct=yield_benefit_pct,
+        analysis_years=analysis_years
+    )['incremental'].tolist()
     
     npv = calculate_npv(incremental_cash_flows, discount_rate)
     payback_years = calculate_payback_period(incremental_cash_flows)
@@ -0,0 +1,50 @@
+# =============================================================================
+# Infrastructure Constants - Damage Curves and Intervention Design Grids
+# =============================================================================
+# Plain data shared by infrastructure_engine and the request models in
+# financial_models, kept free of engine imports.
+
+
+# Research-based depth-damage curve anchor points
+# Source: Empirical flood damage studies
+DEPTH_DAMAGE_CURVE = [
+    (0.0, 0.0),    # 0m = 0% damage
+    (0.5, 18.0),   # 0.5m = 18% damage
+    (1.0, 29.0),   # 1.0m = 29% damage
+    (2.0, 49.0),   # 2.0m = 49% damage
+    (3.0, 60.0),   # 3.0m = 60% damage
+]
+
+# Depth-damage curve library: (depth_m, damage_pct) anchor points, linearly
+# interpolated and held at the last anchor beyond it
+# - residential/commercial/industrial: Huizinga et al. (2017), JRC global
+#   flood depth-damage functions (Europe)
+# - urban: shallow urban flooding curve used by /predict-flood
+#   (Thieken et al., 2008; Huizinga et al., 2017), capped at 70%
+DEPTH_DAMAGE_CURVES = {
+    'generic': DEPTH_DAMAGE_CURVE,
+    'residential': [
+        (0.0, 0.0), (0.5, 25.0), (1.0, 40.0), (1.5, 50.0), (2.0, 60.0),
+        (3.0, 75.0), (4.0, 85.0), (5.0, 95.0), (6.0, 100.0),
+    ],
+    'commercial': [
+        (0.0, 0.0), (0.5, 15.0), (1.0, 30.0), (1.5, 45.0), (2.0, 55.0),
+        (3.0, 75.0), (4.0, 90.0), (5.0, 100.0),
+    ],
+    'industrial': [
+        (0.0, 0.0), (0.5, 15.0), (1.0, 27.0), (1.5, 40.0), (2.0, 52.0),
+        (3.0, 70.0), (4.0, 85.0), (5.0, 100.0),
+    ],
+    'urban': [
+        (0.0, 0.0), (0.05, 2.0), (0.15, 8.0), (0.30, 20.0), (0.60, 40.0), (1.20, 70.0),
+    ],
+}
+
+DAMAGE_CURVE_NAMES = tuple(DEPTH_DAMAGE_CURVES)
+
+# Default design grids for intervention sizing: (min, max, step) in meters of
+# wall height (sea_wall) or flood depth reduction (drainage)
+INTERVENTION_SIZE_GRIDS = {
+    'sea_wall': (0.0, 5.0, 0.05),
+    'drainage': (0.0, 1.0, 0.01),
+}
@@ -2,26 +2,66 @@
 # Infrastructure Engine - Flood Damage and ROI Analysis
 # =============================================================================
 
-from typing import Optional, Dict
-from financial_engine import calculate_roi_metrics, generate_cash_flows
+from typing import Optional, Dict, Sequence
 
+import numpy as np
 
-# Research-based depth-damage curve anchor points
-# Source: Empirical flood damage studies
-DEPTH_DAMAGE_CURVE = [
-    (0.0, 0.0),    # 0m = 0% damage
-    (0.5, 18.0),   # 0.5m = 18% damage
-    (1.0, 29.0),   # 1.0m = 29% damage
-    (2.0, 49.0),   # 2.0m = 49% damage
-    (3.0, 60.0),   # 3.0m = 60% damage
-]
+from financial_engine import (
+    calculate_annuity_metrics,
+    calculate_annuity_metrics_batch,
+    calculate_roi_metrics,
+    calculate_roi_metrics_batch,
+)
+from infrastructure_constants import (
+    DAMAGE_CURVE_NAMES,
+    DEPTH_DAMAGE_CURVE,
+    DEPTH_DAMAGE_CURVES,
+    INTERVENTION_SIZE_GRIDS,
+)
+
+
+DAMAGE_CURVE_CODES = {name: code for code, name in enumerate(DAMAGE_CURVE_NAMES)}
+
+# All curves resampled onto the union of their anchor depths, so assets with
+# different curves are interpolated together by one gather (every kink of
+# every curve is a grid point, so the resampling is exact)
+_CURVE_DEPTHS = np.unique([depth for curve in DEPTH_DAMAGE_CURVES.values() for depth, _ in curve])
+_CURVE_TABLE = np.vstack([
+    np.interp(_CURVE_DEPTHS, *zip(*DEPTH_DAMAGE_CURVES[name])) for name in DAMAGE_CURVE_NAMES
+])
+
+# Breakpoint table of the 'urban' curve in centimetres, the depth unit of the
+# /predict-flood surrogate model
+URBAN_DAMAGE_DEPTHS_CM = np.round(100.0 * np.array([depth for depth, _ in DEPTH_DAMAGE_CURVES['urban']]), 6)
+URBAN_DAMAGE_PCTS = np.array([damage_pct for _, damage_pct in DEPTH_DAMAGE_CURVES['urban']])
 
 # Business interruption threshold
 INTERRUPTION_DEPTH_THRESHOLD_M = 0.3
 INTERRUPTION_DAYS = 5
 
+def _damage_curve_code(name: str) -> int:
+    try:
+        return DAMAGE_CURVE_CODES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown damage curve: {name}. Use one of {', '.join(DAMAGE_CURVE_NAMES)}")
+
 
-def calculate_damage_cost(flood_depth_m: float, asset_value: float) -> float:
+def _to_damage_curve_codes(damage_curve) -> np.ndarray:
+    """Convert a curve name, curve code, or array of either into integer curve codes."""
+    if isinstance(damage_curve, str):
+        return np.asarray(_damage_curve_code(damage_curve))
+    
+    codes = np.asarray(damage_curve)
+    if codes.dtype.kind in ('U', 'S', 'O'):
+        return np.vectorize(_damage_curve_code, otypes=[np.int64])(codes)
+    
+    codes = codes.astype(np.int64)
+    if codes.size and (codes.min() < 0 or codes.max() >= len(DAMAGE_CURVE_NAMES)):
+        raise ValueError(f"Damage curve codes must be between 0 and {len(DAMAGE_CURVE_NAMES) - 1}")
+    return codes
+
+
+def calculate_damage_cost(flood_depth_m: float, asset_value: float, damage_curve: str = 'generic') -> float:
     """
     Calculate flood damage cost using piecewise linear interpolation.
     
@@ -32,25 +72,30 @@ def calculate_damage_cost(flood_depth_m: float, asset_value: float) -> float:
     - 2.0m = 49% damage
     - 3.0m = 60% damage
     
+    Other curves from DEPTH_DAMAGE_CURVES can be selected by name.
+    
     Args:
         flood_depth_m: Flood depth in meters
         asset_value: Total asset value (infrastructure value)
+        damage_curve: Depth-damage curve name (default: 'generic')
     
     Returns:
         Damage cost in currency units
     """
+    curve = DEPTH_DAMAGE_CURVES[DAMAGE_CURVE_NAMES[_damage_curve_code(damage_curve)]]
+    
     if flood_depth_m <= 0:
         return 0.0
     
     # If depth exceeds maximum anchor point, use maximum damage %
-    if flood_depth_m >= DEPTH_DAMAGE_CURVE[-1][0]:
-        damage_pct = DEPTH_DAMAGE_CURVE[-1][1]
+    if flood_depth_m >= curve[-1][0]:
+        damage_pct = curve[-1][1]
         return (damage_pct / 100.0) * asset_value
     
     # Find the two anchor points to interpolate between
-    for i in range(len(DEPTH_DAMAGE_CURVE) - 1):
-        depth_lower, damage_lower = DEPTH_DAMAGE_CURVE[i]
-        depth_upper, damage_upper = DEPTH_DAMAGE_CURVE[i + 1]
+    for i in range(len(curve) - 1):
+        depth_lower, damage_lower = curve[i]
+        depth_upper, damage_upper = curve[i + 1]
         
         if depth_lower <= flood_depth_m <= depth_upper:
             # Linear interpolation
@@ -82,6 +127,169 @@ def calculate_business_interruption(flood_depth_m: float, daily_revenue: float)
     return 0.0
 
 
+def calculate_damage_pct_batch(flood_depth_m, damage_curve='generic') -> np.ndarray:
+    """
+    Damage as percent of asset value for arrays of flood depths.
+    
+    Args:
+        flood_depth_m: Flood depths in meters
+        damage_curve: Curve name/code (see DAMAGE_CURVE_NAMES), or one per
+            asset (e.g. by occupancy class); broadcasts against the depths
+    
+    Returns:
+        Damage percentage (0-100) per element
+    """
+    flood_depth_m = np.asarray(flood_depth_m, dtype=float)
+    codes = _to_damage_curve_codes(damage_curve)
+    
+    if codes.ndim == 0:
+        depths, damage_pcts = zip(*DEPTH_DAMAGE_CURVES[DAMAGE_CURVE_NAMES[codes]])
+        return np.interp(flood_depth_m, depths, damage_pcts)
+    
+    # Mixed curves: locate the segment on the shared grid, then gather each
+    # asset's own curve values at the segment ends
+    depth = np.clip(flood_depth_m, _CURVE_DEPTHS[0], _CURVE_DEPTHS[-1])
+    segment = np.clip(np.searchsorted(_CURVE_DEPTHS, depth, side='right') - 1, 0, len(_CURVE_DEPTHS) - 2)
+    lower = _CURVE_DEPTHS[segment]
+    fraction = (depth - lower) / (_CURVE_DEPTHS[segment + 1] - lower)
+    damage_lower = _CURVE_TABLE[codes, segment]
+    damage_upper = _CURVE_TABLE[codes, segment + 1]
+    return damage_lower + fraction * (damage_upper - damage_lower)
+
+
+def calculate_urban_flood_damage_pct(depth_cm) -> np.ndarray:
+    """
+    Urban flood damage as percent of building value for flood depths in cm.
+    
+    Urban flooding causes damage even at shallow depths:
+    - 0-5 cm: Minimal damage (0-2%)
+    - 5-15 cm: Minor damage to contents and finishes (2-8%)
+    - 15-30 cm: Moderate damage to walls, electrical, HVAC (8-20%)
+    - 30-60 cm: Major damage to structure and systems (20-40%)
+    - >60 cm: Severe damage requiring major renovation (40-70%, reached at 120 cm)
+    
+    Piecewise linear over URBAN_DAMAGE_DEPTHS_CM (the 'urban' curve), so any
+    array of depths, e.g. baseline/intervention pairs, is one interpolation.
+    
+    Args:
+        depth_cm: Flood depths in centimetres
+    
+    Returns:
+        Damage percentage (0-70) per element
+    """
+    return np.interp(np.asarray(depth_cm, dtype=float), URBAN_DAMAGE_DEPTHS_CM, URBAN_DAMAGE_PCTS)
+
+
+def calculate_damage_cost_batch(flood_depth_m, asset_value, damage_curve='generic') -> np.ndarray:
+    """
+    Array form of `calculate_damage_cost`.
+    
+    Inputs broadcast, so one call prices many assets and/or depths, each
+    with its own damage curve if damage_curve is an array.
+    
+    Returns:
+        Damage cost per element
+    """
+    damage_pct = calculate_damage_pct_batch(flood_depth_m, damage_curve)
+    return (damage_pct / 100.0) * np.asarray(asset_value, dtype=float)
+
+
+def calculate_business_interruption_batch(flood_depth_m, daily_revenue) -> np.ndarray:
+    """Array form of `calculate_business_interruption`."""
+    interrupted = np.asarray(flood_depth_m, dtype=float) > INTERRUPTION_DEPTH_THRESHOLD_M
+    return np.where(interrupted, INTERRUPTION_DAYS * np.asarray(daily_revenue, dtype=float), 0.0)
+
+
+def calculate_flood_losses_batch(flood_depth_m, asset_value, daily_revenue, damage_curve='generic') -> Dict[str, np.ndarray]:
+    """
+    Asset damage and business interruption over the same arrays of assets/depths.
+    
+    Returns:
+        Dictionary of arrays: 'asset_damage', 'business_interruption', 'total_loss'
+    """
+    asset_damage = calculate_damage_cost_batch(flood_depth_m, asset_value, damage_curve)
+    business_interruption = calculate_business_interruption_batch(flood_depth_m, daily_revenue)
+    return {
+        'asset_damage': asset_damage,
+        'business_interruption': business_interruption,
+        'total_loss': asset_damage + business_interruption
+    }
+
+
+def calculate_expected_annual_loss(
+    depths_by_return_period_m,
+    return_periods,
+    asset_value,
+    daily_revenue=0.0,
+    damage_curve='generic'
+) -> Dict[str, np.ndarray]:
+    """
+    Expected Annual Damage (EAD) over a set of flood return periods.
+    
+    A T-year event has annual exceedance probability 1/T. Losses at the
+    depths of each return period are integrated over exceedance probability
+    with the trapezoidal rule. Only the range spanned by the return periods
+    is integrated; rarer and more frequent events are not extrapolated.
+    
+    Args:
+        depths_by_return_period_m: Flood depths with a trailing axis of one
+            column per return period; leading axes are assets/scenarios
+        return_periods: Return periods in years (>= 1), one per column
+        asset_value: Asset value, broadcast against the leading axes
+        daily_revenue: Daily revenue, broadcast against the leading axes
+        damage_curve: Curve name/code, or one per asset (leading axes)
+    
+    Returns:
+        Dictionary of arrays over the leading axes:
+        'expected_annual_damage', 'expected_annual_interruption' and
+        'expected_annual_loss'
+    
+    Raises:
+        ValueError: For fewer than 2, duplicate or sub-annual return periods,
+            or a depth array that does not have one column per return period
+    """
+    periods = np.asarray(return_periods, dtype=float)
+    depths = np.asarray(depths_by_return_period_m, dtype=float)
+    
+    if periods.ndim != 1 or periods.size < 2:
+        raise ValueError("EAD needs at least 2 return periods")
+    if np.any(periods < 1.0) or np.unique(periods).size != periods.size:
+        raise ValueError("Return periods must be distinct and at least 1 year")
+    if depths.shape[-1:] != periods.shape:
+        raise ValueError(f"Expected a trailing axis of {periods.size} depths (one per return period), got shape {depths.shape}")
+    
+    # Most frequent event first, so exceedance probability decreases along the axis
+    order = np.argsort(periods)
+    probability_widths = -np.diff(1.0 / periods[order])
+    depths = depths[..., order]
+    
+    codes = _to_damage_curve_codes(damage_curve)
+    losses = calculate_flood_losses_batch(
+        depths,
+        np.asarray(asset_value, dtype=float)[..., None],
+        np.asarray(daily_revenue, dtype=float)[..., None],
+        codes if codes.ndim == 0 else codes[..., None]
+    )
+    
+    def integrate(values):
+        return ((values[..., :-1] + values[..., 1:]) / 2.0 * probability_widths).sum(axis=-1)
+    
+    expected_damage = integrate(losses['asset_damage'])
+    expected_interruption = integrate(losses['business_interruption'])
+    return {
+        'expected_annual_damage': expected_damage,
+        'expected_annual_interruption': expected_interruption,
+        'expected_annual_loss': expected_damage + expected_interruption
+    }
+
+
+def _return_period_arrays(return_period_depths_m: Dict) -> tuple:
+    """Return periods and depths from a {period: depth} mapping ('100yr' or 100 keys)."""
+    periods = [float(str(period).lower().removesuffix('yr')) for period in return_period_depths_m]
+    depths = [float(depth) for depth in return_period_depths_m.values()]
+    return np.array(periods), np.array(depths)
+
+
 def calculate_intervention_depth(
     flood_depth_m: float,
     intervention_type: str,
@@ -111,6 +319,22 @@ def calculate_intervention_depth(
         return flood_depth_m
 
 
+def calculate_intervention_depth_batch(
+    flood_depth_m,
+    intervention_type: str,
+    wall_height_m: float = 2.0,
+    drainage_reduction_m: float = 0.3
+) -> np.ndarray:
+    """Array form of `calculate_intervention_depth`."""
+    flood_depth_m = np.asarray(flood_depth_m, dtype=float)
+    if intervention_type == 'sea_wall':
+        return np.maximum(0.0, flood_depth_m - wall_height_m)
+    elif intervention_type == 'drainage':
+        return np.maximum(0.0, flood_depth_m - drainage_reduction_m)
+    else:
+        return flood_depth_m
+
+
 def calculate_infrastructure_roi(
     flood_depth_m: float,
     asset_value: float,
@@ -121,13 +345,27 @@ def calculate_infrastructure_roi(
     analysis_years: int = 20,
     discount_rate: float = 0.10,
     wall_height_m: float = 2.0,
-    drainage_reduction_m: float = 0.3
+    drainage_reduction_m: float = 0.3,
+    flood_depth_by_year_m: Optional[Sequence] = None,
+    damage_curve: str = 'generic',
+    return_period_depths_m: Optional[Dict] = None
 ) -> Dict:
     """
     Calculate ROI for flood protection infrastructure investment.
     
     Compares Business as Usual (BAU) with intervention scenario.
     
+    By default the avoided loss is the same every year. With flood depths per
+    year (e.g. from a sea-level rise trajectory), year t floods to
+    flood_depth_by_year_m[t-1], so the avoided loss (and the cash flow)
+    changes year by year. The depths are taken as given: derive them from the
+    water level of each year (see `calculate_return_period_flood_depths`),
+    not by adding sea-level rise to a depth that is already clipped at zero.
+    
+    With depths per return period, annual losses are Expected Annual Damage
+    (see `calculate_expected_annual_loss`) instead of the loss of a single
+    flood_depth_m event every year.
+    
     Args:
         flood_depth_m: Expected flood depth in meters (baseline)
         asset_value: Total asset value at risk
@@ -139,17 +377,20 @@ def calculate_infrastructure_roi(
         discount_rate: Discount rate as decimal (default: 0.10)
         wall_height_m: Sea wall height (default: 2.0m)
         drainage_reduction_m: Drainage flood reduction (default: 0.3m)
+        flood_depth_by_year_m: Flood depth (m) for each year 1..analysis_years,
+            or (years x return periods) depths with return_period_depths_m
+            (optional, replaces the baseline depths in the cash flows)
+        damage_curve: Depth-damage curve (see DAMAGE_CURVE_NAMES, default: 'generic')
+        return_period_depths_m: Flood depth per return period, e.g.
+            {'1yr': 0.2, '10yr': 0.8, '100yr': 1.6} (optional)
     
     Returns:
         Dictionary with ROI metrics and damage analysis
-    """
-    # ========== Baseline (Business as Usual) ==========
-    # Calculate damage without intervention
-    damage_bau = calculate_damage_cost(flood_depth_m, asset_value)
-    interruption_bau = calculate_business_interruption(flood_depth_m, daily_revenue)
-    total_loss_bau = damage_bau + interruption_bau
     
-    # ========== Intervention Scenario ==========
+    Raises:
+        ValueError: If flood_depth_by_year_m does not have one row per year
+            (and one column per return period), or return_period_depths_m is invalid
+    """
     # Calculate effective flood depth after intervention
     effective_depth = calculate_intervention_depth(
         flood_depth_m,
@@ -158,33 +399,71 @@ def calculate_infrastructure_roi(
         drainage_reduction_m
     )
     
-    # Calculate damage with intervention
-    damage_intervention = calculate_damage_cost(effective_depth, asset_value)
-    interruption_intervention = calculate_business_interruption(effective_depth, daily_revenue)
-    total_loss_intervention = damage_intervention + interruption_intervention
+    if return_period_depths_m is None:
+        periods = None
+        
+        # ========== Baseline (Business as Usual) ==========
+        # Calculate damage without intervention
+        damage_bau = calculate_damage_cost(flood_depth_m, asset_value, damage_curve)
+        interruption_bau = calculate_business_interruption(flood_depth_m, daily_revenue)
+        total_loss_bau = damage_bau + interruption_bau
+        
+        # ========== Intervention Scenario ==========
+        # Calculate damage with intervention
+        damage_intervention = calculate_damage_cost(effective_depth, asset_value, damage_curve)
+        interruption_intervention = calculate_business_interruption(effective_depth, daily_revenue)
+        total_loss_intervention = damage_intervention + interruption_intervention
+    else:
+        # ========== Expected Annual Damage over return periods ==========
+        periods, period_depths = _return_period_arrays(return_period_depths_m)
+        period_effective_depths = calculate_intervention_depth_batch(
+            period_depths, intervention_type, wall_height_m, drainage_reduction_m
+        )
+        ead_bau = calculate_expected_annual_loss(period_depths, periods, asset_value, daily_revenue, damage_curve)
+        ead_intervention = calculate_expected_annual_loss(
+            period_effective_depths, periods, asset_value, daily_revenue, damage_curve
+        )
+        
+        damage_bau = float(ead_bau['expected_annual_damage'])
+        interruption_bau = float(ead_bau['expected_annual_interruption'])
+        total_loss_bau = float(ead_bau['expected_annual_loss'])
+        damage_intervention = float(ead_intervention['expected_annual_damage'])
+        interruption_intervention = float(ead_intervention['expected_annual_interruption'])
+        total_loss_intervention = float(ead_intervention['expected_annual_loss'])
     
     # ========== ROI Calculation ==========
     # Annual avoided loss (benefit)
     annual_avoided_loss = total_loss_bau - total_loss_intervention
     
-    # Generate cash flows for analysis period
-    # Year 0: -CAPEX (initial investment)
-    # Years 1-N: Avoided loss - OPEX (net annual benefit)
-    cash_flows = []
-    
-    # Year 0: Initial investment
-    cash_flows.append(-project_capex)
-    
-    # Years 1 to analysis_years
-    for year in range(1, analysis_years + 1):
+    if flood_depth_by_year_m is None:
+        # Cash flows are a level annuity:
+        # Year 0: -CAPEX (initial investment)
+        # Years 1-N: Avoided loss - OPEX (net annual benefit)
+        # so the financial metrics are evaluated in closed form
         net_benefit = annual_avoided_loss - project_opex
-        cash_flows.append(net_benefit)
-    
-    # Calculate financial metrics using financial engine
-    roi_metrics = calculate_roi_metrics(cash_flows, discount_rate)
+        roi_metrics = calculate_annuity_metrics(project_capex, net_benefit, analysis_years, discount_rate)
+        climate_trajectory = None
+    else:
+        # All years at once: losses and avoided loss per year
+        loss_depths = _depths_by_year(flood_depth_by_year_m, analysis_years, periods)
+        effective_by_year = calculate_intervention_depth_batch(
+            loss_depths, intervention_type, wall_height_m, drainage_reduction_m
+        )
+        loss_bau_by_year = _annual_loss(loss_depths, periods, asset_value, daily_revenue, damage_curve)
+        loss_intervention_by_year = _annual_loss(effective_by_year, periods, asset_value, daily_revenue, damage_curve)
+        avoided_by_year = loss_bau_by_year - loss_intervention_by_year
+        
+        cash_flows = [-project_capex] + (avoided_by_year - project_opex).tolist()
+        roi_metrics = calculate_roi_metrics(cash_flows, discount_rate)
+        # Reported as the average over the horizon
+        annual_avoided_loss = float(avoided_by_year.mean())
+        climate_trajectory = {
+            'flood_depth_m_by_year': np.round(loss_depths, 3).tolist(),
+            'avoided_loss_by_year': [round(float(v), 2) for v in avoided_by_year]
+        }
     
     # ========== Response Structure ==========
-    return {
+    result = {
         'baseline_scenario': {
             'flood_depth_m': round(flood_depth_m, 2),
             'asset_damage': round(damage_bau, 2),
@@ -213,6 +492,223 @@ def calculate_infrastructure_roi(
             'reason': _get_recommendation_reason(roi_metrics['npv'], roi_metrics['bcr'])
         }
     }
+    
+    if periods is not None:
+        result['expected_annual_damage'] = {
+            'method': 'trapezoidal integration over annual exceedance probability',
+            'return_periods_years': periods.tolist(),
+            'flood_depths_m': [round(float(v), 3) for v in period_depths],
+            'effective_flood_depths_m': [round(float(v), 3) for v in period_effective_depths]
+        }
+    
+    if climate_trajectory is not None:
+        result['climate_trajectory'] = climate_trajectory
+    
+    return result
+
+
+def _depths_by_year(flood_depth_by_year_m, analysis_years, periods) -> np.ndarray:
+    """Validated (years,) or (years, periods) flood depths."""
+    depths = np.asarray(flood_depth_by_year_m, dtype=float)
+    shape = (analysis_years,) if periods is None else (analysis_years, periods.size)
+    if depths.shape != shape:
+        raise ValueError(f"flood_depth_by_year_m needs shape {shape} (years x return periods), got {depths.shape}")
+    if not np.all(np.isfinite(depths)) or np.any(depths < 0):
+        raise ValueError("flood_depth_by_year_m must be finite, non-negative depths")
+    return depths
+
+
+def _annual_loss(depths, periods, asset_value, daily_revenue, damage_curve) -> np.ndarray:
+    """Loss of one event per year (periods is None) or EAD over a trailing return-period axis."""
+    if periods is None:
+        return calculate_flood_losses_batch(depths, asset_value, daily_revenue, damage_curve)['total_loss']
+    return calculate_expected_annual_loss(depths, periods, asset_value, daily_revenue, damage_curve)['expected_annual_loss']
+
+
+def calculate_infrastructure_roi_batch(
+    flood_depth_m,
+    asset_value,
+    daily_revenue,
+    project_capex,
+    project_opex,
+    intervention_type,
+    analysis_years: int = 20,
+    discount_rate=0.10,
+    wall_height_m=2.0,
+    drainage_reduction_m=0.3,
+    damage_curve='generic'
+) -> Dict[str, np.ndarray]:
+    """
+    Array form of `calculate_infrastructure_roi` for a book of assets.
+    
+    Every argument except analysis_years broadcasts, so one call values
+    thousands of assets, each with its own intervention type, costs, discount
+    rate and damage curve. Each asset has one flood event per year, and its
+    metrics come from the level-annuity closed form, as in the scalar
+    function without a trajectory. Intervention types other than 'sea_wall'
+    and 'drainage' leave the flood depth unchanged.
+    
+    Returns:
+        Dictionary of unrounded arrays: baseline and intervention losses,
+        'effective_flood_depth_m', 'annual_avoided_loss', 'npv', 'bcr',
+        'payback_period_years' (NaN if never paid back) and 'invest'
+    """
+    flood_depth_m = np.asarray(flood_depth_m, dtype=float)
+    intervention_type = np.asarray(intervention_type)
+    
+    depth_reduction = np.where(
+        intervention_type == 'sea_wall',
+        wall_height_m,
+        np.where(intervention_type == 'drainage', drainage_reduction_m, 0.0)
+    )
+    effective_depth = np.where(
+        depth_reduction > 0, np.maximum(0.0, flood_depth_m - depth_reduction), flood_depth_m
+    )
+    
+    losses_bau = calculate_flood_losses_batch(flood_depth_m, asset_value, daily_revenue, damage_curve)
+    losses_intervention = calculate_flood_losses_batch(effective_depth, asset_value, daily_revenue, damage_curve)
+    annual_avoided_loss = losses_bau['total_loss'] - losses_intervention['total_loss']
+    
+    metrics = calculate_annuity_metrics_batch(
+        project_capex, annual_avoided_loss - np.asarray(project_opex, dtype=float), analysis_years, discount_rate
+    )
+    
+    # Same decision as the scalar recommendation, which sees the rounded metrics
+    invest = (np.round(metrics['npv'], 2) > 0) & (np.round(metrics['bcr'], 2) > 1.0)
+    
+    return {
+        'asset_damage_bau': losses_bau['asset_damage'],
+        'business_interruption_bau': losses_bau['business_interruption'],
+        'total_loss_bau': losses_bau['total_loss'],
+        'effective_flood_depth_m': effective_depth,
+        'asset_damage_intervention': losses_intervention['asset_damage'],
+        'business_interruption_intervention': losses_intervention['business_interruption'],
+        'total_loss_intervention': losses_intervention['total_loss'],
+        'annual_avoided_loss': annual_avoided_loss,
+        'npv': metrics['npv'],
+        'bcr': metrics['bcr'],
+        'payback_period_years': metrics['payback_period_years'],
+        'invest': invest
+    }
+
+
+def optimize_intervention_size(
+    flood_depth_m: float,
+    asset_value: float,
+    daily_revenue: float,
+    intervention_type: str,
+    capex_per_unit: float,
+    fixed_capex: float = 0.0,
+    opex_per_unit: float = 0.0,
+    fixed_opex: float = 0.0,
+    sizes: Optional[Sequence[float]] = None,
+    analysis_years: int = 20,
+    discount_rate: float = 0.10,
+    damage_curve: str = 'generic',
+    return_period_depths_m: Optional[Dict] = None,
+    flood_depth_by_year_m: Optional[Sequence] = None
+) -> Dict:
+    """
+    Find the NPV-maximising size of a sea wall or drainage upgrade.
+    
+    Every candidate size (wall height, or flood depth reduction for drainage)
+    is evaluated in one pass: effective depths, damage, interruption and NPV
+    are computed as a (sizes x ...) matrix with the same model as
+    `calculate_infrastructure_roi`. Costs scale with the size:
+    CAPEX = fixed_capex + capex_per_unit * size, and likewise for OPEX.
+    
+    Args:
+        flood_depth_m: Expected flood depth in meters (baseline)
+        asset_value: Total asset value at risk
+        daily_revenue: Daily business revenue
+        intervention_type: 'sea_wall' or 'drainage'
+        capex_per_unit: CAPEX per meter of size
+        fixed_capex: Size-independent CAPEX
+        opex_per_unit: Annual OPEX per meter of size
+        fixed_opex: Size-independent annual OPEX
+        sizes: Candidate sizes in meters (default: INTERVENTION_SIZE_GRIDS)
+        analysis_years: Time horizon for analysis (default: 20)
+        discount_rate: Discount rate as decimal (default: 0.10)
+        damage_curve: Depth-damage curve (see DAMAGE_CURVE_NAMES)
+        return_period_depths_m: Flood depth per return period for EAD (optional)
+        flood_depth_by_year_m: Flood depth per year 1..analysis_years, as in
+            `calculate_infrastructure_roi` (optional)
+    
+    Returns:
+        Dictionary with the optimal design and the full size-NPV curve
+    
+    Raises:
+        ValueError: For an unsupported intervention type, negative sizes or
+            an invalid trajectory/return-period input
+    """
+    if intervention_type not in INTERVENTION_SIZE_GRIDS:
+        raise ValueError(f"Unsupported intervention type: {intervention_type}. Use one of {', '.join(INTERVENTION_SIZE_GRIDS)}")
+    
+    if sizes is None:
+        size_min, size_max, size_step = INTERVENTION_SIZE_GRIDS[intervention_type]
+        sizes = size_min + size_step * np.arange(int(round((size_max - size_min) / size_step)) + 1)
+    sizes = np.asarray(sizes, dtype=float)
+    if sizes.ndim != 1 or sizes.size == 0 or np.any(sizes < 0):
+        raise ValueError("sizes must be a non-empty list of non-negative values")
+    
+    # ========== Flood depths: (), (periods,), (years,) or (years, periods) ==========
+    if return_period_depths_m is None:
+        periods = None
+        depths = np.asarray(flood_depth_m, dtype=float)
+    else:
+        periods, depths = _return_period_arrays(return_period_depths_m)
+    
+    if flood_depth_by_year_m is not None:
+        depths = _depths_by_year(flood_depth_by_year_m, analysis_years, periods)
+    
+    # ========== Losses for every size at once ==========
+    size_axis = sizes.reshape((-1,) + (1,) * depths.ndim)
+    effective_depths = calculate_intervention_depth_batch(depths, intervention_type, size_axis, size_axis)
+    loss_bau = _annual_loss(depths, periods, asset_value, daily_revenue, damage_curve)
+    loss_intervention = _annual_loss(effective_depths, periods, asset_value, daily_revenue, damage_curve)
+    avoided_loss = loss_bau - loss_intervention  # (sizes,) or (sizes, years)
+    
+    capex = fixed_capex + capex_per_unit * sizes
+    opex = fixed_opex + opex_per_unit * sizes
+    
+    if flood_depth_by_year_m is None:
+        metrics = calculate_annuity_metrics_batch(capex, avoided_loss - opex, analysis_years, discount_rate)
+        annual_avoided_loss = avoided_loss
+    else:
+        cash_flows = np.empty((sizes.size, analysis_years + 1))
+        cash_flows[:, 0] = -capex
+        cash_flows[:, 1:] = avoided_loss - opex[:, None]
+        metrics = calculate_roi_metrics_batch(cash_flows, discount_rate)
+        annual_avoided_loss = avoided_loss.mean(axis=1)
+    
+    npv = metrics['npv']
+    best = int(np.argmax(npv))
+    payback = float(metrics['payback_period_years'][best])
+    # Same decision as the scalar recommendation, which sees the rounded metrics
+    invest = (np.round(npv, 2) > 0) & (np.round(metrics['bcr'], 2) > 1.0)
+    
+    return {
+        'intervention_type': intervention_type,
+        'optimal': {
+            'size_m': round(float(sizes[best]), 3),
+            'capex': round(float(capex[best]), 2),
+            'opex': round(float(opex[best]), 2),
+            'annual_avoided_loss': round(float(annual_avoided_loss[best]), 2),
+            'npv': round(float(npv[best]), 2),
+            'bcr': round(float(metrics['bcr'][best]), 2),
+            'payback_years': None if np.isnan(payback) else round(payback, 2),
+            'invest': bool(invest[best])
+        },
+        'curve': {
+            'size_m': np.round(sizes, 3).tolist(),
+            'capex': np.round(capex, 2).tolist(),
+            'annual_avoided_loss': np.round(annual_avoided_loss, 2).tolist(),
+            'npv': np.round(npv, 2).tolist()
+        },
+        'num_designs': int(sizes.size),
+        'analysis_years': analysis_years,
+        'discount_rate_pct': discount_rate * 100
+    }
 
 
 def _get_recommendation_reason(npv: float, bcr: float) -> str:
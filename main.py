@@ -9,16 +9,20 @@ from datetime import datetime, timedelta
 from functools import wraps
 
 import ee
+import numpy as np
 import pandas as pd
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from pydantic import ValidationError
 
 from gee_connector import get_weather_data, get_coastal_params, get_monthly_data, analyze_spatial_viability
 from batch_processor import run_batch_job
-from physics_engine import simulate_maize_yield, calculate_yield
-from coastal_engine import analyze_flood_risk, analyze_urban_impact
+from physics_engine import simulate_maize_yield, calculate_paired_yield, calculate_paired_yield_trajectory, calculate_yield_batch, calculate_tipping_points, CROP_CODES
+from coastal_engine import analyze_flood_risk, analyze_urban_impact, calculate_return_period_flood_depths, RETURN_PERIODS_YEARS
 from flood_engine import analyze_flash_flood, calculate_rainfall_frequency, analyze_infrastructure_risk
-from financial_engine import calculate_roi_metrics, calculate_npv, calculate_payback_period
+from financial_engine import calculate_roi_metrics, calculate_roi_metrics_batch, calculate_npv, calculate_payback_period, calculate_roi_distribution, build_agricultural_cash_flows, calculate_npv_curve, calculate_irr
+from financial_models import BulkCashFlowRequest, BulkInfrastructureROIRequest
+from infrastructure_engine import calculate_infrastructure_roi_batch, calculate_urban_flood_damage_pct
 
 app = Flask(__name__)
 # Enable CORS for all origins (Lovable uses multiple domains)
@@ -73,12 +77,120 @@ SEED_TYPES = {
     'resilient': 1
 }
 
+# Upper bound on ensemble size for /predict-portfolio (years x members x locations)
+MAX_PORTFOLIO_SAMPLES = 10_000_000
+
 FALLBACK_WEATHER = {
     'max_temp_celsius': 28.5,
     'total_rain_mm': 520.0,
     'period': 'last_12_months'
 }
 
+# Default slider ranges for /scenario-cube: (min, max, step)
+SCENARIO_TEMP_DELTA_RANGE = (-2.0, 5.0, 0.5)
+SCENARIO_RAIN_PCT_RANGE = (-50.0, 50.0, 5.0)
+MAX_SCENARIO_CELLS = 250_000
+MAX_TIPPING_POINT_SITES = 100_000
+MAX_FINANCIAL_SAMPLES = 200_000
+MAX_FINANCIAL_BATCH_REQUESTS = 100_000
+MAX_INFRASTRUCTURE_BATCH_ASSETS = 100_000
+INFRASTRUCTURE_ANALYSIS_YEARS = 20
+
+# Default rate range for /npv-curve: (min, max, step) as decimals
+NPV_CURVE_RATE_RANGE = (0.0, 0.20, 0.01)
+MAX_NPV_CURVE_RATES = 10_000
+
+
+def _resolve_baseline_climate(data):
+    """
+    Resolve the baseline (temp, rain) for a request.
+    
+    Mode A: lat/lon looks up the last 12 months from GEE (fallback weather on error).
+    Mode B: temp/rain are used directly.
+    
+    Returns:
+        Tuple of (baseline dict, error response). Exactly one of them is None.
+    """
+    if 'lat' in data and 'lon' in data:
+        lat = float(data['lat'])
+        lon = float(data['lon'])
+        
+        if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+            return None, (jsonify({
+                'status': 'error',
+                'message': 'Latitude must be between -90 and 90 and longitude between -180 and 180',
+                'code': 'INVALID_COORDINATES'
+            }), 400)
+        
+        try:
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=365)
+            
+            weather_data = get_weather_data(
+                lat=lat,
+                lon=lon,
+                start_date=start_date.strftime('%Y-%m-%d'),
+                end_date=end_date.strftime('%Y-%m-%d')
+            )
+            
+            return {
+                'temp': weather_data['max_temp_celsius'],
+                'rain': weather_data['total_precip_mm'],
+                'data_source': 'gee_auto_lookup',
+                'location': {'lat': lat, 'lon': lon}
+            }, None
+        
+        except Exception as gee_error:
+            import sys
+            print(f"GEE error, using fallback: {gee_error}", file=sys.stderr, flush=True)
+            return {
+                'temp': FALLBACK_WEATHER['max_temp_celsius'],
+                'rain': FALLBACK_WEATHER['total_rain_mm'],
+                'data_source': 'fallback',
+                'location': {'lat': lat, 'lon': lon}
+            }, None
+    
+    if 'temp' in data and 'rain' in data:
+        return {
+            'temp': float(data['temp']),
+            'rain': float(data['rain']),
+            'data_source': 'manual',
+            'location': None
+        }, None
+    
+    return None, (jsonify({
+        'status': 'error',
+        'message': 'Missing required fields: provide either (lat, lon) or (temp, rain)',
+        'code': 'MISSING_FIELDS'
+    }), 400)
+
+
+def _parse_scenario_axis(spec, default_range, max_values=MAX_SCENARIO_CELLS):
+    """
+    Parse a scenario grid axis: an explicit list of values, or a
+    {'min', 'max', 'step'} range (inclusive of max). Missing keys use defaults.
+    Axes longer than max_values are rejected before any array is built.
+    """
+    if isinstance(spec, list):
+        if len(spec) > max_values:
+            raise ValueError(f'grid axis has {len(spec):,} values; at most {max_values:,} allowed')
+        values = np.asarray([float(v) for v in spec], dtype=float)
+    else:
+        spec = spec or {}
+        lo = float(spec.get('min', default_range[0]))
+        hi = float(spec.get('max', default_range[1]))
+        step = float(spec.get('step', default_range[2]))
+        if not np.isfinite([lo, hi, step]).all() or step <= 0 or hi < lo:
+            raise ValueError('grid range needs finite values, step > 0 and max >= min')
+        num = int(round((hi - lo) / step)) + 1
+        if num > max_values:
+            raise ValueError(f'grid axis has {num:,} values; at most {max_values:,} allowed')
+        values = np.round(lo + step * np.arange(num), 6)
+    
+    if values.size == 0:
+        raise ValueError('grid axis must contain at least one value')
+    return values
+
 
 def validate_json(*required_fields):
     """Decorator to validate required JSON fields."""
@@ -291,31 +403,18 @@ def predict():
         rain_modifier = 1.0 + (rain_change / 100.0)
         final_simulated_rain = max(0.0, base_rain * rain_modifier)
         
-        # Run predictions using physics engine with climate perturbation
-        standard_yield = calculate_yield(
+        # Run predictions for both seed types in one pass
+        paired = calculate_paired_yield(
             temp=base_temp,
             rain=base_rain,
-            seed_type=SEED_TYPES['standard'],
             crop_type=crop_type,
             temp_delta=temp_increase,
             rain_pct_change=rain_change
         )
-        
-        resilient_yield = calculate_yield(
-            temp=base_temp,
-            rain=base_rain,
-            seed_type=SEED_TYPES['resilient'],
-            crop_type=crop_type,
-            temp_delta=temp_increase,
-            rain_pct_change=rain_change
-        )
-        
-        avoided_loss = resilient_yield - standard_yield
-        
-        if standard_yield > 0:
-            percentage_improvement = (avoided_loss / standard_yield) * 100
-        else:
-            percentage_improvement = 0.0
+        standard_yield = paired.standard_yield
+        resilient_yield = paired.resilient_yield
+        avoided_loss = paired.avoided_loss
+        percentage_improvement = paired.percentage_improvement
         
         # Financial ROI Analysis (optional)
         # Get project parameters with research-based defaults
@@ -327,47 +426,41 @@ def predict():
         analysis_years = 10
         discount_rate = 0.10  # 10% discount rate
         
-        # Calculate Agricultural ROI
-        # Baseline (Business as Usual): Standard seed, no project
-        predicted_yield_tons = standard_yield
-        
-        # Generate 10-year cash flows
-        incremental_cash_flows = []
-        cumulative_cash_flow_array = []
-        cumulative = 0.0
+        # Optional climate trajectory: each year 1..N gets its own temp_increase
+        # and rain_change, so yields (and cash flows) vary year by year
+        trajectory = None
+        yearly_yields = None
+        if data.get('climate_trajectory') is not None:
+            trajectory, error_response = _parse_climate_trajectory(
+                data['climate_trajectory'],
+                analysis_years,
+                {'temp_increase': temp_increase, 'rain_change': rain_change}
+            )
+            if error_response is not None:
+                return error_response
+            yearly_yields = calculate_paired_yield_trajectory(
+                temp=base_temp,
+                rain=base_rain,
+                crop_type=crop_type,
+                temp_delta_by_year=trajectory['temp_increase'],
+                rain_pct_change_by_year=trajectory['rain_change']
+            )
         
-        for year in range(analysis_years + 1):  # 0 to 10 (11 years)
-            # Baseline revenue (doing nothing - standard seed)
-            revenue_bau = predicted_yield_tons * price_per_ton
-            net_bau = revenue_bau  # No extra cost for BAU
-            
-            # Project revenue (resilient seed with yield benefit)
-            yield_project = resilient_yield * (1 + (yield_benefit_pct / 100))
-            revenue_project = yield_project * price_per_ton
-            
-            # Project costs
-            if year == 0:
-                # Year 0: CAPEX initial investment
-                cost_project = capex
-            else:
-                # Year 1+: OPEX annual maintenance
-                cost_project = opex
-            
-            # Net project cash flow
-            net_project = revenue_project - cost_project
-            
-            # Incremental cash flow (delta)
-            incremental = net_project - net_bau
-            
-            # Year 0 is pure CAPEX (negative), no revenue yet
-            if year == 0:
-                incremental = -capex
-            
-            incremental_cash_flows.append(round(incremental, 2))
-            
-            # Cumulative cash flow
-            cumulative += incremental
-            cumulative_cash_flow_array.append(round(cumulative, 2))
+        # Generate 10-year incremental cash flows
+        # Baseline (Business as Usual): Standard seed, no project
+        # Project: resilient seed with yield benefit, CAPEX in Year 0 and OPEX after
+        cash_flows = build_agricultural_cash_flows(
+            standard_yield=standard_yield if yearly_yields is None else yearly_yields.standard_yield,
+            resilient_yield=resilient_yield if yearly_yields is None else yearly_yields.resilient_yield,
+            price_per_ton=price_per_ton,
+            capex=capex,
+            opex=opex,
+            yield_benefit_pct=yield_benefit_pct,
+            analysis_years=analysis_years,
+            yields_by_year=yearly_yields is not None
+        )
+        incremental_cash_flows = cash_flows['incremental'].tolist()
+        cumulative_cash_flow_array = cash_flows['cumulative'].tolist()
         
         # Calculate NPV using financial engine
         npv = calculate_npv(incremental_cash_flows, discount_rate)
@@ -390,6 +483,14 @@ def predict():
             }
         }
         
+        if yearly_yields is not None:
+            roi_analysis['climate_trajectory'] = {
+                'temp_increase_by_year': trajectory['temp_increase'].tolist(),
+                'rain_change_by_year': trajectory['rain_change'].tolist(),
+                'standard_yield_by_year': np.round(yearly_yields.standard_yield, 2).tolist(),
+                'resilient_yield_by_year': np.round(yearly_yields.resilient_yield, 2).tolist()
+            }
+        
         # Run spatial analysis if location data is available
         # This analyzes cropland viability in a 50km buffer around the location
         spatial_analysis = None
@@ -669,6 +770,17 @@ def predict_coastal_flood():
                 'code': 'INVALID_SLR_PROJECTION'
             }), 400
         
+        # Optional sea-level rise per year for the infrastructure cash flows;
+        # validated here so a bad trajectory is a 400, not a missing analysis
+        slr_by_year = None
+        infra_spec = data.get('infrastructure_params')
+        if isinstance(infra_spec, dict) and infra_spec.get('slr_trajectory_m') is not None:
+            slr_by_year, error_response = _parse_slr_trajectory(
+                infra_spec['slr_trajectory_m'], INFRASTRUCTURE_ANALYSIS_YEARS
+            )
+            if error_response is not None:
+                return error_response
+        
         # Set surge based on include_surge flag
         surge_m = 2.5 if include_surge else 0.0
         
@@ -712,7 +824,7 @@ def predict_coastal_flood():
         infrastructure_roi = None
         if 'infrastructure_params' in data and 'intervention_params' in data:
             try:
-                from infrastructure_engine import calculate_infrastructure_roi
+                from infrastructure_engine import calculate_infrastructure_roi, optimize_intervention_size, INTERVENTION_SIZE_GRIDS
                 
                 infra_params = data['infrastructure_params']
                 intervention_params = data['intervention_params']
@@ -728,8 +840,29 @@ def predict_coastal_flood():
                 # Use flood depth from flood_risk analysis
                 flood_depth = flood_risk.get('flood_depth_m', 0.0)
                 
+                # Optional Expected Annual Damage: value the 1/10/50/100-year storm
+                # depths at this elevation instead of one event every year
+                elevation = flood_risk.get('elevation_m', 0.0)
+                use_ead = infra_params.get('use_expected_annual_damage', False)
+                return_period_depths = None
+                if use_ead:
+                    period_depths = calculate_return_period_flood_depths(elevation, slr_projection)
+                    return_period_depths = dict(zip(RETURN_PERIODS_YEARS, period_depths.tolist()))
+                
+                # A trajectory replaces slr_projection year by year: depths come
+                # from each year's water level, so dry years stay dry
+                depth_by_year = None
+                if slr_by_year is not None:
+                    if use_ead:
+                        depth_by_year = calculate_return_period_flood_depths(elevation, slr_by_year)
+                    else:
+                        depth_by_year = np.maximum(0.0, slr_by_year + surge_m - elevation)
+                
                 # Only calculate if we have valid inputs and flooding exists
-                if asset_value > 0 and flood_depth > 0:
+                has_flooding = flood_depth > 0 or (return_period_depths is not None and max(return_period_depths.values()) > 0)
+                if depth_by_year is not None:
+                    has_flooding = has_flooding or bool(np.any(depth_by_year > 0))
+                if asset_value > 0 and has_flooding:
                     import sys
                     print(f"[INFRASTRUCTURE ROI] Calculating for flood_depth={flood_depth}m, asset_value=${asset_value}, intervention={intervention_type}", file=sys.stderr, flush=True)
                     
@@ -740,14 +873,39 @@ def predict_coastal_flood():
                         project_capex=capex,
                         project_opex=opex,
                         intervention_type=intervention_type,
-                        analysis_years=20,
+                        analysis_years=INFRASTRUCTURE_ANALYSIS_YEARS,
                         discount_rate=0.10,
                         wall_height_m=intervention_params.get('wall_height_m', 2.0),
-                        drainage_reduction_m=intervention_params.get('drainage_reduction_m', 0.3)
+                        drainage_reduction_m=intervention_params.get('drainage_reduction_m', 0.3),
+                        flood_depth_by_year_m=depth_by_year,
+                        damage_curve=infra_params.get('damage_curve', 'generic'),
+                        return_period_depths_m=return_period_depths
                     )
+                    if slr_by_year is not None:
+                        infrastructure_roi['climate_trajectory']['slr_m_by_year'] = np.round(slr_by_year, 3).tolist()
                     
                     print(f"[INFRASTRUCTURE ROI] Complete: NPV=${infrastructure_roi['financial_analysis']['npv']:,.0f}, BCR={infrastructure_roi['financial_analysis']['bcr']:.2f}", file=sys.stderr, flush=True)
                     
+                    # Optional sizing sweep: CAPEX/OPEX per meter of wall height
+                    # (sea_wall) or depth reduction (drainage)
+                    if 'capex_per_unit' in intervention_params and intervention_type in INTERVENTION_SIZE_GRIDS:
+                        infrastructure_roi['optimal_sizing'] = optimize_intervention_size(
+                            flood_depth_m=flood_depth,
+                            asset_value=asset_value,
+                            daily_revenue=daily_revenue,
+                            intervention_type=intervention_type,
+                            capex_per_unit=float(intervention_params['capex_per_unit']),
+                            fixed_capex=float(intervention_params.get('fixed_capex', 0)),
+                            opex_per_unit=float(intervention_params.get('opex_per_unit', 0)),
+                            fixed_opex=float(intervention_params.get('fixed_opex', 0)),
+                            sizes=intervention_params.get('sizes_m'),
+                            analysis_years=INFRASTRUCTURE_ANALYSIS_YEARS,
+                            discount_rate=0.10,
+                            damage_curve=infra_params.get('damage_curve', 'generic'),
+                            return_period_depths_m=return_period_depths,
+                            flood_depth_by_year_m=depth_by_year
+                        )
+                    
             except Exception as roi_error:
                 import sys
                 print(f"Infrastructure ROI error: {roi_error}", file=sys.stderr, flush=True)
@@ -1124,51 +1282,9 @@ def predict_flood():
         # Economic valuation using urban flood depth-damage functions
         # Based on urban infrastructure damage research (Thieken et al., 2008; Huizinga et al., 2017)
         # For urban flooding, damage begins at very shallow depths
-        def calculate_flood_damage_pct(depth_cm):
-            """
-            Calculate percent damage using urban flood depth-damage curve.
-            
-            Urban flooding causes damage even at shallow depths:
-            - 0-5 cm: Minimal damage (0-2%)
-            - 5-15 cm: Minor damage to contents and finishes (2-8%)
-            - 15-30 cm: Moderate damage to walls, electrical, HVAC (8-20%)
-            - 30-60 cm: Major damage to structure and systems (20-40%)
-            - >60 cm: Severe damage requiring major renovation (40-70%)
-            
-            Formula: Piecewise exponential curve fitted to urban flood data
-            """
-            import math
-            
-            if depth_cm <= 0:
-                return 0.0
-            
-            # Urban flood damage curve (more sensitive to shallow depths)
-            # Based on European Flood Damage Database (Huizinga et al., 2017)
-            # Adjusted for U.S. construction standards
-            if depth_cm < 5:
-                # Very shallow: linear from 0% to 2%
-                damage_pct = (depth_cm / 5.0) * 2.0
-            elif depth_cm < 15:
-                # Shallow: exponential growth from 2% to 8%
-                normalized_depth = (depth_cm - 5) / 10.0
-                damage_pct = 2.0 + (6.0 * normalized_depth)
-            elif depth_cm < 30:
-                # Moderate: exponential growth from 8% to 20%
-                normalized_depth = (depth_cm - 15) / 15.0
-                damage_pct = 8.0 + (12.0 * normalized_depth)
-            elif depth_cm < 60:
-                # Major: exponential growth from 20% to 40%
-                normalized_depth = (depth_cm - 30) / 30.0
-                damage_pct = 20.0 + (20.0 * normalized_depth)
-            else:
-                # Severe: exponential growth from 40% to 70%
-                normalized_depth = min((depth_cm - 60) / 60.0, 1.0)
-                damage_pct = 40.0 + (30.0 * normalized_depth)
-            
-            return min(damage_pct, 70.0)  # Cap at 70% for urban floods
-        
-        baseline_damage_pct = calculate_flood_damage_pct(depth_baseline)
-        intervention_damage_pct = calculate_flood_damage_pct(depth_intervention)
+        baseline_damage_pct, intervention_damage_pct = calculate_urban_flood_damage_pct(
+            [depth_baseline, depth_intervention]
+        ).tolist()
         avoided_damage_pct = baseline_damage_pct - intervention_damage_pct
         
         # Economic value calculation
@@ -1268,12 +1384,73 @@ def start_batch():
         }), 500
 
 
+def _calculate_financials_monte_carlo(data):
+    """Monte Carlo branch of /calculate-financials."""
+    missing_fields = [field for field in ('standard_yield', 'resilient_yield') if field not in data]
+    if missing_fields:
+        return jsonify({
+            'status': 'error',
+            'message': f'Missing required fields: {", ".join(missing_fields)}',
+            'code': 'MISSING_FIELDS'
+        }), 400
+    
+    num_samples = int(data.get('num_samples', 10000))
+    analysis_years = int(data.get('analysis_years', 10))
+    
+    if not (1 <= num_samples <= MAX_FINANCIAL_SAMPLES):
+        return jsonify({
+            'status': 'error',
+            'message': f'num_samples must be between 1 and {MAX_FINANCIAL_SAMPLES:,}',
+            'code': 'INVALID_NUM_SAMPLES'
+        }), 400
+    
+    if not (1 <= analysis_years <= 100):
+        return jsonify({
+            'status': 'error',
+            'message': 'analysis_years must be between 1 and 100',
+            'code': 'INVALID_ANALYSIS_YEARS'
+        }), 400
+    
+    # Same research-based defaults as /predict project_params
+    distribution = calculate_roi_distribution(
+        standard_yield=data['standard_yield'],
+        resilient_yield=data['resilient_yield'],
+        price_per_ton=data.get('price_per_ton', 4800),
+        capex=data.get('capex', 2000),
+        opex=data.get('opex', 425),
+        yield_benefit_pct=data.get('yield_benefit_pct', 30.0),
+        discount_rate=data.get('discount_rate', 0.10),
+        analysis_years=analysis_years,
+        num_samples=num_samples,
+        random_seed=int(data.get('seed', 42))
+    )
+    
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'mode': 'monte_carlo',
+            'distribution': distribution,
+            'interpretation': {
+                'probability_npv_positive': 'Share of draws in which the project NPV is positive',
+                'payback_period_years': 'None means the draw never pays back within analysis_years',
+                'recommendation': 'INVEST' if distribution['probability_npv_positive'] >= 0.5 else 'DO NOT INVEST'
+            }
+        }
+    }), 200
+
+
 @app.route('/calculate-financials', methods=['POST'])
 def calculate_financials():
     """
     Calculate financial metrics (NPV, BCR, Payback Period) from cash flows.
     
     This is a utility endpoint for testing financial calculations in the UI.
+    Set "include_irr": true to also solve for the IRR.
+    
+    Monte Carlo mode ("mode": "monte_carlo") evaluates the /predict project
+    cash flows with distributions instead of point values for price_per_ton,
+    capex, opex, yield_benefit_pct and discount_rate, and returns the NPV
+    distribution, P(NPV > 0) and P5/P50/P95 payback.
     """
     if not request.is_json:
         return jsonify({
@@ -1285,6 +1462,9 @@ def calculate_financials():
     try:
         data = request.get_json()
         
+        if data.get('mode') == 'monte_carlo':
+            return _calculate_financials_monte_carlo(data)
+        
         # Validate required fields
         if 'cash_flows' not in data or 'discount_rate' not in data:
             return jsonify({
@@ -1316,7 +1496,7 @@ def calculate_financials():
             }), 400
         
         # Calculate financial metrics
-        metrics = calculate_roi_metrics(cash_flows, discount_rate)
+        metrics = calculate_roi_metrics(cash_flows, discount_rate, include_irr=bool(data.get('include_irr', False)))
         
         return jsonify({
             'status': 'success',
@@ -1349,6 +1529,194 @@ def calculate_financials():
         }), 500
 
 
+def _metric_column(values, decimals):
+    """Rounded JSON list of a metric column; undefined values (NaN/inf) become None."""
+    values = np.round(np.asarray(values, dtype=float), decimals)
+    return [value if np.isfinite(value) else None for value in values.tolist()]
+
+
+@app.route('/calculate-financials/batch', methods=['POST'])
+def calculate_financials_batch():
+    """
+    Financial metrics for many cash-flow series in one request.
+    
+    The request is columnar: "cash_flows" is a (requests x years) matrix and
+    "discount_rate" one rate or one rate per row. It is validated as whole
+    arrays by BulkCashFlowRequest and evaluated by the vectorized engine.
+    Metrics come back as columns in request order; "include_irr": true adds
+    IRR columns.
+    """
+    if not request.is_json:
+        return jsonify({
+            'status': 'error',
+            'message': 'Request must be JSON',
+            'code': 'INVALID_CONTENT_TYPE'
+        }), 400
+    
+    try:
+        data = request.get_json()
+        
+        if 'cash_flows' not in data or 'discount_rate' not in data:
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing required fields: cash_flows and discount_rate',
+                'code': 'MISSING_FIELDS'
+            }), 400
+        
+        if isinstance(data['cash_flows'], list) and len(data['cash_flows']) > MAX_FINANCIAL_BATCH_REQUESTS:
+            return jsonify({
+                'status': 'error',
+                'message': f'{len(data["cash_flows"]):,} cash-flow series requested; the maximum is {MAX_FINANCIAL_BATCH_REQUESTS:,}',
+                'code': 'TOO_MANY_REQUESTS'
+            }), 400
+        
+        try:
+            bulk = BulkCashFlowRequest.model_validate(data)
+        except ValidationError as ve:
+            return jsonify({
+                'status': 'error',
+                'message': '; '.join(error['msg'] for error in ve.errors()),
+                'code': 'INVALID_CASH_FLOWS'
+            }), 400
+        
+        include_irr = bool(data.get('include_irr', False))
+        metrics = calculate_roi_metrics_batch(bulk.cash_flows, bulk.discount_rate, include_irr=include_irr)
+        
+        columns = {
+            'npv': _metric_column(metrics['npv'], 2),
+            'bcr': _metric_column(metrics['bcr'], 2),
+            'payback_period_years': _metric_column(metrics['payback_period_years'], 2),
+            'discounted_payback_period_years': _metric_column(metrics['discounted_payback_period_years'], 2)
+        }
+        if include_irr:
+            columns['irr'] = _metric_column(metrics['irr'], 4)
+            columns['irr_status'] = metrics['irr_status'].tolist()
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'num_requests': bulk.num_requests,
+                'num_years': int(bulk.cash_flows.shape[1]),
+                'metrics': columns,
+                'interpretation': {
+                    'none_values': 'None means undefined: never pays back, no IRR, or no costs for BCR'
+                }
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Financial calculation failed: {str(e)}',
+            'code': 'CALCULATION_ERROR'
+        }), 500
+
+
+@app.route('/infrastructure-roi/batch', methods=['POST'])
+def infrastructure_roi_batch():
+    """
+    Infrastructure ROI for a book of assets in one request.
+    
+    The request is columnar: flood_depth_m, asset_value, daily_revenue,
+    capex, opex and intervention_type (plus optional wall_height_m,
+    drainage_reduction_m, damage_curve and discount_rate) are lists with one
+    value per asset, or single values shared by all assets. The columns are
+    validated by BulkInfrastructureROIRequest and evaluated in one pass by
+    calculate_infrastructure_roi_batch, the same model as the
+    infrastructure_roi block of /predict-coastal-flood. Damage and metrics
+    come back as columns in request order.
+    """
+    if not request.is_json:
+        return jsonify({
+            'status': 'error',
+            'message': 'Request must be JSON',
+            'code': 'INVALID_CONTENT_TYPE'
+        }), 400
+    
+    try:
+        data = request.get_json()
+        
+        required = ('flood_depth_m', 'asset_value', 'daily_revenue', 'capex', 'opex', 'intervention_type')
+        missing = [field for field in required if field not in data]
+        if missing:
+            return jsonify({
+                'status': 'error',
+                'message': f'Missing required fields: {", ".join(missing)}',
+                'code': 'MISSING_FIELDS'
+            }), 400
+        
+        if isinstance(data['flood_depth_m'], list) and len(data['flood_depth_m']) > MAX_INFRASTRUCTURE_BATCH_ASSETS:
+            return jsonify({
+                'status': 'error',
+                'message': f'{len(data["flood_depth_m"]):,} assets requested; the maximum is {MAX_INFRASTRUCTURE_BATCH_ASSETS:,}',
+                'code': 'TOO_MANY_REQUESTS'
+            }), 400
+        
+        try:
+            book = BulkInfrastructureROIRequest.model_validate(data)
+        except ValidationError as ve:
+            return jsonify({
+                'status': 'error',
+                'message': '; '.join(error['msg'] for error in ve.errors()),
+                'code': 'INVALID_ASSET_BOOK'
+            }), 400
+        
+        roi = calculate_infrastructure_roi_batch(
+            flood_depth_m=book.flood_depth_m,
+            asset_value=book.asset_value,
+            daily_revenue=book.daily_revenue,
+            project_capex=book.capex,
+            project_opex=book.opex,
+            intervention_type=book.intervention_type,
+            analysis_years=book.analysis_years,
+            discount_rate=book.discount_rate,
+            wall_height_m=book.wall_height_m,
+            drainage_reduction_m=book.drainage_reduction_m,
+            damage_curve=book.damage_curve
+        )
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'num_assets': book.num_assets,
+                'analysis_years': book.analysis_years,
+                'baseline_scenario': {
+                    'asset_damage': _metric_column(roi['asset_damage_bau'], 2),
+                    'business_interruption': _metric_column(roi['business_interruption_bau'], 2),
+                    'total_annual_loss': _metric_column(roi['total_loss_bau'], 2)
+                },
+                'intervention_scenario': {
+                    'effective_flood_depth_m': _metric_column(roi['effective_flood_depth_m'], 2),
+                    'asset_damage': _metric_column(roi['asset_damage_intervention'], 2),
+                    'business_interruption': _metric_column(roi['business_interruption_intervention'], 2),
+                    'total_annual_loss': _metric_column(roi['total_loss_intervention'], 2)
+                },
+                'financial_analysis': {
+                    'annual_avoided_loss': _metric_column(roi['annual_avoided_loss'], 2),
+                    'npv': _metric_column(roi['npv'], 2),
+                    'bcr': _metric_column(roi['bcr'], 2),
+                    'payback_years': _metric_column(roi['payback_period_years'], 2),
+                    'invest': roi['invest'].tolist()
+                },
+                'portfolio': {
+                    'total_npv': round(float(roi['npv'].sum()), 2),
+                    'total_capex': round(float(book.capex.sum()), 2),
+                    'num_recommended': int(roi['invest'].sum())
+                },
+                'interpretation': {
+                    'none_values': 'None means undefined: never pays back, or no costs for BCR'
+                }
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Infrastructure ROI calculation failed: {str(e)}',
+            'code': 'CALCULATION_ERROR'
+        }), 500
+
+
 @app.route('/predict-health', methods=['POST'])
 @validate_json('lat', 'lon', 'workforce_size', 'daily_wage')
 def predict_health():
@@ -1506,8 +1874,14 @@ def predict_portfolio():
     """
     Analyze portfolio diversification across multiple locations.
     
-    Simulates 10 years of climate variation for each location and
-    calculates aggregate tonnage and portfolio volatility.
+    Runs a seeded Monte Carlo climate ensemble (default: 10 years of climate
+    variation per location) and calculates aggregate tonnage, portfolio
+    volatility and tail risk (VaR/CVaR of tonnage).
+    
+    Optional fields:
+    - years: Simulated years per ensemble member (default: 10)
+    - ensemble_members: Independent perturbation sets (default: 1)
+    - seed: Random seed (default: 42); the same request always gives the same result
     """
     if not request.is_json:
         return jsonify({
@@ -1517,9 +1891,8 @@ def predict_portfolio():
         }), 400
     
     try:
-        import random
         import sys
-        from physics_engine import calculate_volatility
+        from ensemble_engine import simulate_yield_ensemble, DEFAULT_RANDOM_SEED, MAX_POTENTIAL_TONS_PER_HA
         
         data = request.get_json()
         
@@ -1533,6 +1906,9 @@ def predict_portfolio():
         
         locations = data['locations']
         crop_type = data.get('crop_type', 'maize').lower()
+        years = int(data.get('years', 10))
+        ensemble_members = int(data.get('ensemble_members', 1))
+        random_seed = int(data.get('seed', DEFAULT_RANDOM_SEED))
         
         # Validate crop type
         if crop_type not in ['maize', 'cocoa']:
@@ -1550,14 +1926,21 @@ def predict_portfolio():
                 'code': 'INVALID_LOCATIONS'
             }), 400
         
+        # Validate ensemble size (10,000 years x 1,000 locations fits one request)
+        if years < 2 or ensemble_members < 1 or years * ensemble_members * len(locations) > MAX_PORTFOLIO_SAMPLES:
+            return jsonify({
+                'status': 'error',
+                'message': f'years must be >= 2, ensemble_members >= 1, and years x ensemble_members x locations <= {MAX_PORTFOLIO_SAMPLES:,}',
+                'code': 'INVALID_ENSEMBLE_SIZE'
+            }), 400
+        
         print(f"[PORTFOLIO] Processing {len(locations)} locations for crop_type={crop_type}", file=sys.stderr, flush=True)
         
-        # Portfolio metrics
-        all_location_cvs = []
-        total_tonnage = 0.0
-        location_results = []
+        base_temps = []
+        base_rains = []
+        coordinates = []
         
-        # Process each location
+        # Fetch baseline climate for each location
         for idx, loc in enumerate(locations):
             if 'lat' not in loc or 'lon' not in loc:
                 return jsonify({
@@ -1581,8 +1964,6 @@ def predict_portfolio():
             
             # Fetch weather data from GEE
             try:
-                from datetime import datetime, timedelta
-                
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=365)
                 
@@ -1593,8 +1974,9 @@ def predict_portfolio():
                     end_date=end_date.strftime('%Y-%m-%d')
                 )
                 
-                base_temp = weather_data['max_temp_celsius']
-                base_rain = weather_data['total_precip_mm']
+                base_temps.append(weather_data['max_temp_celsius'])
+                base_rains.append(weather_data['total_precip_mm'])
+                coordinates.append((lat, lon))
                 
             except Exception as weather_error:
                 print(f"Weather data error for location {idx}: {weather_error}", file=sys.stderr, flush=True)
@@ -1603,58 +1985,41 @@ def predict_portfolio():
                     'message': f'Failed to fetch weather data for location {idx}: {str(weather_error)}',
                     'code': 'WEATHER_DATA_ERROR'
                 }), 500
-            
-            # Simulate 10 years of climate variation with resilient seed
-            # Each year has random climate perturbations to simulate natural variability
-            years = 10
-            annual_yields = []
-            
-            for year in range(years):
-                # Simulate climate variability:
-                # Temperature: ±2°C random variation
-                # Rainfall: ±15% random variation
-                temp_variation = random.uniform(-2.0, 2.0)
-                rain_variation = random.uniform(-15.0, 15.0)
-                
-                # Calculate yield for this year using resilient seed
-                year_yield = calculate_yield(
-                    temp=base_temp,
-                    rain=base_rain,
-                    seed_type=SEED_TYPES['resilient'],
-                    crop_type=crop_type,
-                    temp_delta=temp_variation,
-                    rain_pct_change=rain_variation
-                )
-                
-                annual_yields.append(year_yield)
-            
-            # Calculate statistics for this location
-            import statistics
-            mean_yield = statistics.mean(annual_yields)
-            location_cv = calculate_volatility(annual_yields)
-            
-            # Assume 1 hectare per location for tonnage calculation
-            # Tonnage = (mean_yield / 100) * max_potential_tons_per_hectare
-            # For simplicity, assume max potential = 10 tons/ha
-            max_potential_tons = 10.0
-            location_tonnage = (mean_yield / 100.0) * max_potential_tons
-            
-            total_tonnage += location_tonnage
-            all_location_cvs.append(location_cv)
-            
+        
+        # Simulate climate variability for all locations in one vectorized pass:
+        # Temperature: ±2°C random variation
+        # Rainfall: ±15% random variation
+        ensemble = simulate_yield_ensemble(
+            base_temps=base_temps,
+            base_rains=base_rains,
+            crop_type=crop_type,
+            seed_type=SEED_TYPES['resilient'],
+            num_years=years,
+            num_members=ensemble_members,
+            random_seed=random_seed,
+            max_potential_tons=MAX_POTENTIAL_TONS_PER_HA
+        )
+        
+        location_stats = ensemble['locations']
+        location_results = []
+        
+        for idx, (lat, lon) in enumerate(coordinates):
             location_results.append({
                 'location_index': idx,
                 'lat': lat,
                 'lon': lon,
-                'mean_yield_pct': round(mean_yield, 2),
-                'volatility_cv_pct': location_cv,
-                'tonnage': round(location_tonnage, 2)
+                'mean_yield_pct': round(float(location_stats['mean_yield_pct'][idx]), 2),
+                'volatility_cv_pct': round(float(location_stats['volatility_cv_pct'][idx]), 2),
+                'tonnage': round(float(location_stats['tonnage'][idx]), 2),
+                'yield_p5_pct': round(float(location_stats['yield_p5'][idx]), 2),
+                'yield_p95_pct': round(float(location_stats['yield_p95'][idx]), 2)
             })
-            
-            print(f"[PORTFOLIO] Location {idx+1} complete: mean_yield={mean_yield:.2f}%, CV={location_cv:.2f}%, tonnage={location_tonnage:.2f}t", file=sys.stderr, flush=True)
+        
+        portfolio = ensemble['portfolio']
+        total_tonnage = portfolio['mean_tonnage']
         
         # Calculate portfolio-level volatility (average of all CVs)
-        portfolio_volatility = statistics.mean(all_location_cvs) if all_location_cvs else 0.0
+        portfolio_volatility = float(location_stats['volatility_cv_pct'].round(2).mean())
         
         # Determine risk rating based on portfolio volatility
         if portfolio_volatility < 10.0:
@@ -1678,12 +2043,23 @@ def predict_portfolio():
                     'num_locations': len(locations),
                     'crop_type': crop_type
                 },
+                'tonnage_risk': {
+                    'tonnage_cv_pct': round(portfolio['tonnage_cv_pct'], 2),
+                    'p5_tonnage': round(portfolio['tonnage_p5'], 2),
+                    'p50_tonnage': round(portfolio['tonnage_p50'], 2),
+                    'p95_tonnage': round(portfolio['tonnage_p95'], 2),
+                    'var_95_tonnage': round(portfolio['var_tonnage'], 2),
+                    'cvar_95_tonnage': round(portfolio['cvar_tonnage'], 2)
+                },
+                'simulation': ensemble['simulation'],
                 'locations': location_results,
                 'risk_interpretation': {
                     'low': '0-10% CV: Very stable production',
                     'medium': '10-20% CV: Moderate variation',
                     'high': '20-30% CV: Significant variation',
-                    'very_high': '30%+ CV: Highly volatile'
+                    'very_high': '30%+ CV: Highly volatile',
+                    'var_95_tonnage': 'Tonnage shortfall vs. expected in a 1-in-20 bad year',
+                    'cvar_95_tonnage': 'Average tonnage shortfall across the worst 5% of years'
                 }
             }
         }), 200
@@ -1704,6 +2080,537 @@ def predict_portfolio():
         }), 500
 
 
+@app.route('/scenario-cube', methods=['POST'])
+def scenario_cube():
+    """
+    Precompute yields over a temp_delta × rain_pct_change grid for one location.
+    
+    Returns the full matrix for both seed types in one vectorized pass, so
+    slider-driven clients can interpolate locally instead of calling /predict
+    on every slider tick.
+    
+    Baseline: lat/lon (GEE lookup) or temp/rain, as in /predict.
+    Optional grids (list of values or {min, max, step}):
+    - temp_deltas: default -2.0..+5.0 °C step 0.5
+    - rain_pct_changes: default -50..+50 % step 5
+    """
+    if not request.is_json:
+        return jsonify({
+            'status': 'error',
+            'message': 'Request must be JSON',
+            'code': 'INVALID_CONTENT_TYPE'
+        }), 400
+    
+    try:
+        data = request.get_json()
+        
+        crop_type = data.get('crop_type', 'maize').lower()
+        if crop_type not in CROP_CODES:
+            return jsonify({
+                'status': 'error',
+                'message': f"Unsupported crop_type: {crop_type}. Supported crops: {', '.join(sorted(CROP_CODES))}",
+                'code': 'INVALID_CROP_TYPE'
+            }), 400
+        
+        try:
+            temp_deltas = _parse_scenario_axis(data.get('temp_deltas'), SCENARIO_TEMP_DELTA_RANGE)
+            rain_pct_changes = _parse_scenario_axis(data.get('rain_pct_changes'), SCENARIO_RAIN_PCT_RANGE)
+        except (TypeError, ValueError) as grid_error:
+            return jsonify({
+                'status': 'error',
+                'message': f'Invalid scenario grid: {str(grid_error)}',
+                'code': 'INVALID_GRID'
+            }), 400
+        
+        if temp_deltas.size * rain_pct_changes.size > MAX_SCENARIO_CELLS:
+            return jsonify({
+                'status': 'error',
+                'message': f'Scenario grid too large: at most {MAX_SCENARIO_CELLS:,} temp × rain cells',
+                'code': 'INVALID_GRID'
+            }), 400
+        
+        baseline, error_response = _resolve_baseline_climate(data)
+        if error_response is not None:
+            return error_response
+        
+        # seed × temp_delta × rain_pct_change in one kernel call
+        seed_axis = np.array([SEED_TYPES['standard'], SEED_TYPES['resilient']])
+        cube = calculate_yield_batch(
+            temp=baseline['temp'],
+            rain=baseline['rain'],
+            seed_type=seed_axis[:, None, None],
+            crop_type=crop_type,
+            temp_delta=temp_deltas[None, :, None],
+            rain_pct_change=rain_pct_changes[None, None, :]
+        )
+        cube = np.round(cube, 2)
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'crop_type': crop_type,
+                'baseline': {
+                    'temp': baseline['temp'],
+                    'rain': baseline['rain'],
+                    'data_source': baseline['data_source'],
+                    'location': baseline['location']
+                },
+                'axes': {
+                    'temp_delta': temp_deltas.tolist(),
+                    'rain_pct_change': rain_pct_changes.tolist()
+                },
+                'yields': {
+                    'standard_seed': cube[0].tolist(),
+                    'resilient_seed': cube[1].tolist()
+                },
+                'layout': 'yields[seed][i][j] = yield % at temp_delta[i], rain_pct_change[j]'
+            }
+        }), 200
+    
+    except ValueError as ve:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid numeric values: {str(ve)}',
+            'code': 'INVALID_NUMERIC_VALUE'
+        }), 400
+    except Exception as e:
+        import sys
+        print(f"Scenario cube error: {e}", file=sys.stderr, flush=True)
+        return jsonify({
+            'status': 'error',
+            'message': f'Scenario cube failed: {str(e)}',
+            'code': 'SCENARIO_CUBE_ERROR'
+        }), 500
+
+
+def _parse_climate_trajectory(spec, num_years, defaults):
+    """
+    Per-year climate values for years 1..num_years.
+    
+    spec maps each key of defaults to a list of num_years values or a single
+    value for every year; missing keys keep their default every year.
+    
+    Returns:
+        (dict of arrays, None) or (None, error response)
+    """
+    if not isinstance(spec, dict):
+        return None, (jsonify({
+            'status': 'error',
+            'message': f'climate_trajectory must be an object with {", ".join(defaults)}',
+            'code': 'INVALID_CLIMATE_TRAJECTORY'
+        }), 400)
+    
+    unknown = set(spec) - set(defaults)
+    if unknown:
+        return None, (jsonify({
+            'status': 'error',
+            'message': f'Unknown climate_trajectory fields: {", ".join(sorted(unknown))}. Use {", ".join(defaults)}',
+            'code': 'INVALID_CLIMATE_TRAJECTORY'
+        }), 400)
+    
+    trajectory = {}
+    for key, default in defaults.items():
+        try:
+            values = np.asarray(spec.get(key, default), dtype=float)
+        except (TypeError, ValueError):
+            values = None
+        if values is None or not np.isfinite(values).all():
+            return None, (jsonify({
+                'status': 'error',
+                'message': f'climate_trajectory.{key} must be a number or a list of numbers',
+                'code': 'INVALID_CLIMATE_TRAJECTORY'
+            }), 400)
+        if values.ndim == 0:
+            values = np.full(num_years, float(values))
+        if values.shape != (num_years,):
+            return None, (jsonify({
+                'status': 'error',
+                'message': f'climate_trajectory.{key} needs {num_years} values (one per year), got {values.size}',
+                'code': 'INVALID_CLIMATE_TRAJECTORY'
+            }), 400)
+        trajectory[key] = values
+    
+    return trajectory, None
+
+
+def _parse_slr_trajectory(spec, num_years):
+    """
+    Sea-level rise (m) for years 1..num_years: a list of num_years values or a
+    single value for every year. It replaces slr_projection in the cash flows.
+    
+    Returns:
+        (array, None) or (None, error response)
+    """
+    try:
+        values = np.asarray(spec, dtype=float)
+    except (TypeError, ValueError):
+        values = None
+    if values is None or values.ndim > 1 or not np.isfinite(values).all() or np.any(values < 0):
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'infrastructure_params.slr_trajectory_m must be a non-negative number or a list of them',
+            'code': 'INVALID_SLR_TRAJECTORY'
+        }), 400)
+    if values.ndim == 0:
+        values = np.full(num_years, float(values))
+    if values.shape != (num_years,):
+        return None, (jsonify({
+            'status': 'error',
+            'message': f'infrastructure_params.slr_trajectory_m needs {num_years} values (one per year), got {values.size}',
+            'code': 'INVALID_SLR_TRAJECTORY'
+        }), 400)
+    return values, None
+
+
+def _tipping_value(value, undefined=False):
+    """JSON form of a tipping point: (rounded delta or None, status)."""
+    if undefined:
+        # Percent changes of zero baseline rainfall leave it at zero
+        return None, 'undefined_zero_baseline_rain'
+    if np.isnan(value):
+        return None, 'below_threshold_everywhere'
+    if np.isinf(value):
+        return None, 'never'
+    return round(float(value), 2), 'crossing'
+
+
+@app.route('/tipping-point', methods=['POST'])
+def tipping_point():
+    """
+    Solve for the climate deltas at which yield falls below a threshold.
+    
+    Answers "at what temp_delta (or rain_pct_change) does yield drop below
+    threshold_pct?" in closed form, for both seed types.
+    
+    Sites: lat/lon (GEE lookup) or temp/rain as in /predict, or a `sites`
+    list of {temp, rain} baselines solved in one vectorized pass.
+    
+    Optional fields:
+    - threshold_pct: Yield threshold (default: 50)
+    - temp_delta: Temperature increase held fixed for the rainfall solve (default: 0)
+    - rain_pct_change: Rainfall change held fixed for the temperature solve (default: 0)
+    """
+    if not request.is_json:
+        return jsonify({
+            'status': 'error',
+            'message': 'Request must be JSON',
+            'code': 'INVALID_CONTENT_TYPE'
+        }), 400
+    
+    try:
+        data = request.get_json()
+        
+        crop_type = data.get('crop_type', 'maize').lower()
+        if crop_type not in CROP_CODES:
+            return jsonify({
+                'status': 'error',
+                'message': f"Unsupported crop_type: {crop_type}. Supported crops: {', '.join(sorted(CROP_CODES))}",
+                'code': 'INVALID_CROP_TYPE'
+            }), 400
+        
+        threshold_pct = float(data.get('threshold_pct', 50.0))
+        if not (0.0 < threshold_pct <= 100.0):
+            return jsonify({
+                'status': 'error',
+                'message': 'threshold_pct must be greater than 0 and at most 100',
+                'code': 'INVALID_THRESHOLD'
+            }), 400
+        
+        temp_delta = float(data.get('temp_delta', 0.0))
+        rain_pct_change = float(data.get('rain_pct_change', 0.0))
+        
+        if 'sites' in data:
+            sites = data['sites']
+            if not isinstance(sites, list) or not (0 < len(sites) <= MAX_TIPPING_POINT_SITES):
+                return jsonify({
+                    'status': 'error',
+                    'message': f'sites must be a non-empty list of at most {MAX_TIPPING_POINT_SITES:,} {{temp, rain}} entries',
+                    'code': 'INVALID_SITES'
+                }), 400
+            temps = np.array([float(site['temp']) for site in sites])
+            rains = np.array([float(site['rain']) for site in sites])
+            invalid = ~np.isfinite(temps) | ~np.isfinite(rains) | (rains < 0)
+            if invalid.any():
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Each site needs finite temp and non-negative rain (sites {", ".join(str(i) for i in np.flatnonzero(invalid)[:5])})',
+                    'code': 'INVALID_SITES'
+                }), 400
+            data_source = 'manual'
+        else:
+            baseline, error_response = _resolve_baseline_climate(data)
+            if error_response is not None:
+                return error_response
+            temps = np.array([baseline['temp']])
+            rains = np.array([baseline['rain']])
+            data_source = baseline['data_source']
+        
+        # sites × seed types in one solve
+        seed_axis = np.array([SEED_TYPES['standard'], SEED_TYPES['resilient']])
+        points = calculate_tipping_points(
+            temp=temps[:, None],
+            rain=rains[:, None],
+            seed_type=seed_axis[None, :],
+            crop_type=crop_type,
+            threshold_pct=threshold_pct,
+            temp_delta=temp_delta,
+            rain_pct_change=rain_pct_change
+        )
+        
+        results = []
+        for i in range(len(temps)):
+            site_result = {'temp': float(temps[i]), 'rain': float(rains[i])}
+            for j, seed_name in enumerate(('standard_seed', 'resilient_seed')):
+                temp_value, temp_status = _tipping_value(points.temp_delta[i, j])
+                lower_value, lower_status = _tipping_value(points.rain_pct_change_lower[i, j], rains[i] <= 0)
+                upper_value, upper_status = _tipping_value(points.rain_pct_change_upper[i, j], rains[i] <= 0)
+                site_result[seed_name] = {
+                    'temp_delta': temp_value,
+                    'temp_delta_status': temp_status,
+                    'rain_pct_change_lower': lower_value,
+                    'rain_pct_change_lower_status': lower_status,
+                    'rain_pct_change_upper': upper_value,
+                    'rain_pct_change_upper_status': upper_status
+                }
+            results.append(site_result)
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'crop_type': crop_type,
+                'threshold_pct': threshold_pct,
+                'data_source': data_source,
+                'held_fixed': {
+                    'temp_delta': temp_delta,
+                    'rain_pct_change': rain_pct_change
+                },
+                'sites': results,
+                'interpretation': {
+                    'temp_delta': 'Yield falls below the threshold for any temp_delta above this value',
+                    'rain_pct_change_lower': 'Drought side: yield falls below the threshold below this rain_pct_change',
+                    'rain_pct_change_upper': 'Waterlogging side: yield falls below the threshold above this rain_pct_change',
+                    'never': 'This direction never pushes yield below the threshold',
+                    'below_threshold_everywhere': 'Yield is below the threshold whatever this delta is',
+                    'undefined_zero_baseline_rain': 'Baseline rainfall is 0 mm, so a rain_pct_change cannot change it'
+                }
+            }
+        }), 200
+    
+    except (KeyError, TypeError) as field_error:
+        return jsonify({
+            'status': 'error',
+            'message': f'Each site needs numeric temp and rain: {str(field_error)}',
+            'code': 'INVALID_SITES'
+        }), 400
+    except ValueError as ve:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid numeric values: {str(ve)}',
+            'code': 'INVALID_NUMERIC_VALUE'
+        }), 400
+    except Exception as e:
+        import sys
+        print(f"Tipping point error: {e}", file=sys.stderr, flush=True)
+        return jsonify({
+            'status': 'error',
+            'message': f'Tipping point analysis failed: {str(e)}',
+            'code': 'TIPPING_POINT_ERROR'
+        }), 500
+
+
+@app.route('/sensitivity/tornado', methods=['POST'])
+def sensitivity_tornado():
+    """
+    One-shot tornado sensitivity of project NPV.
+    
+    Takes a base case plus low/high bounds per driver (capex, opex,
+    price_per_ton, yield_benefit_pct, discount_rate, temp_increase,
+    rain_change), evaluates every one-at-a-time variant in one batch and
+    returns the drivers ranked by NPV swing.
+    
+    Baseline climate: lat/lon (GEE lookup) or temp/rain, as in /predict.
+    Optional fields:
+    - base_case: {driver: value} (defaults as /predict project_params)
+    - bounds: {driver: {low, high}} (default: ±20%, ±1°C, ±10 pct points)
+    - analysis_years: default 10
+    """
+    if not request.is_json:
+        return jsonify({
+            'status': 'error',
+            'message': 'Request must be JSON',
+            'code': 'INVALID_CONTENT_TYPE'
+        }), 400
+    
+    try:
+        from sensitivity_engine import run_tornado_analysis
+        
+        data = request.get_json()
+        
+        crop_type = data.get('crop_type', 'maize').lower()
+        if crop_type not in CROP_CODES:
+            return jsonify({
+                'status': 'error',
+                'message': f"Unsupported crop_type: {crop_type}. Supported crops: {', '.join(sorted(CROP_CODES))}",
+                'code': 'INVALID_CROP_TYPE'
+            }), 400
+        
+        analysis_years = int(data.get('analysis_years', 10))
+        if not (1 <= analysis_years <= 100):
+            return jsonify({
+                'status': 'error',
+                'message': 'analysis_years must be between 1 and 100',
+                'code': 'INVALID_ANALYSIS_YEARS'
+            }), 400
+        
+        baseline, error_response = _resolve_baseline_climate(data)
+        if error_response is not None:
+            return error_response
+        
+        result = run_tornado_analysis(
+            base_temp=baseline['temp'],
+            base_rain=baseline['rain'],
+            crop_type=crop_type,
+            base_case=data.get('base_case'),
+            bounds=data.get('bounds'),
+            analysis_years=analysis_years
+        )
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'crop_type': crop_type,
+                'baseline_climate': {
+                    'temp': baseline['temp'],
+                    'rain': baseline['rain'],
+                    'data_source': baseline['data_source']
+                },
+                **result
+            }
+        }), 200
+    
+    except (ValueError, TypeError) as ve:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid sensitivity inputs: {str(ve)}',
+            'code': 'INVALID_NUMERIC_VALUE'
+        }), 400
+    except Exception as e:
+        import sys
+        print(f"Tornado analysis error: {e}", file=sys.stderr, flush=True)
+        return jsonify({
+            'status': 'error',
+            'message': f'Sensitivity analysis failed: {str(e)}',
+            'code': 'SENSITIVITY_ERROR'
+        }), 500
+
+
+@app.route('/npv-curve', methods=['POST'])
+def npv_curve():
+    """
+    NPV of a cash-flow series across a range of discount rates.
+    
+    Rates come from an explicit "rates" list or from min_rate/max_rate/rate_step
+    (default 0% to 20% in 1% steps). All rates are evaluated in one pass, and
+    sign changes of the curve bracket the IRR.
+    """
+    if not request.is_json:
+        return jsonify({
+            'status': 'error',
+            'message': 'Request must be JSON',
+            'code': 'INVALID_CONTENT_TYPE'
+        }), 400
+    
+    try:
+        data = request.get_json()
+        
+        cash_flows = data.get('cash_flows')
+        if not isinstance(cash_flows, list) or len(cash_flows) < 2:
+            return jsonify({
+                'status': 'error',
+                'message': 'cash_flows must be a list with at least 2 values',
+                'code': 'INVALID_CASH_FLOWS'
+            }), 400
+        cash_flows = [float(cf) for cf in cash_flows]
+        if not np.isfinite(cash_flows).all():
+            return jsonify({
+                'status': 'error',
+                'message': 'cash_flows must be finite numbers',
+                'code': 'INVALID_CASH_FLOWS'
+            }), 400
+        
+        if 'rates' in data:
+            if not isinstance(data['rates'], list) or not data['rates']:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'rates must be a non-empty list of discount rates (e.g., 0.10 for 10%)',
+                    'code': 'INVALID_RATES'
+                }), 400
+            rates = np.array([float(rate) for rate in data['rates']])
+            if not np.isfinite(rates).all():
+                return jsonify({
+                    'status': 'error',
+                    'message': 'rates must be finite discount rates (e.g., 0.10 for 10%)',
+                    'code': 'INVALID_RATES'
+                }), 400
+        else:
+            default_min, default_max, default_step = NPV_CURVE_RATE_RANGE
+            min_rate = float(data.get('min_rate', default_min))
+            max_rate = float(data.get('max_rate', default_max))
+            rate_step = float(data.get('rate_step', default_step))
+            if not np.isfinite([min_rate, max_rate, rate_step]).all() or rate_step <= 0 or max_rate < min_rate:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'rate range needs finite rates, rate_step > 0 and max_rate >= min_rate',
+                    'code': 'INVALID_RATES'
+                }), 400
+            num_rates = int(np.floor((max_rate - min_rate) / rate_step + 1e-9)) + 1
+            if num_rates > MAX_NPV_CURVE_RATES:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Rate range has {num_rates:,} rates; the maximum is {MAX_NPV_CURVE_RATES:,}',
+                    'code': 'TOO_MANY_RATES'
+                }), 400
+            rates = min_rate + rate_step * np.arange(num_rates)
+        
+        if rates.size > MAX_NPV_CURVE_RATES:
+            return jsonify({
+                'status': 'error',
+                'message': f'{rates.size:,} rates requested; the maximum is {MAX_NPV_CURVE_RATES:,}',
+                'code': 'TOO_MANY_RATES'
+            }), 400
+        
+        curve = calculate_npv_curve(cash_flows, rates)
+        irr = calculate_irr(cash_flows)
+        
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'cash_flows': cash_flows,
+                'rates': [round(float(rate), 6) for rate in curve['rates']],
+                'rates_pct': [round(float(rate) * 100, 4) for rate in curve['rates']],
+                'npv': [round(float(value), 2) for value in curve['npv']],
+                'irr_brackets': [
+                    {'low_rate': low, 'high_rate': high} for low, high in curve['irr_brackets']
+                ],
+                'irr': round(irr, 4) if irr is not None else None,
+                'num_rates': int(curve['rates'].size)
+            }
+        }), 200
+    
+    except (ValueError, TypeError) as ve:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid numeric values: {str(ve)}',
+            'code': 'INVALID_NUMERIC_VALUE'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'NPV curve calculation failed: {str(e)}',
+            'code': 'CALCULATION_ERROR'
+        }), 500
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -4,6 +4,10 @@
 # Supports: Maize, Cocoa, Rice, Soy, Wheat
 # =============================================================================
 
+from typing import NamedTuple
+
+import numpy as np
+
 # ============= MAIZE PARAMETERS =============
 # Critical temperature threshold (°C)
 MAIZE_CRITICAL_TEMP_C = 28.0  # Lowered to make heat stress more common
@@ -71,6 +75,228 @@ COCOA_HEAT_PENALTY_PER_DEGREE = 5.0  # 5% per degree above heat limit
 COCOA_RESILIENCE_DROUGHT_FACTOR = 0.6  # Resilient varieties lose only 60% as much under drought
 COCOA_RESILIENCE_HEAT_FACTOR = 0.7  # Resilient varieties lose only 70% as much under heat stress
 
+# ============= CROP PARAMETER REGISTRY =============
+# Model families. Staple crops use the maize-style multiplicative rainfall
+# model; cocoa uses additive drought/heat penalties.
+MODEL_STAPLE = 0
+MODEL_COCOA = 1
+
+
+class CropParameters(NamedTuple):
+    """One row (or, with array fields, the whole column store) of crop parameters."""
+    model: int
+    critical_temp_c: float
+    heat_loss_rate_optimal: float
+    heat_loss_rate_drought: float
+    min_rainfall_mm: float
+    optimal_rainfall_min_mm: float
+    optimal_rainfall_max_mm: float
+    resilience_delta_c: float
+    resilience_drought_factor: float
+    resilience_heat_factor: float
+    waterlog_loss_per_100mm: float
+    waterlog_resilience_multiplier: float
+    drought_loss_per_100mm: float
+    suboptimal_rain_max_penalty: float
+
+
+# One data row per crop. The row position is the crop code, so new crops are
+# added by appending a row here - no new functions are needed.
+_CROP_PARAMETER_ROWS = {
+    'maize': CropParameters(
+        model=MODEL_STAPLE,
+        critical_temp_c=MAIZE_CRITICAL_TEMP_C,
+        heat_loss_rate_optimal=MAIZE_HEAT_LOSS_RATE_OPTIMAL,
+        heat_loss_rate_drought=MAIZE_HEAT_LOSS_RATE_DROUGHT,
+        min_rainfall_mm=MAIZE_MIN_RAINFALL_MM,
+        optimal_rainfall_min_mm=MAIZE_OPTIMAL_RAINFALL_MIN_MM,
+        optimal_rainfall_max_mm=MAIZE_OPTIMAL_RAINFALL_MAX_MM,
+        resilience_delta_c=MAIZE_RESILIENCE_DELTA_C,
+        resilience_drought_factor=MAIZE_RESILIENCE_DROUGHT_FACTOR,
+        resilience_heat_factor=1.0,
+        waterlog_loss_per_100mm=5.0,
+        waterlog_resilience_multiplier=0.6,
+        drought_loss_per_100mm=0.0,
+        suboptimal_rain_max_penalty=0.0,
+    ),
+    'cocoa': CropParameters(
+        model=MODEL_COCOA,
+        critical_temp_c=COCOA_HEAT_LIMIT_C,
+        heat_loss_rate_optimal=COCOA_HEAT_PENALTY_PER_DEGREE,
+        heat_loss_rate_drought=COCOA_HEAT_PENALTY_PER_DEGREE,
+        min_rainfall_mm=COCOA_MIN_RAIN_MM,
+        optimal_rainfall_min_mm=COCOA_OPTIMAL_RAIN_MM,
+        optimal_rainfall_max_mm=float('inf'),  # No waterlogging penalty
+        resilience_delta_c=0.0,
+        resilience_drought_factor=COCOA_RESILIENCE_DROUGHT_FACTOR,
+        resilience_heat_factor=COCOA_RESILIENCE_HEAT_FACTOR,
+        waterlog_loss_per_100mm=0.0,
+        waterlog_resilience_multiplier=1.0,
+        drought_loss_per_100mm=COCOA_RAIN_PENALTY_PER_100MM,
+        suboptimal_rain_max_penalty=20.0,  # Max 20% penalty at minimum rain
+    ),
+    'rice': CropParameters(
+        model=MODEL_STAPLE,
+        critical_temp_c=RICE_CRITICAL_TEMP_C,
+        heat_loss_rate_optimal=RICE_HEAT_LOSS_RATE_OPTIMAL,
+        heat_loss_rate_drought=RICE_HEAT_LOSS_RATE_DROUGHT,
+        min_rainfall_mm=RICE_MIN_RAINFALL_MM,
+        optimal_rainfall_min_mm=RICE_OPTIMAL_RAINFALL_MIN_MM,
+        optimal_rainfall_max_mm=RICE_OPTIMAL_RAINFALL_MAX_MM,
+        resilience_delta_c=RICE_RESILIENCE_DELTA_C,
+        resilience_drought_factor=RICE_RESILIENCE_DROUGHT_FACTOR,
+        resilience_heat_factor=1.0,
+        waterlog_loss_per_100mm=RICE_WATERLOG_LOSS_PER_100MM,
+        waterlog_resilience_multiplier=0.8,
+        drought_loss_per_100mm=0.0,
+        suboptimal_rain_max_penalty=0.0,
+    ),
+    'soy': CropParameters(
+        model=MODEL_STAPLE,
+        critical_temp_c=SOY_CRITICAL_TEMP_C,
+        heat_loss_rate_optimal=SOY_HEAT_LOSS_RATE_OPTIMAL,
+        heat_loss_rate_drought=SOY_HEAT_LOSS_RATE_DROUGHT,
+        min_rainfall_mm=SOY_MIN_RAINFALL_MM,
+        optimal_rainfall_min_mm=SOY_OPTIMAL_RAINFALL_MIN_MM,
+        optimal_rainfall_max_mm=SOY_OPTIMAL_RAINFALL_MAX_MM,
+        resilience_delta_c=SOY_RESILIENCE_DELTA_C,
+        resilience_drought_factor=SOY_RESILIENCE_DROUGHT_FACTOR,
+        resilience_heat_factor=1.0,
+        waterlog_loss_per_100mm=SOY_WATERLOG_LOSS_PER_100MM,
+        waterlog_resilience_multiplier=0.6,
+        drought_loss_per_100mm=0.0,
+        suboptimal_rain_max_penalty=0.0,
+    ),
+    'wheat': CropParameters(
+        model=MODEL_STAPLE,
+        critical_temp_c=WHEAT_CRITICAL_TEMP_C,
+        heat_loss_rate_optimal=WHEAT_HEAT_LOSS_RATE_OPTIMAL,
+        heat_loss_rate_drought=WHEAT_HEAT_LOSS_RATE_DROUGHT,
+        min_rainfall_mm=WHEAT_MIN_RAINFALL_MM,
+        optimal_rainfall_min_mm=WHEAT_OPTIMAL_RAINFALL_MIN_MM,
+        optimal_rainfall_max_mm=WHEAT_OPTIMAL_RAINFALL_MAX_MM,
+        resilience_delta_c=WHEAT_RESILIENCE_DELTA_C,
+        resilience_drought_factor=WHEAT_RESILIENCE_DROUGHT_FACTOR,
+        resilience_heat_factor=1.0,
+        waterlog_loss_per_100mm=WHEAT_WATERLOG_LOSS_PER_100MM,
+        waterlog_resilience_multiplier=0.6,
+        drought_loss_per_100mm=0.0,
+        suboptimal_rain_max_penalty=0.0,
+    ),
+}
+
+# Integer crop codes (row index into the parameter table)
+CROP_NAMES = tuple(_CROP_PARAMETER_ROWS)
+CROP_CODES = {name: code for code, name in enumerate(CROP_NAMES)}
+
+# Row view (plain Python floats) for the scalar kernels
+_CROP_ROWS = tuple(_CROP_PARAMETER_ROWS.values())
+
+# Struct-of-arrays view for the batch kernels: CROP_PARAMS.<field>[crop_code]
+CROP_PARAMS = CropParameters(*(np.array(column) for column in zip(*_CROP_ROWS)))
+
+
+def _crop_code(crop_type: str) -> int:
+    """Look up the integer code for a crop name (case-insensitive)."""
+    try:
+        return CROP_CODES[crop_type.lower()]
+    except (KeyError, AttributeError):
+        supported = ', '.join(f"'{name}'" for name in CROP_NAMES)
+        raise ValueError(f"Unsupported crop_type: {crop_type}. Supported crops: {supported}") from None
+
+
+# ============= SCALAR KERNELS =============
+
+def _staple_yield(p: CropParameters, sim_temp: float, sim_rain: float, resilient: bool) -> float:
+    """Maize-style staple crop model evaluated on already-perturbed inputs."""
+    yield_pct = 100.0
+
+    effective_critical_temp = p.critical_temp_c
+    if resilient:
+        effective_critical_temp += p.resilience_delta_c
+
+    is_drought = sim_rain < p.optimal_rainfall_min_mm
+
+    if sim_temp > effective_critical_temp:
+        excess_temp = sim_temp - effective_critical_temp
+        loss_rate = p.heat_loss_rate_drought if is_drought else p.heat_loss_rate_optimal
+        yield_pct -= excess_temp * loss_rate
+
+    # Rainfall-based yield adjustments (piecewise)
+    if sim_rain < p.min_rainfall_mm:
+        rain_factor = sim_rain / p.min_rainfall_mm if p.min_rainfall_mm > 0 else 0.0
+        base_yield = rain_factor * 0.5
+
+        if resilient:
+            base_yield = min(base_yield * 1.3, 0.7)
+
+        yield_pct *= base_yield
+
+    elif sim_rain < p.optimal_rainfall_min_mm:
+        denom = (p.optimal_rainfall_min_mm - p.min_rainfall_mm)
+        rain_factor = 0.5 + 0.5 * (sim_rain - p.min_rainfall_mm) / denom if denom != 0 else 0.5
+
+        if resilient:
+            drought_penalty = 1.0 - rain_factor
+            rain_factor = 1.0 - (drought_penalty * p.resilience_drought_factor)
+
+        yield_pct *= rain_factor
+
+    elif sim_rain > p.optimal_rainfall_max_mm:
+        excess_rain = sim_rain - p.optimal_rainfall_max_mm
+        waterlog_loss = (excess_rain / 100.0) * p.waterlog_loss_per_100mm
+
+        if resilient:
+            waterlog_loss *= p.waterlog_resilience_multiplier
+
+        yield_pct -= waterlog_loss
+
+    return max(0.0, min(100.0, yield_pct))
+
+
+def _cocoa_yield(p: CropParameters, sim_temp: float, sim_rain: float, resilient: bool) -> float:
+    """Cocoa model (additive drought and heat penalties) on already-perturbed inputs."""
+    yield_pct = 100.0
+
+    # Rain Penalty: Cocoa is very sensitive to drought
+    if sim_rain < p.min_rainfall_mm:
+        # Steep penalty for rainfall below minimum
+        rain_deficit_mm = p.min_rainfall_mm - sim_rain
+        rain_penalty = (rain_deficit_mm / 100.0) * p.drought_loss_per_100mm
+
+        if resilient:
+            rain_penalty *= p.resilience_drought_factor
+
+        yield_pct -= rain_penalty
+    elif sim_rain < p.optimal_rainfall_min_mm:
+        # Sub-optimal rainfall: gentle linear reduction
+        rain_factor = sim_rain / p.optimal_rainfall_min_mm
+        rain_penalty = (1.0 - rain_factor) * p.suboptimal_rain_max_penalty
+
+        if resilient:
+            rain_penalty *= p.resilience_drought_factor
+
+        yield_pct -= rain_penalty
+    # Cocoa handles excess rainfall well (no waterlogging penalty like maize)
+
+    # Heat Penalty: Temperature above heat limit
+    if sim_temp > p.critical_temp_c:
+        excess_temp = sim_temp - p.critical_temp_c
+        heat_penalty = excess_temp * p.heat_loss_rate_optimal
+
+        if resilient:
+            heat_penalty *= p.resilience_heat_factor
+
+        yield_pct -= heat_penalty
+
+    return max(0.0, min(100.0, yield_pct))
+
+
+_SCALAR_KERNELS = {
+    MODEL_STAPLE: _staple_yield,
+    MODEL_COCOA: _cocoa_yield,
+}
+
 
 def calculate_cocoa_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
     """
@@ -88,49 +314,7 @@ def calculate_cocoa_yield(temp: float, rain: float, seed_type: int, temp_delta:
     Returns:
         Yield as percentage (0-100) of maximum potential yield
     """
-    # Start with 100% potential yield
-    yield_pct = 100.0
-    
-    # Apply climate perturbation using Delta Method
-    simulated_temp = temp + temp_delta
-    simulated_rain = max(0.0, rain * (1 + (rain_pct_change / 100)))
-    
-    # Rain Penalty: Cocoa is very sensitive to drought
-    if simulated_rain < COCOA_MIN_RAIN_MM:
-        # Steep penalty for rainfall below minimum
-        rain_deficit_mm = COCOA_MIN_RAIN_MM - simulated_rain
-        rain_penalty = (rain_deficit_mm / 100.0) * COCOA_RAIN_PENALTY_PER_100MM
-        
-        # Resilient varieties handle drought better
-        if seed_type == 1:
-            rain_penalty *= COCOA_RESILIENCE_DROUGHT_FACTOR
-        
-        yield_pct -= rain_penalty
-    elif simulated_rain < COCOA_OPTIMAL_RAIN_MM:
-        # Sub-optimal rainfall: gentle linear reduction
-        rain_factor = simulated_rain / COCOA_OPTIMAL_RAIN_MM
-        rain_penalty = (1.0 - rain_factor) * 20.0  # Max 20% penalty at minimum rain
-        
-        # Resilient varieties handle sub-optimal rain better
-        if seed_type == 1:
-            rain_penalty *= COCOA_RESILIENCE_DROUGHT_FACTOR
-        
-        yield_pct -= rain_penalty
-    # Cocoa handles excess rainfall well (no waterlogging penalty like maize)
-    
-    # Heat Penalty: Temperature above heat limit
-    if simulated_temp > COCOA_HEAT_LIMIT_C:
-        excess_temp = simulated_temp - COCOA_HEAT_LIMIT_C
-        heat_penalty = excess_temp * COCOA_HEAT_PENALTY_PER_DEGREE
-        
-        # Resilient varieties tolerate heat better
-        if seed_type == 1:
-            heat_penalty *= COCOA_RESILIENCE_HEAT_FACTOR
-        
-        yield_pct -= heat_penalty
-    
-    # Clamp yield between 0 and 100
-    return max(0.0, min(100.0, yield_pct))
+    return calculate_yield(temp, rain, seed_type, 'cocoa', temp_delta, rain_pct_change)
 
 
 def _calculate_staple_crop_yield(
@@ -151,166 +335,612 @@ def _calculate_staple_crop_yield(
     waterlog_loss_per_100mm: float,
     waterlog_resilience_multiplier: float = 0.6,
 ) -> float:
-    """Generic yield model used for maize-like staple crops."""
-    yield_pct = 100.0
+    """Generic yield model used for maize-like staple crops with ad-hoc parameters.
 
+    Registered crops are evaluated straight from the parameter table; this
+    keyword form is kept for experimenting with parameter sets.
+    """
+    params = CropParameters(
+        model=MODEL_STAPLE,
+        critical_temp_c=critical_temp_c,
+        heat_loss_rate_optimal=heat_loss_rate_optimal,
+        heat_loss_rate_drought=heat_loss_rate_drought,
+        min_rainfall_mm=min_rainfall_mm,
+        optimal_rainfall_min_mm=optimal_rainfall_min_mm,
+        optimal_rainfall_max_mm=optimal_rainfall_max_mm,
+        resilience_delta_c=resilience_delta_c,
+        resilience_drought_factor=resilience_drought_factor,
+        resilience_heat_factor=1.0,
+        waterlog_loss_per_100mm=waterlog_loss_per_100mm,
+        waterlog_resilience_multiplier=waterlog_resilience_multiplier,
+        drought_loss_per_100mm=0.0,
+        suboptimal_rain_max_penalty=0.0,
+    )
     simulated_temp = temp + temp_delta
     simulated_rain = max(0.0, rain * (1 + (rain_pct_change / 100)))
+    return _staple_yield(params, simulated_temp, simulated_rain, seed_type == 1)
 
-    effective_critical_temp = critical_temp_c
-    if seed_type == 1:
-        effective_critical_temp += resilience_delta_c
 
-    is_drought = simulated_rain < optimal_rainfall_min_mm
+def calculate_maize_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
+    """Calculate maize yield based on temperature, rainfall, and seed type."""
+    return calculate_yield(temp, rain, seed_type, 'maize', temp_delta, rain_pct_change)
 
-    if simulated_temp > effective_critical_temp:
-        excess_temp = simulated_temp - effective_critical_temp
-        loss_rate = heat_loss_rate_drought if is_drought else heat_loss_rate_optimal
-        yield_pct -= excess_temp * loss_rate
 
-    # Rainfall-based yield adjustments (piecewise)
-    if simulated_rain < min_rainfall_mm:
-        rain_factor = simulated_rain / min_rainfall_mm if min_rainfall_mm > 0 else 0.0
-        base_yield = rain_factor * 0.5
+def calculate_rice_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
+    """Calculate rice yield (simplified water-tolerant crop model)."""
+    return calculate_yield(temp, rain, seed_type, 'rice', temp_delta, rain_pct_change)
 
-        if seed_type == 1:
-            base_yield = min(base_yield * 1.3, 0.7)
 
-        yield_pct *= base_yield
+def calculate_soy_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
+    """Calculate soy yield (simplified staple crop model)."""
+    return calculate_yield(temp, rain, seed_type, 'soy', temp_delta, rain_pct_change)
 
-    elif simulated_rain < optimal_rainfall_min_mm:
-        denom = (optimal_rainfall_min_mm - min_rainfall_mm)
-        rain_factor = 0.5 + 0.5 * (simulated_rain - min_rainfall_mm) / denom if denom != 0 else 0.5
 
-        if seed_type == 1:
-            drought_penalty = 1.0 - rain_factor
-            rain_factor = 1.0 - (drought_penalty * resilience_drought_factor)
+def calculate_wheat_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
+    """Calculate wheat yield (simplified cool-season staple crop model)."""
+    return calculate_yield(temp, rain, seed_type, 'wheat', temp_delta, rain_pct_change)
 
-        yield_pct *= rain_factor
 
-    elif simulated_rain > optimal_rainfall_max_mm:
-        excess_rain = simulated_rain - optimal_rainfall_max_mm
-        waterlog_loss = (excess_rain / 100.0) * waterlog_loss_per_100mm
+def calculate_yield(temp: float, rain: float, seed_type: int, crop_type: str = 'maize', temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
+    """Calculate crop yield based on temperature, rainfall, seed type, and crop type.
 
-        if seed_type == 1:
-            waterlog_loss *= waterlog_resilience_multiplier
+    This is the main entry point for yield calculations.
 
-        yield_pct -= waterlog_loss
+    Supported crop types are the rows of the crop parameter table:
+    - maize
+    - cocoa
+    - rice
+    - soy
+    - wheat
+    """
+    params = _CROP_ROWS[_crop_code(crop_type)]
 
-    return max(0.0, min(100.0, yield_pct))
+    # Apply climate perturbation using Delta Method
+    simulated_temp = temp + temp_delta
+    simulated_rain = max(0.0, rain * (1 + (rain_pct_change / 100)))
 
+    return _SCALAR_KERNELS[params.model](params, simulated_temp, simulated_rain, seed_type == 1)
 
-def calculate_maize_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
-    """Calculate maize yield based on temperature, rainfall, and seed type."""
-    return _calculate_staple_crop_yield(
-        temp=temp,
-        rain=rain,
-        seed_type=seed_type,
-        temp_delta=temp_delta,
-        rain_pct_change=rain_pct_change,
-        critical_temp_c=MAIZE_CRITICAL_TEMP_C,
-        heat_loss_rate_optimal=MAIZE_HEAT_LOSS_RATE_OPTIMAL,
-        heat_loss_rate_drought=MAIZE_HEAT_LOSS_RATE_DROUGHT,
-        min_rainfall_mm=MAIZE_MIN_RAINFALL_MM,
-        optimal_rainfall_min_mm=MAIZE_OPTIMAL_RAINFALL_MIN_MM,
-        optimal_rainfall_max_mm=MAIZE_OPTIMAL_RAINFALL_MAX_MM,
-        resilience_delta_c=MAIZE_RESILIENCE_DELTA_C,
-        resilience_drought_factor=MAIZE_RESILIENCE_DROUGHT_FACTOR,
-        waterlog_loss_per_100mm=5.0,
-        waterlog_resilience_multiplier=0.6,
+
+class PairedYields(NamedTuple):
+    """Standard and resilient seed outcomes for the same climate (floats or arrays)."""
+    standard_yield: float
+    resilient_yield: float
+    avoided_loss: float            # resilient - standard, in yield percentage points
+    percentage_improvement: float  # avoided_loss relative to the standard yield (%)
+
+
+def calculate_paired_yield(temp: float, rain: float, crop_type: str = 'maize', temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> PairedYields:
+    """Evaluate standard and resilient seeds together for one climate scenario.
+
+    The climate perturbation and crop lookup are done once and shared by both
+    seed types; the results equal two `calculate_yield` calls.
+
+    Returns:
+        PairedYields with both yields, the avoided loss and the percentage improvement
+    """
+    params = _CROP_ROWS[_crop_code(crop_type)]
+    kernel = _SCALAR_KERNELS[params.model]
+
+    # Apply climate perturbation using Delta Method
+    simulated_temp = temp + temp_delta
+    simulated_rain = max(0.0, rain * (1 + (rain_pct_change / 100)))
+
+    standard_yield = kernel(params, simulated_temp, simulated_rain, False)
+    resilient_yield = kernel(params, simulated_temp, simulated_rain, True)
+
+    avoided_loss = resilient_yield - standard_yield
+    percentage_improvement = (avoided_loss / standard_yield * 100) if standard_yield > 0 else 0.0
+
+    return PairedYields(standard_yield, resilient_yield, avoided_loss, percentage_improvement)
+
+
+# ============= VECTORIZED (BATCH) KERNELS =============
+
+def _to_crop_codes(crop_type) -> np.ndarray:
+    """Convert a crop name, crop code, or array of either into integer crop codes."""
+    if isinstance(crop_type, str):
+        return np.asarray(_crop_code(crop_type))
+
+    codes = np.asarray(crop_type)
+    if codes.dtype.kind in ('U', 'S', 'O'):
+        return np.vectorize(_crop_code, otypes=[np.int64])(codes)
+
+    codes = codes.astype(np.int64)
+    if codes.size and (codes.min() < 0 or codes.max() >= len(CROP_NAMES)):
+        raise ValueError(f"Crop codes must be between 0 and {len(CROP_NAMES) - 1}")
+    return codes
+
+
+# Active-regime bit flags returned with yield sensitivities
+REGIME_HEAT = 1
+REGIME_DROUGHT = 2
+REGIME_WATERLOG = 4
+
+
+class YieldSensitivities(NamedTuple):
+    """Yields with their analytic partial derivatives and active regimes.
+
+    Derivatives are with respect to the base `temp` (°C) and `rain` (mm)
+    inputs, in yield percentage points per unit. On each linear segment of the
+    model they are exact; at a kink they take the value of the segment the
+    point falls in (the same segment the yield itself is evaluated on).
+    Where the yield is clipped to 0 or 100, or rainfall is floored at 0, the
+    corresponding derivative is 0.
+
+    For the climate scenario inputs: dY/d(temp_delta) = d_yield_d_temp and
+    dY/d(rain_pct_change) = d_yield_d_rain * rain / 100.
+    """
+    yield_pct: np.ndarray
+    d_yield_d_temp: np.ndarray
+    d_yield_d_rain: np.ndarray
+    regime: np.ndarray  # Bitmask of REGIME_HEAT | REGIME_DROUGHT | REGIME_WATERLOG
+
+
+def _staple_yield_array(p: CropParameters, sim_temp: np.ndarray, sim_rain: np.ndarray, resilient: np.ndarray, sensitivities: bool = False):
+    """Array form of `_staple_yield`, before clipping to 0-100.
+
+    Every branch of the scalar model is evaluated with the same floating point
+    operations and then selected with masks, so results match the scalar path.
+    With `sensitivities`, also returns the slopes of the active segment with
+    respect to the effective temperature and rainfall, and the regime bitmask.
+    """
+    effective_critical_temp = np.where(resilient, p.critical_temp_c + p.resilience_delta_c, p.critical_temp_c)
+    is_drought = sim_rain < p.optimal_rainfall_min_mm
+
+    is_heat = sim_temp > effective_critical_temp
+    loss_rate = np.where(is_drought, p.heat_loss_rate_drought, p.heat_loss_rate_optimal)
+    heat_yield = np.where(is_heat, 100.0 - (sim_temp - effective_critical_temp) * loss_rate, 100.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Below minimum rainfall
+        base_yield = np.where(p.min_rainfall_mm > 0, sim_rain / p.min_rainfall_mm, 0.0) * 0.5
+        base_yield = np.where(resilient, np.minimum(base_yield * 1.3, 0.7), base_yield)
+
+        # Between minimum and optimal rainfall
+        denom = p.optimal_rainfall_min_mm - p.min_rainfall_mm
+        rain_factor = np.where(denom != 0, 0.5 + 0.5 * (sim_rain - p.min_rainfall_mm) / denom, 0.5)
+        rain_factor = np.where(resilient, 1.0 - ((1.0 - rain_factor) * p.resilience_drought_factor), rain_factor)
+
+        # Above optimal rainfall (waterlogging)
+        waterlog_loss = ((sim_rain - p.optimal_rainfall_max_mm) / 100.0) * p.waterlog_loss_per_100mm
+        waterlog_loss = np.where(resilient, waterlog_loss * p.waterlog_resilience_multiplier, waterlog_loss)
+
+    below_min = sim_rain < p.min_rainfall_mm
+    is_waterlog = sim_rain > p.optimal_rainfall_max_mm
+
+    yield_pct = np.where(
+        below_min,
+        heat_yield * base_yield,
+        np.where(
+            is_drought,
+            heat_yield * rain_factor,
+            np.where(is_waterlog, heat_yield - waterlog_loss, heat_yield),
+        ),
     )
 
+    if not sensitivities:
+        return yield_pct
 
-def calculate_rice_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
-    """Calculate rice yield (simplified water-tolerant crop model)."""
-    return _calculate_staple_crop_yield(
-        temp=temp,
-        rain=rain,
-        seed_type=seed_type,
-        temp_delta=temp_delta,
-        rain_pct_change=rain_pct_change,
-        critical_temp_c=RICE_CRITICAL_TEMP_C,
-        heat_loss_rate_optimal=RICE_HEAT_LOSS_RATE_OPTIMAL,
-        heat_loss_rate_drought=RICE_HEAT_LOSS_RATE_DROUGHT,
-        min_rainfall_mm=RICE_MIN_RAINFALL_MM,
-        optimal_rainfall_min_mm=RICE_OPTIMAL_RAINFALL_MIN_MM,
-        optimal_rainfall_max_mm=RICE_OPTIMAL_RAINFALL_MAX_MM,
-        resilience_delta_c=RICE_RESILIENCE_DELTA_C,
-        resilience_drought_factor=RICE_RESILIENCE_DROUGHT_FACTOR,
-        waterlog_loss_per_100mm=RICE_WATERLOG_LOSS_PER_100MM,
-        waterlog_resilience_multiplier=0.8,
+    with np.errstate(divide='ignore', invalid='ignore'):
+        base_slope = np.where(p.min_rainfall_mm > 0, 0.5 / p.min_rainfall_mm, 0.0)
+        capped = np.where(p.min_rainfall_mm > 0, sim_rain / p.min_rainfall_mm, 0.0) * 0.5 * 1.3 >= 0.7
+        base_slope = np.where(resilient, np.where(capped, 0.0, base_slope * 1.3), base_slope)
+
+        factor_slope = np.where(denom != 0, 0.5 / denom, 0.0)
+        factor_slope = np.where(resilient, factor_slope * p.resilience_drought_factor, factor_slope)
+
+    waterlog_slope = p.waterlog_loss_per_100mm / 100.0
+    waterlog_slope = np.where(resilient, waterlog_slope * p.waterlog_resilience_multiplier, waterlog_slope)
+
+    heat_slope = np.where(is_heat, -loss_rate, 0.0)
+    d_temp = np.where(below_min, heat_slope * base_yield, np.where(is_drought, heat_slope * rain_factor, heat_slope))
+    d_rain = np.where(
+        below_min,
+        heat_yield * base_slope,
+        np.where(is_drought, heat_yield * factor_slope, np.where(is_waterlog, -waterlog_slope, 0.0)),
+    )
+    regime = (
+        is_heat * REGIME_HEAT
+        | is_drought * REGIME_DROUGHT
+        | (is_waterlog & ~is_drought) * REGIME_WATERLOG
     )
 
+    return yield_pct, d_temp, d_rain, regime
 
-def calculate_soy_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
-    """Calculate soy yield (simplified staple crop model)."""
-    return _calculate_staple_crop_yield(
-        temp=temp,
-        rain=rain,
-        seed_type=seed_type,
-        temp_delta=temp_delta,
-        rain_pct_change=rain_pct_change,
-        critical_temp_c=SOY_CRITICAL_TEMP_C,
-        heat_loss_rate_optimal=SOY_HEAT_LOSS_RATE_OPTIMAL,
-        heat_loss_rate_drought=SOY_HEAT_LOSS_RATE_DROUGHT,
-        min_rainfall_mm=SOY_MIN_RAINFALL_MM,
-        optimal_rainfall_min_mm=SOY_OPTIMAL_RAINFALL_MIN_MM,
-        optimal_rainfall_max_mm=SOY_OPTIMAL_RAINFALL_MAX_MM,
-        resilience_delta_c=SOY_RESILIENCE_DELTA_C,
-        resilience_drought_factor=SOY_RESILIENCE_DROUGHT_FACTOR,
-        waterlog_loss_per_100mm=SOY_WATERLOG_LOSS_PER_100MM,
-        waterlog_resilience_multiplier=0.6,
+
+def _cocoa_yield_array(p: CropParameters, sim_temp: np.ndarray, sim_rain: np.ndarray, resilient: np.ndarray, sensitivities: bool = False):
+    """Array form of `_cocoa_yield`, before clipping to 0-100."""
+    below_min = sim_rain < p.min_rainfall_mm
+    is_drought = sim_rain < p.optimal_rainfall_min_mm
+    is_heat = sim_temp > p.critical_temp_c
+
+    rain_penalty = np.where(
+        below_min,
+        ((p.min_rainfall_mm - sim_rain) / 100.0) * p.drought_loss_per_100mm,
+        np.where(
+            is_drought,
+            (1.0 - sim_rain / p.optimal_rainfall_min_mm) * p.suboptimal_rain_max_penalty,
+            0.0,
+        ),
     )
+    rain_penalty = np.where(resilient, rain_penalty * p.resilience_drought_factor, rain_penalty)
+    yield_pct = 100.0 - rain_penalty
 
+    heat_penalty = (sim_temp - p.critical_temp_c) * p.heat_loss_rate_optimal
+    heat_penalty = np.where(resilient, heat_penalty * p.resilience_heat_factor, heat_penalty)
+    yield_pct = np.where(is_heat, yield_pct - heat_penalty, yield_pct)
 
-def calculate_wheat_yield(temp: float, rain: float, seed_type: int, temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
-    """Calculate wheat yield (simplified cool-season staple crop model)."""
-    return _calculate_staple_crop_yield(
-        temp=temp,
-        rain=rain,
-        seed_type=seed_type,
-        temp_delta=temp_delta,
-        rain_pct_change=rain_pct_change,
-        critical_temp_c=WHEAT_CRITICAL_TEMP_C,
-        heat_loss_rate_optimal=WHEAT_HEAT_LOSS_RATE_OPTIMAL,
-        heat_loss_rate_drought=WHEAT_HEAT_LOSS_RATE_DROUGHT,
-        min_rainfall_mm=WHEAT_MIN_RAINFALL_MM,
-        optimal_rainfall_min_mm=WHEAT_OPTIMAL_RAINFALL_MIN_MM,
-        optimal_rainfall_max_mm=WHEAT_OPTIMAL_RAINFALL_MAX_MM,
-        resilience_delta_c=WHEAT_RESILIENCE_DELTA_C,
-        resilience_drought_factor=WHEAT_RESILIENCE_DROUGHT_FACTOR,
-        waterlog_loss_per_100mm=WHEAT_WATERLOG_LOSS_PER_100MM,
-        waterlog_resilience_multiplier=0.6,
+    if not sensitivities:
+        return yield_pct
+
+    d_rain = np.where(
+        below_min,
+        p.drought_loss_per_100mm / 100.0,
+        np.where(is_drought, p.suboptimal_rain_max_penalty / p.optimal_rainfall_min_mm, 0.0),
     )
+    d_rain = np.where(resilient, d_rain * p.resilience_drought_factor, d_rain)
 
+    heat_slope = np.where(resilient, p.heat_loss_rate_optimal * p.resilience_heat_factor, p.heat_loss_rate_optimal)
+    d_temp = np.where(is_heat, -heat_slope, 0.0)
+    regime = is_heat * REGIME_HEAT | is_drought * REGIME_DROUGHT
 
-def calculate_yield(temp: float, rain: float, seed_type: int, crop_type: str = 'maize', temp_delta: float = 0.0, rain_pct_change: float = 0.0) -> float:
-    """Calculate crop yield based on temperature, rainfall, seed type, and crop type.
+    return yield_pct, d_temp, d_rain, regime
 
-    This is the main entry point for yield calculations.
 
-    Supported crop types:
-    - maize
-    - cocoa
-    - rice
-    - soy
-    - wheat
+def _crop_yield_array(codes: np.ndarray, sim_temp: np.ndarray, sim_rain: np.ndarray, resilient: np.ndarray, sensitivities: bool = False):
+    """Evaluate any mix of crops by gathering their parameter rows (no per-row dispatch).
+
+    Returns the yields clipped to 0-100, or with `sensitivities` a tuple of
+    (yields, d_temp, d_rain, regime) with derivatives zeroed where clipped.
+    """
+    p = CropParameters(*(column[codes] for column in CROP_PARAMS))
+
+    is_cocoa = p.model == MODEL_COCOA
+    if not np.any(is_cocoa):
+        result = _staple_yield_array(p, sim_temp, sim_rain, resilient, sensitivities)
+    elif np.all(is_cocoa):
+        result = _cocoa_yield_array(p, sim_temp, sim_rain, resilient, sensitivities)
+    else:
+        cocoa = _cocoa_yield_array(p, sim_temp, sim_rain, resilient, sensitivities)
+        staple = _staple_yield_array(p, sim_temp, sim_rain, resilient, sensitivities)
+        if sensitivities:
+            result = tuple(np.where(is_cocoa, c, s) for c, s in zip(cocoa, staple))
+        else:
+            result = np.where(is_cocoa, cocoa, staple)
+
+    if not sensitivities:
+        return np.clip(result, 0.0, 100.0)
+
+    yield_pct, d_temp, d_rain, regime = result
+    clipped = (yield_pct < 0.0) | (yield_pct > 100.0)
+    return (
+        np.clip(yield_pct, 0.0, 100.0),
+        np.where(clipped, 0.0, d_temp),
+        np.where(clipped, 0.0, d_rain),
+        regime,
+    )
+
+
+def calculate_yield_batch(
+    temp,
+    rain,
+    seed_type,
+    crop_type='maize',
+    temp_delta=0.0,
+    rain_pct_change=0.0,
+    method: str = 'exact',
+    sensitivities: bool = False,
+):
+    """Vectorized counterpart of `calculate_yield` for arrays of inputs.
+
+    All arguments broadcast against each other, so scalars can be mixed with
+    arrays (e.g. one crop for many sites, or one site under many deltas).
+
+    Args:
+        temp: Temperature(s) in °C
+        rain: Rainfall(s) in mm
+        seed_type: 0 = Standard, 1 = Resilient (scalar or array)
+        crop_type: Crop name, integer crop code (see CROP_CODES), or an array of either
+        temp_delta: Temperature increase(s) for climate scenario (°C)
+        rain_pct_change: Percentage change(s) in rainfall
+        method: 'exact' (default) evaluates the model; 'lookup' interpolates the
+            precomputed surfaces built by `yield_lookup.py --build`
+        sensitivities: If True, also return dYield/dTemp, dYield/dRain and the
+            active regime from the same pass (exact method only)
+
+    Returns:
+        Array of yields as percentage (0-100), matching `calculate_yield` element-wise,
+        or a `YieldSensitivities` tuple when `sensitivities` is True
+    """
+    if method == 'lookup':
+        if sensitivities:
+            raise ValueError("Sensitivities are only available with method='exact'")
+        from yield_lookup import lookup_yield_batch
+        return lookup_yield_batch(temp, rain, seed_type, crop_type, temp_delta, rain_pct_change)
+    if method != 'exact':
+        raise ValueError(f"Unsupported method: {method}. Use 'exact' or 'lookup'")
+
+    codes = _to_crop_codes(crop_type)
+    temp = np.asarray(temp, dtype=float)
+    rain = np.asarray(rain, dtype=float)
+    resilient = np.asarray(seed_type) == 1
+
+    # Apply climate perturbation using Delta Method
+    sim_temp = temp + np.asarray(temp_delta, dtype=float)
+    rain_multiplier = 1 + (np.asarray(rain_pct_change, dtype=float) / 100)
+    sim_rain = np.maximum(0.0, rain * rain_multiplier)
+
+    shape = np.broadcast_shapes(sim_temp.shape, sim_rain.shape, resilient.shape, codes.shape)
+
+    if not sensitivities:
+        yields = _crop_yield_array(codes, sim_temp, sim_rain, resilient)
+        return np.broadcast_to(yields, shape).astype(float, copy=True)
+
+    yields, d_temp, d_rain, regime = _crop_yield_array(codes, sim_temp, sim_rain, resilient, sensitivities=True)
+
+    # Chain rule through the rainfall perturbation (flat where rain is floored at 0)
+    d_rain = np.where(rain * rain_multiplier > 0.0, d_rain * rain_multiplier, 0.0)
+
+    return YieldSensitivities(
+        yield_pct=np.broadcast_to(yields, shape).astype(float, copy=True),
+        d_yield_d_temp=np.broadcast_to(d_temp, shape).astype(float, copy=True),
+        d_yield_d_rain=np.broadcast_to(d_rain, shape).astype(float, copy=True),
+        regime=np.broadcast_to(regime, shape).astype(np.int8, copy=True),
+    )
+
+
+def calculate_paired_yield_batch(temp, rain, crop_type='maize', temp_delta=0.0, rain_pct_change=0.0) -> PairedYields:
+    """Array form of `calculate_paired_yield`.
+
+    Both seed types are evaluated in one kernel pass over a leading seed axis,
+    sharing the perturbed climate and crop parameter gather.
+
+    Returns:
+        PairedYields of arrays, matching `calculate_yield_batch` for seed 0 and 1
     """
-    crop_type_lower = crop_type.lower()
-
-    if crop_type_lower == 'maize':
-        return calculate_maize_yield(temp, rain, seed_type, temp_delta, rain_pct_change)
-    if crop_type_lower == 'cocoa':
-        return calculate_cocoa_yield(temp, rain, seed_type, temp_delta, rain_pct_change)
-    if crop_type_lower == 'rice':
-        return calculate_rice_yield(temp, rain, seed_type, temp_delta, rain_pct_change)
-    if crop_type_lower == 'soy':
-        return calculate_soy_yield(temp, rain, seed_type, temp_delta, rain_pct_change)
-    if crop_type_lower == 'wheat':
-        return calculate_wheat_yield(temp, rain, seed_type, temp_delta, rain_pct_change)
-
-    raise ValueError(
-        f"Unsupported crop_type: {crop_type}. Supported crops: 'maize', 'cocoa', 'rice', 'soy', 'wheat'"
+    codes = _to_crop_codes(crop_type)
+    sim_temp = np.asarray(temp, dtype=float) + np.asarray(temp_delta, dtype=float)
+    sim_rain = np.maximum(0.0, np.asarray(rain, dtype=float) * (1 + (np.asarray(rain_pct_change, dtype=float) / 100)))
+
+    shape = np.broadcast_shapes(sim_temp.shape, sim_rain.shape, codes.shape)
+    resilient = np.array([False, True]).reshape((2,) + (1,) * len(shape))
+
+    yields = np.broadcast_to(_crop_yield_array(codes, sim_temp, sim_rain, resilient), (2,) + shape)
+    standard_yield = yields[0].astype(float, copy=True)
+    resilient_yield = yields[1].astype(float, copy=True)
+
+    avoided_loss = resilient_yield - standard_yield
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage_improvement = np.where(standard_yield > 0, avoided_loss / standard_yield * 100, 0.0)
+
+    return PairedYields(standard_yield, resilient_yield, avoided_loss, percentage_improvement)
+
+
+def calculate_paired_yield_trajectory(
+    temp,
+    rain,
+    crop_type='maize',
+    temp_delta_by_year=0.0,
+    rain_pct_change_by_year=0.0
+) -> PairedYields:
+    """Paired yields along a year-by-year climate trajectory.
+
+    Each year applies its own perturbation (the total change for that year,
+    not an increment on the previous one) to every site's baseline, and the
+    whole (sites x years) matrix is evaluated in one kernel pass.
+
+    Args:
+        temp: Baseline temperature per site (°C)
+        rain: Baseline rainfall per site (mm)
+        crop_type: Crop name/code, or one per site
+        temp_delta_by_year: Temperature change per year (°C)
+        rain_pct_change_by_year: Rainfall change per year (%)
+
+    Returns:
+        PairedYields of arrays with shape (sites, years), or (years,) for a
+        single scalar site
+    """
+    temp_delta = np.atleast_1d(np.asarray(temp_delta_by_year, dtype=float))
+    rain_pct_change = np.atleast_1d(np.asarray(rain_pct_change_by_year, dtype=float))
+    if temp_delta.ndim != 1 or rain_pct_change.ndim != 1:
+        raise ValueError("Climate trajectories must be 1D sequences (one value per year)")
+    temp_delta, rain_pct_change = np.broadcast_arrays(temp_delta, rain_pct_change)
+
+    codes = _to_crop_codes(crop_type)
+    return calculate_paired_yield_batch(
+        np.asarray(temp, dtype=float)[..., None],
+        np.asarray(rain, dtype=float)[..., None],
+        codes[..., None],
+        temp_delta,
+        rain_pct_change,
+    )
+
+
+# ============= CLIMATE TIPPING POINTS =============
+
+class TippingPoints(NamedTuple):
+    """Scenario deltas at which yield falls below a threshold.
+
+    - temp_delta: yield is below the threshold for any temp_delta above this
+      value (at the given rain_pct_change). +inf if heat never pushes it
+      below; NaN if it is below the threshold at every temperature.
+    - rain_pct_change_lower / rain_pct_change_upper: yield stays at or above
+      the threshold between these rain_pct_change values (at the given
+      temp_delta) and falls below just outside them, on the drought and the
+      waterlogging side. -inf / +inf if that side never falls below; NaN if
+      no rainfall reaches the threshold (or the base rainfall is 0).
+    """
+    temp_delta: np.ndarray
+    rain_pct_change_lower: np.ndarray
+    rain_pct_change_upper: np.ndarray
+
+
+def _staple_tipping_points(p: CropParameters, sim_temp, sim_rain, resilient, threshold):
+    """Solve the staple model's segments for Y = threshold.
+
+    Returns (critical effective temperature, lower and upper effective rainfall).
+    """
+    effective_critical_temp = np.where(resilient, p.critical_temp_c + p.resilience_delta_c, p.critical_temp_c)
+    heat_excess = np.maximum(sim_temp - effective_critical_temp, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # ----- Temperature: Y = (100 - excess * rate) * factor - waterlog_loss -----
+        factor = _staple_yield_array(p, effective_critical_temp, sim_rain, resilient) / 100.0
+        is_drought = sim_rain < p.optimal_rainfall_min_mm
+        is_waterlog = ~is_drought & (sim_rain > p.optimal_rainfall_max_mm)
+        waterlog_loss = np.where(is_waterlog, 100.0 - factor * 100.0, 0.0)
+        factor = np.where(is_waterlog, 1.0, factor)
+        loss_rate = np.where(is_drought, p.heat_loss_rate_drought, p.heat_loss_rate_optimal)
+
+        critical_temp = effective_critical_temp + (100.0 - (threshold + waterlog_loss) / factor) / loss_rate
+        plateau = factor * 100.0 - waterlog_loss
+        critical_temp = np.where(plateau < threshold, np.nan, np.where(loss_rate > 0, critical_temp, np.inf))
+
+        # ----- Rainfall: Y increases up to the optimal band, then decreases -----
+        heat_yield_drought = 100.0 - heat_excess * p.heat_loss_rate_drought
+        heat_yield_optimal = 100.0 - heat_excess * p.heat_loss_rate_optimal
+        required = threshold / heat_yield_drought  # Rain factor needed below the optimal band
+
+        # Between minimum and optimal rainfall: invert the linear rain factor
+        denom = p.optimal_rainfall_min_mm - p.min_rainfall_mm
+        raw_factor = np.where(resilient, 1.0 - (1.0 - required) / p.resilience_drought_factor, required)
+        rain_mid = p.min_rainfall_mm + (raw_factor - 0.5) * 2.0 * denom
+
+        # Below minimum rainfall: invert base_yield = 0.5 * rain / min (x1.3, capped at 0.7, if resilient)
+        base_needed = np.where(resilient, required / 1.3, required)
+        rain_low = np.where(
+            resilient & (required > 0.7), np.inf, base_needed * 2.0 * p.min_rainfall_mm
+        )
+
+        rain_lower = np.where(
+            heat_yield_drought <= 0.0,
+            p.optimal_rainfall_min_mm,
+            np.where(
+                rain_mid > p.min_rainfall_mm,
+                np.minimum(rain_mid, p.optimal_rainfall_min_mm),
+                np.minimum(np.maximum(rain_low, 0.0), p.min_rainfall_mm),
+            ),
+        )
+
+        waterlog_rate = np.where(resilient, p.waterlog_loss_per_100mm * p.waterlog_resilience_multiplier, p.waterlog_loss_per_100mm) / 100.0
+        rain_upper = np.where(
+            waterlog_rate > 0,
+            p.optimal_rainfall_max_mm + (heat_yield_optimal - threshold) / waterlog_rate,
+            np.inf,
+        )
+
+    unreachable = heat_yield_optimal < threshold
+    rain_lower = np.where(unreachable, np.nan, rain_lower)
+    rain_upper = np.where(unreachable, np.nan, rain_upper)
+
+    return critical_temp, rain_lower, rain_upper
+
+
+def _cocoa_tipping_points(p: CropParameters, sim_temp, sim_rain, resilient, threshold):
+    """Solve the cocoa model's segments for Y = threshold (additive penalties)."""
+    drought_factor = np.where(resilient, p.resilience_drought_factor, 1.0)
+    heat_rate = np.where(resilient, p.heat_loss_rate_optimal * p.resilience_heat_factor, p.heat_loss_rate_optimal)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # ----- Temperature: Y = 100 - rain_penalty - excess * rate -----
+        plateau = _cocoa_yield_array(p, np.minimum(sim_temp, p.critical_temp_c), sim_rain, resilient)
+        critical_temp = p.critical_temp_c + (plateau - threshold) / heat_rate
+        critical_temp = np.where(plateau < threshold, np.nan, critical_temp)
+
+        # ----- Rainfall: penalties shrink as rain rises to the optimum -----
+        heat_penalty = np.maximum(sim_temp - p.critical_temp_c, 0.0) * heat_rate
+        headroom = 100.0 - heat_penalty - threshold  # Rain penalty the threshold allows
+
+        rain_mid = p.optimal_rainfall_min_mm * (1.0 - headroom / (p.suboptimal_rain_max_penalty * drought_factor))
+        rain_low = p.min_rainfall_mm - headroom * 100.0 / (p.drought_loss_per_100mm * drought_factor)
+
+        rain_lower = np.where(
+            rain_mid > p.min_rainfall_mm,
+            np.minimum(rain_mid, p.optimal_rainfall_min_mm),
+            np.where(rain_low > 0.0, np.minimum(rain_low, p.min_rainfall_mm), -np.inf),
+        )
+
+    unreachable = headroom < 0.0
+    rain_lower = np.where(unreachable, np.nan, rain_lower)
+    rain_upper = np.where(unreachable, np.nan, np.inf)  # No waterlogging penalty
+
+    return critical_temp, rain_lower, rain_upper
+
+
+def calculate_tipping_points(
+    temp,
+    rain,
+    seed_type,
+    crop_type='maize',
+    threshold_pct=50.0,
+    temp_delta=0.0,
+    rain_pct_change=0.0,
+) -> TippingPoints:
+    """Solve for the climate deltas at which yield falls below `threshold_pct`.
+
+    Each piecewise-linear segment of the staple and cocoa models is inverted
+    in closed form, so thousands of sites are solved in one vectorized pass
+    instead of scanning deltas. Arguments broadcast like `calculate_yield_batch`.
+
+    The temperature tipping point holds rainfall at `rain_pct_change`; the
+    rainfall tipping points hold temperature at `temp_delta`. On the drought
+    side the lower bound is the first rainfall (coming down from the optimum)
+    where yield drops below the threshold.
+
+    Args:
+        temp: Temperature(s) in °C
+        rain: Rainfall(s) in mm
+        seed_type: 0 = Standard, 1 = Resilient (scalar or array)
+        crop_type: Crop name, integer crop code (see CROP_CODES), or an array of either
+        threshold_pct: Yield threshold as percentage (0-100]
+        temp_delta: Temperature increase held fixed for the rainfall solve (°C)
+        rain_pct_change: Rainfall change held fixed for the temperature solve (%)
+
+    Returns:
+        TippingPoints of temp_delta and rain_pct_change arrays
+    """
+    codes = _to_crop_codes(crop_type)
+    temp = np.asarray(temp, dtype=float)
+    rain = np.asarray(rain, dtype=float)
+    resilient = np.asarray(seed_type) == 1
+    threshold = np.asarray(threshold_pct, dtype=float)
+    temp_delta = np.asarray(temp_delta, dtype=float)
+
+    if np.any((threshold <= 0.0) | (threshold > 100.0)):
+        raise ValueError("threshold_pct must be in (0, 100]")
+
+    sim_temp = temp + temp_delta
+    sim_rain = np.maximum(0.0, rain * (1 + (np.asarray(rain_pct_change, dtype=float) / 100)))
+
+    shape = np.broadcast_shapes(sim_temp.shape, sim_rain.shape, resilient.shape, codes.shape, threshold.shape)
+    codes, sim_temp, sim_rain, resilient, threshold, temp, rain = (
+        np.broadcast_to(a, shape) for a in (codes, sim_temp, sim_rain, resilient, threshold, temp, rain)
+    )
+    p = CropParameters(*(column[codes] for column in CROP_PARAMS))
+
+    is_cocoa = p.model == MODEL_COCOA
+    results = [
+        np.where(is_cocoa, cocoa, staple)
+        for cocoa, staple in zip(
+            _cocoa_tipping_points(p, sim_temp, sim_rain, resilient, threshold),
+            _staple_tipping_points(p, sim_temp, sim_rain, resilient, threshold),
+        )
+    ]
+    critical_temp, rain_lower, rain_upper = results
+
+    # Effective values back to scenario deltas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_lower = np.where(rain > 0, (rain_lower / rain - 1.0) * 100.0, np.nan)
+        pct_upper = np.where(rain > 0, (rain_upper / rain - 1.0) * 100.0, np.nan)
+
+    # Rain floored at 0: a lower bound at 0 mm means drought never tips it
+    pct_lower = np.where(rain_lower <= 0.0, -np.inf, pct_lower)
+
+    return TippingPoints(
+        temp_delta=np.array(critical_temp - temp, dtype=float),
+        rain_pct_change_lower=np.array(pct_lower, dtype=float),
+        rain_pct_change_upper=np.array(pct_upper, dtype=float),
     )
 
 
@@ -323,6 +953,90 @@ def simulate_maize_yield(temp: float, rain: float, seed_type: int, temp_delta: f
     return calculate_yield(temp, rain, seed_type, 'maize', temp_delta, rain_pct_change)
 
 
+class YieldAccumulator:
+    """
+    Streaming mean/variance of yields (Welford's algorithm).
+    
+    Observations can be added one at a time or in array chunks, and partial
+    accumulators (e.g. from different worker processes) merge exactly, so the
+    coefficient of variation can be aggregated without keeping the yield history.
+    
+    Example:
+        >>> acc = YieldAccumulator()
+        >>> for y in [85, 40, 90]:
+        ...     acc.update(y)
+        >>> other = YieldAccumulator()
+        >>> other.update_batch([20, 75])
+        >>> acc.merge(other).cv()
+        49.25
+    """
+    
+    __slots__ = ('count', 'mean', 'm2')
+    
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)  # Sum of squared deviations from the mean
+    
+    def update(self, value: float) -> 'YieldAccumulator':
+        """Add a single observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        return self
+    
+    def update_batch(self, values) -> 'YieldAccumulator':
+        """Add an array chunk of observations."""
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        chunk_mean = float(values.mean())
+        chunk = YieldAccumulator(values.size, chunk_mean, float(np.sum((values - chunk_mean) ** 2)))
+        return self.merge(chunk)
+    
+    def merge(self, other: 'YieldAccumulator') -> 'YieldAccumulator':
+        """Fold another accumulator into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+        
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator); 0.0 with fewer than 2 observations."""
+        if self.count < 2:
+            return 0.0
+        return max(self.m2, 0.0) / (self.count - 1)
+    
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation."""
+        return self.variance ** 0.5
+    
+    def cv(self) -> float:
+        """Coefficient of Variation as percentage, rounded like calculate_volatility."""
+        if self.count < 2 or self.mean == 0:
+            return 0.0
+        return round((self.stdev / self.mean) * 100, 2)
+    
+    def to_dict(self) -> dict:
+        """JSON-serializable state, for shipping partial results between processes."""
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2}
+    
+    @classmethod
+    def from_dict(cls, state: dict) -> 'YieldAccumulator':
+        return cls(state['count'], state['mean'], state['m2'])
+
+
 def calculate_volatility(yield_history_list: list) -> float:
     """
     Calculate yield volatility using Coefficient of Variation (CV).
@@ -342,22 +1056,7 @@ def calculate_volatility(yield_history_list: list) -> float:
         >>> print(f"CV: {cv:.1f}%")
         CV: 38.7%
     """
-    import statistics
-    
-    if not yield_history_list or len(yield_history_list) < 2:
+    if yield_history_list is None or len(yield_history_list) < 2:
         return 0.0
     
-    # Calculate mean
-    mean_yield = statistics.mean(yield_history_list)
-    
-    # Avoid division by zero
-    if mean_yield == 0:
-        return 0.0
-    
-    # Calculate standard deviation
-    std_dev = statistics.stdev(yield_history_list)
-    
-    # Calculate Coefficient of Variation as percentage
-    cv = (std_dev / mean_yield) * 100
-    
-    return round(cv, 2)
+    return YieldAccumulator().update_batch(yield_history_list).cv()
@@ -0,0 +1,289 @@
+# =============================================================================
+# Portfolio Optimizer - Budget-Constrained Intervention Selection
+# =============================================================================
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from physics_engine import calculate_paired_yield_batch
+from financial_engine import build_agricultural_cash_flows, calculate_annuity_metrics_batch
+from infrastructure_engine import calculate_flood_losses_batch
+
+
+INTERVENTION_OPTIONS = ('resilient_seed', 'sea_wall', 'drainage', 'mangroves', 'green_roof')
+
+# Relative slack when comparing cumulative CAPEX with the budget, so a
+# selection that spends the budget exactly is not lost to rounding
+BUDGET_TOLERANCE = 1e-9
+
+
+# ============= ROI MATRIX BUILDERS =============
+
+def resilient_seed_npv(
+    temp,
+    rain,
+    crop_type='maize',
+    capex=2000.0,
+    opex=425.0,
+    price_per_ton=4800.0,
+    yield_benefit_pct=30.0,
+    analysis_years: int = 10,
+    discount_rate=0.10,
+    temp_delta=0.0,
+    rain_pct_change=0.0
+) -> np.ndarray:
+    """
+    NPV of switching each site to resilient seed (same cash flows as /predict).
+
+    Inputs broadcast, so one call prices every site of a portfolio.
+
+    Returns:
+        NPV per site
+    """
+    yields = calculate_paired_yield_batch(temp, rain, crop_type, temp_delta, rain_pct_change)
+    cash_flows = build_agricultural_cash_flows(
+        standard_yield=yields.standard_yield,
+        resilient_yield=yields.resilient_yield,
+        price_per_ton=price_per_ton,
+        capex=capex,
+        opex=opex,
+        yield_benefit_pct=yield_benefit_pct,
+        analysis_years=1,
+        decimals=None
+    )['incremental']
+
+    # Years 1-N repeat year 1, so the NPV is a level annuity
+    return calculate_annuity_metrics_batch(
+        -cash_flows[..., 0], cash_flows[..., 1], analysis_years, discount_rate
+    )['npv']
+
+
+def flood_intervention_npv(
+    flood_depth_m,
+    depth_reduction_m,
+    asset_value,
+    daily_revenue,
+    capex,
+    opex,
+    analysis_years: int = 20,
+    discount_rate=0.10,
+    damage_curve='generic'
+) -> np.ndarray:
+    """
+    NPV of a flood intervention per asset (same model as `calculate_infrastructure_roi`).
+
+    Every flood intervention lowers the flood depth at the asset: a sea wall
+    by its height, drainage by its reduction, and nature-based options
+    (mangroves, green roofs) by the avoided depth from the coastal/flood
+    models. Inputs broadcast, so passing depth_reduction_m, capex and opex as
+    (assets x options) arrays prices every option of every asset at once.
+    damage_curve selects a depth-damage curve, or one per asset (see
+    infrastructure_engine.DAMAGE_CURVE_NAMES).
+
+    Returns:
+        NPV per element
+    """
+    flood_depth_m = np.asarray(flood_depth_m, dtype=float)
+    effective_depth = np.maximum(0.0, flood_depth_m - np.asarray(depth_reduction_m, dtype=float))
+
+    loss_bau = calculate_flood_losses_batch(flood_depth_m, asset_value, daily_revenue, damage_curve)['total_loss']
+    loss_intervention = calculate_flood_losses_batch(effective_depth, asset_value, daily_revenue, damage_curve)['total_loss']
+
+    net_benefit = (loss_bau - loss_intervention) - np.asarray(opex, dtype=float)
+    return calculate_annuity_metrics_batch(capex, net_benefit, analysis_years, discount_rate)['npv']
+
+
+# ============= SOLVER =============
+
+def _efficient_increments(npv: np.ndarray, capex: np.ndarray, available: np.ndarray):
+    """
+    Upgrade steps along each asset's upper convex hull of (CAPEX, NPV) options.
+
+    Starting from "do nothing" (or the best free option), each step moves to
+    the option with the highest marginal NPV per unit CAPEX. Steps of one
+    asset have non-increasing efficiency, which makes the greedy order and
+    the LP relaxation of the multiple-choice knapsack coincide. Options under
+    the hull are never selected.
+    """
+    num_assets, num_options = npv.shape
+    rows = np.arange(num_assets)
+
+    # Free options with positive NPV are always worth taking
+    free = available & (capex == 0) & (npv > 0)
+    free_npv = np.where(free, npv, 0.0)
+    start_option = np.where(free.any(axis=1), np.argmax(free_npv, axis=1), -1)
+    start_npv = free_npv[rows, np.maximum(start_option, 0)]
+
+    current_capex = np.zeros(num_assets)
+    current_npv = start_npv.copy()
+    steps = []
+
+    for step in range(num_options):
+        delta_capex = capex - current_capex[:, None]
+        delta_npv = npv - current_npv[:, None]
+        candidate = available & (delta_capex > 0) & (delta_npv > 0)
+        active = np.flatnonzero(candidate.any(axis=1))
+        if active.size == 0:
+            break
+
+        candidate = candidate[active]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            efficiency = np.where(candidate, delta_npv[active] / delta_capex[active], -np.inf)
+        best = efficiency.max(axis=1)
+
+        # Among equally efficient options, jump straight to the largest one
+        ties = candidate & (efficiency == best[:, None])
+        option = np.argmax(np.where(ties, capex[active], -np.inf), axis=1)
+
+        steps.append((
+            active,
+            option,
+            delta_capex[active, option],
+            delta_npv[active, option],
+            best,
+            np.full(active.size, step),
+        ))
+        current_capex[active] = capex[active, option]
+        current_npv[active] = npv[active, option]
+
+    if not steps:
+        empty = np.empty(0)
+        return start_option, start_npv, (empty.astype(int), empty.astype(int), empty, empty, empty, empty.astype(int))
+
+    return start_option, start_npv, tuple(np.concatenate(column) for column in zip(*steps))
+
+
+def _selection_totals(npv, capex, selected) -> tuple:
+    """NPV and CAPEX of the selected option per asset (zero for -1)."""
+    rows = np.flatnonzero(selected >= 0)
+    selected_npv = np.zeros(len(selected))
+    selected_capex = np.zeros(len(selected))
+    selected_npv[rows] = npv[rows, selected[rows]]
+    selected_capex[rows] = capex[rows, selected[rows]]
+    return selected_npv, selected_capex
+
+
+def optimize_intervention_portfolio(
+    npv,
+    capex,
+    budget: float,
+    option_names: Optional[Sequence[str]] = None
+) -> Dict:
+    """
+    Pick at most one intervention per asset to maximise total NPV within a CAPEX budget.
+
+    Solves the multiple-choice knapsack greedily on a precomputed ROI matrix:
+    upgrade steps of every asset (see `_efficient_increments`) are sorted by
+    NPV per unit CAPEX and funded in that order while the budget lasts, then
+    each asset with unfunded steps moves, most efficient first, to its best
+    option that still fits (on the hull or not). The best single option is
+    the fallback when it beats that selection, so the result is at least
+    half of the optimum. The LP relaxation (funding a fraction of the first
+    step that does not fit) gives an upper bound on the optimal NPV, so every
+    result reports how far from optimal it can be at most.
+
+    Args:
+        npv: (assets x options) NPV matrix; NaN marks an option that is not
+            available for an asset
+        capex: CAPEX per option, broadcastable to the NPV matrix (>= 0)
+        budget: Total CAPEX budget
+        option_names: Names of the option columns (e.g. INTERVENTION_OPTIONS)
+
+    Returns:
+        Dictionary with the selected option per asset (-1 = no intervention),
+        totals, the LP upper bound and the optimality gap
+
+    Raises:
+        ValueError: For a negative budget or CAPEX, or mismatched option names
+    """
+    npv = np.atleast_2d(np.asarray(npv, dtype=float))
+    capex = np.broadcast_to(np.asarray(capex, dtype=float), npv.shape)
+    num_assets, num_options = npv.shape
+
+    if budget < 0:
+        raise ValueError("budget must be non-negative")
+    if np.any(capex < 0):
+        raise ValueError("capex must be non-negative")
+    if option_names is not None and len(option_names) != num_options:
+        raise ValueError(f"Expected {num_options} option names, got {len(option_names)}")
+
+    # Options that cost more than the whole budget can never be funded
+    limit = budget * (1 + BUDGET_TOLERANCE)
+    available = np.isfinite(npv) & np.isfinite(capex) & (capex <= limit)
+    start_option, start_npv, increments = _efficient_increments(npv, capex, available)
+    asset, option, delta_capex, delta_npv, efficiency, step = increments
+
+    # Most efficient first; the step index keeps each asset's steps in order
+    order = np.lexsort((step, -efficiency))
+    asset, option, delta_capex, delta_npv, step = (
+        asset[order], option[order], delta_capex[order], delta_npv[order], step[order]
+    )
+
+    spent_after = np.cumsum(delta_capex)
+    num_funded = int(np.searchsorted(spent_after, limit, side='right'))
+
+    value = float(start_npv.sum() + delta_npv[:num_funded].sum())
+    spent = float(spent_after[num_funded - 1]) if num_funded else 0.0
+
+    upper_bound = value
+    if num_funded < len(delta_capex):
+        upper_bound += (budget - spent) / delta_capex[num_funded] * delta_npv[num_funded]
+
+    # Fund the prefix: steps of an asset are funded in order, so each asset
+    # ends at the last step it reached
+    last = np.full(num_assets, -1)
+    np.maximum.at(last, asset[:num_funded], step[:num_funded])
+    final_step = np.zeros((num_assets, max(num_options, 1)), dtype=int)
+    final_step[asset, step] = option
+    upgraded = last >= 0
+    selected = start_option.copy()
+    selected[upgraded] = final_step[upgraded, last[upgraded]]
+    selected_npv, selected_capex = _selection_totals(npv, capex, selected)
+
+    # Fill the remaining budget: assets with unfunded steps, most efficient
+    # first, move to the best option that still fits
+    remaining = budget - spent
+    pending = asset[num_funded:]
+    _, first_seen = np.unique(pending, return_index=True)
+    for a in pending[np.sort(first_seen)]:
+        fits = available[a] & (capex[a] - selected_capex[a] <= remaining * (1 + BUDGET_TOLERANCE))
+        gain = np.where(fits, npv[a] - selected_npv[a], 0.0)
+        o = int(np.argmax(gain))
+        if gain[o] > 0:
+            remaining -= capex[a, o] - selected_capex[a]
+            selected[a] = o
+            selected_npv[a] = npv[a, o]
+            selected_capex[a] = capex[a, o]
+
+    # Best single option on top of the free ones, which the greedy can miss
+    # when a large efficient step blocks a smaller one
+    if available.any():
+        single_gain = np.where(available, npv - start_npv[:, None], -np.inf)
+        a, o = np.unravel_index(np.argmax(single_gain), npv.shape)
+        if single_gain[a, o] > selected_npv.sum() - start_npv.sum():
+            selected = start_option.copy()
+            selected[a] = o
+            selected_npv, selected_capex = _selection_totals(npv, capex, selected)
+
+    rows = np.flatnonzero(selected >= 0)
+
+    result = {
+        'selected_option': selected,
+        'selected_npv': selected_npv,
+        'selected_capex': selected_capex,
+        'total_npv': float(selected_npv.sum()),
+        'total_capex': float(selected_capex.sum()),
+        'budget': float(budget),
+        'budget_remaining': float(budget - selected_capex.sum()),
+        'upper_bound_npv': float(upper_bound),
+        'optimality_gap': float(max(upper_bound - selected_npv.sum(), 0.0)),
+        'num_assets': int(num_assets),
+        'num_funded_assets': int(rows.size),
+    }
+
+    if option_names is not None:
+        counts = np.bincount(selected[rows], minlength=num_options)
+        result['option_counts'] = {name: int(count) for name, count in zip(option_names, counts)}
+
+    return result
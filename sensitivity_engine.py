@@ -0,0 +1,156 @@
+# =============================================================================
+# Sensitivity Engine - One-at-a-Time (Tornado) Analysis
+# =============================================================================
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from physics_engine import calculate_paired_yield_batch
+from financial_engine import build_agricultural_cash_flows, calculate_npv_batch
+
+
+# Base case defaults (same research-based defaults as /predict project_params)
+DEFAULT_BASE_CASE = {
+    'capex': 2000.0,
+    'opex': 425.0,
+    'price_per_ton': 4800.0,
+    'yield_benefit_pct': 30.0,
+    'discount_rate': 0.10,
+    'temp_increase': 0.0,
+    'rain_change': 0.0,
+}
+
+TORNADO_DRIVERS = tuple(DEFAULT_BASE_CASE)
+
+# Default bounds when a driver has none: ±20% of the base value for
+# economic drivers, ±1°C / ±10 percentage points for the climate drivers
+DEFAULT_RELATIVE_SWING = 0.20
+DEFAULT_ABSOLUTE_SWING = {
+    'temp_increase': 1.0,
+    'rain_change': 10.0,
+}
+
+
+def _default_bounds(driver: str, base_value: float) -> Dict[str, float]:
+    if driver in DEFAULT_ABSOLUTE_SWING:
+        swing = DEFAULT_ABSOLUTE_SWING[driver]
+    else:
+        swing = abs(base_value) * DEFAULT_RELATIVE_SWING
+    return {'low': base_value - swing, 'high': base_value + swing}
+
+
+def run_tornado_analysis(
+    base_temp: float,
+    base_rain: float,
+    crop_type: str = 'maize',
+    base_case: Optional[Dict[str, float]] = None,
+    bounds: Optional[Dict[str, Dict[str, float]]] = None,
+    analysis_years: int = 10
+) -> Dict:
+    """
+    One-at-a-time sensitivity of project NPV to each driver.
+
+    Builds the base case plus a low and a high variant per driver as rows of
+    one matrix and evaluates the full chain in a single batch:
+    paired yields -> incremental cash flows -> NPV.
+
+    Cash flows follow /predict:
+    - Year 0: -CAPEX
+    - Years 1-N: resilient_yield * (1 + yield_benefit_pct/100) * price - OPEX
+                 - standard_yield * price
+
+    Args:
+        base_temp: Baseline temperature (°C)
+        base_rain: Baseline rainfall (mm)
+        crop_type: Crop type (see physics_engine.CROP_CODES)
+        base_case: Driver values for the base case (defaults: DEFAULT_BASE_CASE)
+        bounds: Per-driver {'low': x, 'high': y}; drivers without bounds use
+            the default swing
+        analysis_years: Years of benefits after Year 0
+
+    Returns:
+        Dictionary with the base NPV and a sensitivity table ranked by NPV swing
+
+    Raises:
+        ValueError: For unknown drivers or bounds missing 'low'/'high'
+    """
+    base_case = {**DEFAULT_BASE_CASE, **(base_case or {})}
+    bounds = bounds or {}
+
+    unknown = (set(base_case) | set(bounds)) - set(TORNADO_DRIVERS)
+    if unknown:
+        raise ValueError(f"Unknown drivers: {', '.join(sorted(unknown))}. Use {', '.join(TORNADO_DRIVERS)}")
+
+    base_values = {driver: float(value) for driver, value in base_case.items()}
+
+    # ========== Variant matrix: row 0 = base, then (low, high) per driver ==========
+    num_rows = 1 + 2 * len(TORNADO_DRIVERS)
+    inputs = {driver: np.full(num_rows, value) for driver, value in base_values.items()}
+    driver_bounds = {}
+
+    for i, driver in enumerate(TORNADO_DRIVERS):
+        driver_bound = bounds.get(driver) or _default_bounds(driver, base_values[driver])
+        if 'low' not in driver_bound or 'high' not in driver_bound:
+            raise ValueError(f"Bounds for {driver} need both 'low' and 'high'")
+        low, high = float(driver_bound['low']), float(driver_bound['high'])
+        driver_bounds[driver] = (low, high)
+        inputs[driver][1 + 2 * i] = low
+        inputs[driver][2 + 2 * i] = high
+
+    # ========== Yields -> cash flows -> NPV (one batch) ==========
+    yields = calculate_paired_yield_batch(
+        temp=base_temp,
+        rain=base_rain,
+        crop_type=crop_type,
+        temp_delta=inputs['temp_increase'],
+        rain_pct_change=inputs['rain_change']
+    )
+
+    cash_flows = build_agricultural_cash_flows(
+        standard_yield=yields.standard_yield,
+        resilient_yield=yields.resilient_yield,
+        price_per_ton=inputs['price_per_ton'],
+        capex=inputs['capex'],
+        opex=inputs['opex'],
+        yield_benefit_pct=inputs['yield_benefit_pct'],
+        analysis_years=analysis_years,
+        decimals=None
+    )['incremental']
+
+    npv = calculate_npv_batch(cash_flows, inputs['discount_rate'])
+    base_npv = float(npv[0])
+
+    # ========== Ranked sensitivity table ==========
+    table = []
+    for i, driver in enumerate(TORNADO_DRIVERS):
+        low, high = driver_bounds[driver]
+        npv_low = float(npv[1 + 2 * i])
+        npv_high = float(npv[2 + 2 * i])
+        table.append({
+            'driver': driver,
+            'base_value': base_values[driver],
+            'low_value': low,
+            'high_value': high,
+            'npv_at_low': round(npv_low, 2),
+            'npv_at_high': round(npv_high, 2),
+            'npv_change_at_low': round(npv_low - base_npv, 2),
+            'npv_change_at_high': round(npv_high - base_npv, 2),
+            'swing': round(abs(npv_high - npv_low), 2),
+        })
+
+    table.sort(key=lambda row: row['swing'], reverse=True)
+    for rank, row in enumerate(table, start=1):
+        row['rank'] = rank
+
+    return {
+        'base_case': {
+            **base_values,
+            'standard_yield': round(float(yields.standard_yield[0]), 2),
+            'resilient_yield': round(float(yields.resilient_yield[0]), 2),
+            'npv': round(base_npv, 2),
+        },
+        'sensitivity': table,
+        'analysis_years': analysis_years,
+        'num_variants': num_rows,
+    }
@@ -0,0 +1,18 @@
+from benchmark_physics import compare_results, run_benchmarks
+
+
+def test_run_benchmarks_records_every_case():
+    results = run_benchmarks(modes=('scalar', 'batch', 'paired'), sizes=(100, 500), repeats=1, max_scalar_size=100)
+
+    assert set(results['cases']) == {'scalar/100', 'batch/100', 'batch/500', 'paired/100', 'paired/500'}
+    assert all(case['evals_per_sec'] > 0 for case in results['cases'].values())
+
+
+def test_compare_flags_only_drops_beyond_threshold():
+    baseline = {'cases': {'batch/1000': {'evals_per_sec': 1000.0}, 'scalar/1000': {'evals_per_sec': 100.0}}}
+    current = {'cases': {'batch/1000': {'evals_per_sec': 850.0}, 'scalar/1000': {'evals_per_sec': 70.0}}}
+
+    report = compare_results(baseline, current, threshold_pct=20.0)
+
+    assert report['regressions'] == ['scalar/1000']
+    assert report['comparisons']['batch/1000']['change_pct'] == -15.0
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from ensemble_engine import simulate_yield_ensemble
+from physics_engine import calculate_yield
+
+
+def test_ensemble_is_deterministic_for_a_seed():
+    first = simulate_yield_ensemble([31.0, 35.0, 28.0], [700.0, 450.0, 900.0], num_years=200, random_seed=7)
+    second = simulate_yield_ensemble([31.0, 35.0, 28.0], [700.0, 450.0, 900.0], num_years=200, random_seed=7)
+    other = simulate_yield_ensemble([31.0, 35.0, 28.0], [700.0, 450.0, 900.0], num_years=200, random_seed=8)
+
+    np.testing.assert_array_equal(first["locations"]["mean_yield_pct"], second["locations"]["mean_yield_pct"])
+    assert first["portfolio"] == second["portfolio"]
+    assert first["portfolio"]["mean_tonnage"] != other["portfolio"]["mean_tonnage"]
+
+
+def test_ensemble_shapes_and_tail_metrics():
+    result = simulate_yield_ensemble([30.0] * 4, 600.0, crop_type="cocoa", num_years=50, num_members=4)
+
+    assert result["simulation"]["num_samples"] == 200
+    assert result["locations"]["tonnage"].shape == (4,)
+    portfolio = result["portfolio"]
+    assert portfolio["tonnage_p5"] <= portfolio["tonnage_p50"] <= portfolio["tonnage_p95"]
+    assert 0.0 <= portfolio["var_tonnage"] <= portfolio["cvar_tonnage"]
+
+
+def test_ensemble_without_variation_matches_scalar_yield():
+    result = simulate_yield_ensemble(
+        [33.0], [500.0], seed_type=0, num_years=5, temp_variation_c=0.0, rain_variation_pct=0.0
+    )
+
+    expected = calculate_yield(33.0, 500.0, 0, "maize")
+    np.testing.assert_allclose(result["locations"]["mean_yield_pct"], [expected])
+    assert result["locations"]["volatility_cv_pct"][0] == pytest.approx(0.0)
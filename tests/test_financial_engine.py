@@ -0,0 +1,208 @@
+import numpy as np
+import pytest
+
+from financial_engine import (
+    build_agricultural_cash_flows,
+    calculate_annuity_irr_batch,
+    calculate_annuity_metrics,
+    calculate_annuity_metrics_batch,
+    calculate_bcr,
+    calculate_bcr_batch,
+    calculate_discounted_payback_period,
+    calculate_irr,
+    calculate_irr_batch,
+    calculate_npv,
+    calculate_npv_batch,
+    calculate_npv_curve,
+    calculate_payback_period,
+    calculate_payback_period_batch,
+    calculate_roi_distribution,
+    calculate_roi_metrics,
+    calculate_roi_metrics_batch,
+    discount_factor_matrix,
+    generate_cash_flows,
+)
+
+
+def _random_cash_flow_matrix(num_scenarios=500, num_years=21, seed=0):
+    rng = np.random.default_rng(seed)
+    cash_flows = rng.normal(3000.0, 4000.0, (num_scenarios, num_years))
+    cash_flows[:, 0] = -rng.uniform(0.0, 50000.0, num_scenarios)
+    cash_flows[:5] = 0.0  # Degenerate rows: no costs and no benefits
+    cash_flows[5, 1:] = 0.0  # Never pays back
+    return cash_flows
+
+
+def test_batch_metrics_match_scalar_functions():
+    cash_flows = _random_cash_flow_matrix()
+    rates = np.random.default_rng(1).choice([0.03, 0.05, 0.08, 0.10], len(cash_flows))
+
+    npv = calculate_npv_batch(cash_flows, rates)
+    bcr = calculate_bcr_batch(cash_flows, rates)
+    payback = calculate_payback_period_batch(cash_flows)
+
+    for i, row in enumerate(cash_flows.tolist()):
+        assert npv[i] == pytest.approx(calculate_npv(row, rates[i]), rel=1e-10, abs=1e-6)
+        assert bcr[i] == pytest.approx(calculate_bcr(row, rates[i]), rel=1e-10)
+        expected = calculate_payback_period(row)
+        if expected is None:
+            assert np.isnan(payback[i])
+        else:
+            assert payback[i] == pytest.approx(expected, rel=1e-12)
+
+
+def test_roi_metrics_batch_accepts_scalar_rate_and_single_series():
+    metrics = calculate_roi_metrics_batch([-100000, 15000, 15000, 15000, 15000, 15000], 0.10)
+
+    assert metrics['npv'][0] == pytest.approx(calculate_npv([-100000] + [15000] * 5, 0.10))
+    assert np.isnan(metrics['payback_period_years'][0])
+    np.testing.assert_allclose(discount_factor_matrix(0.10, 3), [1.0, 1 / 1.1, 1 / 1.21])
+
+
+def _general_roi_metrics(cash_flows, discount_rate):
+    npv = calculate_npv(cash_flows, discount_rate)
+    payback = calculate_payback_period(cash_flows)
+    discounted_payback = calculate_discounted_payback_period(cash_flows, discount_rate)
+    irr = calculate_irr(cash_flows)
+    return {
+        'npv': round(npv, 2),
+        'bcr': round(calculate_bcr(cash_flows, discount_rate), 2),
+        'payback_period_years': round(payback, 2) if payback is not None else None,
+        'discounted_payback_period_years': round(discounted_payback, 2) if discounted_payback is not None else None,
+        'irr': round(irr, 4) if irr is not None else None,
+    }
+
+
+@pytest.mark.parametrize("capex, annual, years, rate", [
+    (100000.0, 15000.0, 5, 0.10),
+    (100000.0, 15000.0, 40, 0.10),
+    (50000.0, -2000.0, 20, 0.05),
+    (0.0, 1000.0, 10, 0.0),
+    (25000.0, 0.0, 10, 0.08),
+])
+def test_annuity_metrics_match_general_path(capex, annual, years, rate):
+    cash_flows = generate_cash_flows(capex, 0.0, annual, years)
+
+    expected = _general_roi_metrics(cash_flows, rate)
+    for metrics in (
+        calculate_annuity_metrics(capex, annual, years, rate, include_irr=True),
+        calculate_roi_metrics(cash_flows, rate, include_irr=True),
+    ):
+        assert {key: metrics[key] for key in expected} == expected
+
+
+def test_annuity_horizon_sweep_in_one_call():
+    horizons = np.arange(5, 101)
+
+    sweep = calculate_annuity_metrics_batch(100000.0, 12000.0, horizons, 0.07)
+
+    expected = [calculate_npv(generate_cash_flows(100000.0, 0.0, 12000.0, n), 0.07) for n in horizons]
+    np.testing.assert_allclose(sweep['npv'], expected, rtol=1e-10)
+    assert np.isnan(sweep['payback_period_years'][horizons < 8]).all()
+    np.testing.assert_allclose(sweep['payback_period_years'][horizons >= 9], 100000.0 / 12000.0)
+
+
+def test_irr_batch_solves_many_series_and_flags_edge_cases():
+    rng = np.random.default_rng(2)
+    capex = rng.uniform(10000.0, 100000.0, 2000)
+    annual = rng.uniform(1000.0, 30000.0, 2000)
+    cash_flows = np.column_stack([-capex] + [annual] * 15)
+
+    result = calculate_irr_batch(cash_flows)
+
+    assert (result['status'] == 'ok').all()
+    np.testing.assert_allclose(calculate_npv_batch(cash_flows, result['irr']), 0.0, atol=1e-6 * capex.max())
+
+    edge = calculate_irr_batch([[100.0, 100.0, 100.0], [-100.0, 230.0, -132.0], [0.0, 0.0, 0.0]])
+    assert edge['status'].tolist() == ['no_irr', 'multiple', 'no_irr']
+    assert np.isnan(edge['irr'][[0, 2]]).all()
+    assert edge['irr'][1] == pytest.approx(0.10)
+
+
+def test_annuity_irr_is_closed_form_and_opt_in():
+    capex = np.array([100000.0, 100000.0, 5000.0, 100000.0, 0.0])
+    annual = np.array([15000.0, 15000.0, 8000.0, -1000.0, 0.0])
+    years = np.array([10, 1000, 3, 10, 10])
+
+    result = calculate_annuity_irr_batch(capex, annual, years)
+
+    assert result['status'].tolist() == ['ok', 'ok', 'ok', 'no_irr', 'no_irr']
+    for i in range(3):
+        series = [-capex[i]] + [annual[i]] * int(years[i])
+        assert result['irr'][i] == pytest.approx(calculate_irr_batch(series)['irr'][0], abs=1e-8)
+
+    assert 'irr' not in calculate_roi_metrics([-100000.0] + [15000.0] * 1000, 0.10)
+    assert 'irr' not in calculate_roi_metrics([-100000.0, 30000.0, 40000.0, 50000.0], 0.10)
+
+
+def test_annuity_irr_matches_grid_solver_for_deep_loss_long_horizons():
+    rng = np.random.default_rng(11)
+    years = rng.integers(50, 400, 300)
+    capex = rng.uniform(1e4, 1e5, 300)
+    annual = capex / (years * rng.uniform(1.5, 40.0, 300))  # never pays back: IRR well below 0
+    capex[0], annual[0], years[0] = 95137.4, 36.235, 85
+
+    result = calculate_annuity_irr_batch(capex, annual, years)
+
+    for i in range(len(years)):
+        expected = calculate_irr_batch([[-capex[i]] + [annual[i]] * int(years[i])])
+        assert result['status'][i] == expected['status'][0]
+        assert result['irr'][i] == pytest.approx(expected['irr'][0], abs=1e-8)
+    assert calculate_roi_metrics([-95137.4] + [36.235] * 85, 0.10, include_irr=True)['irr'] == -0.0574
+
+
+def test_roi_metrics_include_irr_and_discounted_payback():
+    cash_flows = [-100000.0, 30000.0, 30000.0, 40000.0, 50000.0, 10000.0]
+
+    metrics = calculate_roi_metrics(cash_flows, 0.10, include_irr=True)
+
+    assert metrics['irr'] == pytest.approx(calculate_irr(cash_flows), abs=1e-4)
+    assert abs(calculate_npv(cash_flows, calculate_irr(cash_flows))) < 1e-6
+    assert metrics['discounted_payback_period_years'] == round(calculate_discounted_payback_period(cash_flows, 0.10), 2)
+    assert metrics['payback_period_years'] < metrics['discounted_payback_period_years']
+
+    annuity = calculate_roi_metrics([-100000.0] + [18000.0] * 10, 0.05)
+    assert annuity['discounted_payback_period_years'] == round(
+        calculate_discounted_payback_period([-100000.0] + [18000.0] * 10, 0.05), 2
+    )
+
+
+def test_roi_distribution_with_point_values_matches_scalar_metrics():
+    result = calculate_roi_distribution(60.0, 75.0, 100.0, 2000.0, 425.0, 30.0, 0.10, analysis_years=10, num_samples=50)
+
+    annual = 75.0 * 1.3 * 100.0 - 425.0 - 60.0 * 100.0
+    metrics = calculate_roi_metrics([-2000.0] + [annual] * 10, 0.10)
+    assert result['npv']['p5'] == result['npv']['p95'] == metrics['npv']
+    assert result['payback_period_years']['p50'] == metrics['payback_period_years']
+    assert result['probability_npv_positive'] == 1.0
+
+
+def test_agricultural_cash_flows_for_one_site_and_many():
+    single = build_agricultural_cash_flows(60.0, 75.0, 100.0, 2000.0, 425.0, 30.0, analysis_years=3)
+
+    assert single['incremental'].tolist() == [-2000.0, 3325.0, 3325.0, 3325.0]
+    assert single['cumulative'].tolist() == [-2000.0, 1325.0, 4650.0, 7975.0]
+
+    sites = build_agricultural_cash_flows(
+        np.array([60.0, 40.0]), np.array([75.0, 70.0]), 100.0, 2000.0, 425.0, 30.0, analysis_years=3
+    )
+    assert sites['incremental'].shape == (2, 4)
+    np.testing.assert_array_equal(sites['incremental'][0], single['incremental'])
+    assert sites['incremental'][1, 1] == pytest.approx(70.0 * 1.3 * 100.0 - 425.0 - 40.0 * 100.0)
+
+
+def test_npv_curve_matches_per_rate_npv_and_brackets_irr():
+    cash_flows = [-2000.0] + [300.0] * 10
+    curve = calculate_npv_curve(cash_flows)
+
+    assert curve['rates'].shape == (21,)
+    np.testing.assert_allclose(curve['npv'], [calculate_npv(cash_flows, rate) for rate in curve['rates']])
+    [(low, high)] = curve['irr_brackets']
+    assert low < calculate_irr(cash_flows) < high
+
+    matrix = calculate_npv_curve(_random_cash_flow_matrix(num_scenarios=20), np.linspace(-0.5, 2.0, 251))
+    assert matrix['npv'].shape == (20, 251)
+    assert len(matrix['irr_brackets']) == 20
+
+    with pytest.raises(ValueError):
+        calculate_npv_curve(cash_flows, [0.1, 0.05])
@@ -0,0 +1,195 @@
+import numpy as np
+import pytest
+
+from coastal_engine import RETURN_PERIODS_YEARS, calculate_return_period_flood_depths
+from infrastructure_engine import (
+    DAMAGE_CURVE_NAMES,
+    calculate_business_interruption,
+    calculate_business_interruption_batch,
+    calculate_damage_cost,
+    calculate_damage_cost_batch,
+    calculate_damage_pct_batch,
+    calculate_expected_annual_loss,
+    calculate_flood_losses_batch,
+    calculate_infrastructure_roi,
+    calculate_urban_flood_damage_pct,
+    optimize_intervention_size,
+)
+
+
+@pytest.mark.parametrize("damage_curve", DAMAGE_CURVE_NAMES)
+def test_batch_damage_and_interruption_match_scalar_functions(damage_curve):
+    depths = np.linspace(-0.5, 7.0, 151)
+
+    np.testing.assert_array_equal(
+        calculate_damage_cost_batch(depths, 250000.0, damage_curve),
+        [calculate_damage_cost(depth, 250000.0, damage_curve) for depth in depths],
+    )
+    np.testing.assert_array_equal(
+        calculate_business_interruption_batch(depths, 1200.0),
+        [calculate_business_interruption(depth, 1200.0) for depth in depths],
+    )
+
+
+def test_mixed_damage_curves_match_single_curve_interpolation():
+    rng = np.random.default_rng(4)
+    depths = rng.uniform(-0.5, 7.0, 5000)
+    classes = rng.choice(DAMAGE_CURVE_NAMES, depths.size)
+
+    mixed = calculate_damage_pct_batch(depths, classes)
+    for name in DAMAGE_CURVE_NAMES:
+        in_class = classes == name
+        np.testing.assert_allclose(mixed[in_class], calculate_damage_pct_batch(depths[in_class], name), atol=1e-9)
+
+    losses = calculate_flood_losses_batch(depths, 1e5, 800.0, classes)
+    np.testing.assert_allclose(losses['total_loss'], losses['asset_damage'] + losses['business_interruption'])
+
+    with pytest.raises(ValueError):
+        calculate_damage_pct_batch(depths, 'hospital')
+
+
+def test_flat_depth_trajectory_matches_constant_avoided_loss():
+    args = (1.2, 1e6, 5000.0, 150000.0, 2000.0, 'drainage')
+
+    constant = calculate_infrastructure_roi(*args, analysis_years=20)
+    flat = calculate_infrastructure_roi(*args, analysis_years=20, flood_depth_by_year_m=[1.2] * 20)
+
+    assert flat['financial_analysis']['npv'] == pytest.approx(constant['financial_analysis']['npv'], abs=0.01)
+    assert flat['financial_analysis']['annual_avoided_loss'] == constant['financial_analysis']['annual_avoided_loss']
+    assert 'climate_trajectory' not in constant
+
+
+def test_rising_sea_level_changes_yearly_avoided_loss():
+    depths = 1.8 + np.linspace(0.0, 0.5, 20)
+    result = calculate_infrastructure_roi(1.8, 1e6, 5000.0, 150000.0, 2000.0, 'sea_wall', flood_depth_by_year_m=depths)
+
+    avoided = result['climate_trajectory']['avoided_loss_by_year']
+    assert len(avoided) == 20
+    # Once the water overtops the 2m wall, the wall avoids less damage each year
+    assert avoided[0] > avoided[-1]
+
+    with pytest.raises(ValueError):
+        calculate_infrastructure_roi(1.8, 1e6, 5000.0, 150000.0, 2000.0, 'sea_wall', flood_depth_by_year_m=[1.9] * 5)
+    with pytest.raises(ValueError):
+        calculate_infrastructure_roi(1.8, 1e6, 5000.0, 150000.0, 2000.0, 'sea_wall', flood_depth_by_year_m=[-0.1] * 20)
+
+
+def test_dry_site_stays_dry_when_the_water_stays_below_it():
+    # 0.5m of sea-level rise on ground 3m above the sea: no year floods
+    depths = np.maximum(0.0, 0.5 - 3.0) * np.ones(20)
+    result = calculate_infrastructure_roi(0.0, 1e6, 1e4, 5e4, 1e3, 'sea_wall', flood_depth_by_year_m=depths)
+
+    assert result['climate_trajectory']['avoided_loss_by_year'] == [0.0] * 20
+    assert result['financial_analysis']['annual_avoided_loss'] == 0.0
+    assert result['financial_analysis']['npv'] < 0
+
+
+def test_expected_annual_loss_is_trapezoid_over_exceedance_probability():
+    depths = [0.2, 0.8, 1.5, 2.4]
+    losses = [calculate_damage_cost(d, 1e6) + calculate_business_interruption(d, 5000.0) for d in depths]
+    probabilities = [1.0, 0.1, 0.02, 0.01]
+    expected = sum(
+        (probabilities[i] - probabilities[i + 1]) * (losses[i] + losses[i + 1]) / 2 for i in range(3)
+    )
+
+    ead = calculate_expected_annual_loss(depths, [1, 10, 50, 100], 1e6, 5000.0)
+    assert float(ead['expected_annual_loss']) == pytest.approx(expected)
+
+    # Column order does not matter
+    shuffled = calculate_expected_annual_loss(depths[::-1], [100, 50, 10, 1], 1e6, 5000.0)
+    assert float(shuffled['expected_annual_loss']) == pytest.approx(expected)
+
+
+def test_expected_annual_loss_for_assets_by_scenarios():
+    elevations = np.array([0.5, 1.5, 4.0])
+    slr = np.array([0.0, 0.5, 1.0])
+    depths = calculate_return_period_flood_depths(elevations[:, None], slr)
+    assert depths.shape == (3, 3, len(RETURN_PERIODS_YEARS))
+
+    classes = np.array(['residential', 'commercial', 'industrial'])[:, None]
+    ead = calculate_expected_annual_loss(depths, RETURN_PERIODS_YEARS, 1e6, 1000.0, classes)['expected_annual_loss']
+
+    assert ead.shape == (3, 3)
+    assert np.all(np.diff(ead, axis=1) >= 0)  # more SLR, more damage
+    single = calculate_expected_annual_loss(depths[1, 2], RETURN_PERIODS_YEARS, 1e6, 1000.0, 'commercial')
+    assert ead[1, 2] == pytest.approx(float(single['expected_annual_loss']))
+
+    with pytest.raises(ValueError):
+        calculate_expected_annual_loss(depths, (1, 10), 1e6)
+
+
+def test_infrastructure_roi_values_expected_annual_damage():
+    period_depths = {'1yr': 0.2, '10yr': 0.8, '50yr': 1.5, '100yr': 2.4}
+    result = calculate_infrastructure_roi(1.0, 1e6, 5000.0, 150000.0, 2000.0, 'sea_wall', return_period_depths_m=period_depths)
+
+    ead = calculate_expected_annual_loss(list(period_depths.values()), [1, 10, 50, 100], 1e6, 5000.0)
+    assert result['baseline_scenario']['total_annual_loss'] == round(float(ead['expected_annual_loss']), 2)
+    assert result['expected_annual_damage']['effective_flood_depths_m'] == [0.0, 0.0, 0.0, 0.4]
+
+    flat_depths = np.tile(list(period_depths.values()), (20, 1))
+    with_flat_depths = calculate_infrastructure_roi(
+        1.0, 1e6, 5000.0, 150000.0, 2000.0, 'sea_wall', return_period_depths_m=period_depths, flood_depth_by_year_m=flat_depths
+    )
+    assert with_flat_depths['financial_analysis']['npv'] == pytest.approx(result['financial_analysis']['npv'], abs=0.01)
+
+    with pytest.raises(ValueError):
+        calculate_infrastructure_roi(
+            1.0, 1e6, 5000.0, 150000.0, 2000.0, 'sea_wall', return_period_depths_m=period_depths, flood_depth_by_year_m=[1.0] * 20
+        )
+
+
+@pytest.mark.parametrize("intervention, size_kwarg", [("sea_wall", "wall_height_m"), ("drainage", "drainage_reduction_m")])
+def test_size_sweep_matches_sequential_roi_calls(intervention, size_kwarg):
+    sizes = np.linspace(0.0, 2.5, 11)
+    periods = {"10yr": 0.4, "50yr": 1.3, "100yr": 2.1}
+    result = optimize_intervention_size(
+        1.2, 1e6, 5000.0, intervention, capex_per_unit=80000.0, fixed_capex=10000.0,
+        opex_per_unit=400.0, sizes=sizes, return_period_depths_m=periods
+    )
+
+    for size, npv in zip(sizes, result["curve"]["npv"]):
+        roi = calculate_infrastructure_roi(
+            1.2, 1e6, 5000.0, 10000.0 + 80000.0 * size, 400.0 * size, intervention,
+            return_period_depths_m=periods, **{size_kwarg: size}
+        )
+        assert npv == pytest.approx(roi["financial_analysis"]["npv"], abs=0.01)
+
+    assert result["optimal"]["npv"] == max(result["curve"]["npv"])
+
+
+def test_size_sweep_with_rising_seas_and_default_grid():
+    depths = 1.0 + np.linspace(0.0, 0.4, 20)
+    result = optimize_intervention_size(1.0, 1e6, 5000.0, "sea_wall", capex_per_unit=50000.0, flood_depth_by_year_m=depths)
+
+    assert result["num_designs"] == 101
+    best = result["optimal"]["size_m"]
+    roi = calculate_infrastructure_roi(1.0, 1e6, 5000.0, 50000.0 * best, 0.0, "sea_wall", wall_height_m=best, flood_depth_by_year_m=depths)
+    assert result["optimal"]["npv"] == pytest.approx(roi["financial_analysis"]["npv"], abs=0.01)
+
+    with pytest.raises(ValueError):
+        optimize_intervention_size(1.0, 1e6, 5000.0, "mangroves", capex_per_unit=1.0)
+
+
+def test_urban_flood_damage_curve_in_centimetres():
+    depths_cm = np.array([-5.0, 0.0, 2.5, 5.0, 10.0, 22.5, 45.0, 90.0, 120.0, 500.0])
+    expected = [0.0, 0.0, 1.0, 2.0, 5.0, 14.0, 30.0, 55.0, 70.0, 70.0]
+
+    np.testing.assert_allclose(calculate_urban_flood_damage_pct(depths_cm), expected, atol=1e-12)
+    np.testing.assert_allclose(
+        calculate_urban_flood_damage_pct(depths_cm.reshape(2, 5)),
+        calculate_damage_pct_batch(depths_cm.reshape(2, 5) / 100.0, "urban"),
+        atol=1e-12,
+    )
+    assert calculate_urban_flood_damage_pct(12.0).shape == ()
+
+
+def test_size_sweep_invest_flag_matches_scalar_recommendation_at_boundary():
+    # BCR of 1.004 is reported as 1.00, which the scalar recommendation rejects
+    pv_benefits = optimize_intervention_size(1.6, 1e6, 5000.0, "sea_wall", 0.0, fixed_capex=1e6, sizes=[1.6])
+    capex = (pv_benefits["optimal"]["npv"] + 1e6) / 1.004
+
+    result = optimize_intervention_size(1.6, 1e6, 5000.0, "sea_wall", 0.0, fixed_capex=capex, sizes=[1.6])
+    roi = calculate_infrastructure_roi(1.6, 1e6, 5000.0, capex, 0.0, "sea_wall", wall_height_m=1.6)
+
+    assert result["optimal"]["bcr"] == roi["financial_analysis"]["bcr"] == 1.0
+    assert result["optimal"]["invest"] == roi["recommendation"]["invest"]
@@ -0,0 +1,230 @@
+import numpy as np
+import pytest
+
+import main
+from infrastructure_engine import calculate_infrastructure_roi
+from physics_engine import calculate_yield
+
+
+@pytest.fixture
+def client():
+    return main.app.test_client()
+
+
+def test_scenario_cube_matches_scalar_yields(client):
+    response = client.post('/scenario-cube', json={
+        'temp': 31.0,
+        'rain': 600.0,
+        'crop_type': 'cocoa',
+        'temp_deltas': [0.0, 1.5, 3.0],
+        'rain_pct_changes': {'min': -20, 'max': 20, 'step': 10},
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['axes']['rain_pct_change'] == [-20.0, -10.0, 0.0, 10.0, 20.0]
+
+    for seed_name, seed_type in (('standard_seed', 0), ('resilient_seed', 1)):
+        expected = [
+            [round(calculate_yield(31.0, 600.0, seed_type, 'cocoa', t, r), 2) for r in data['axes']['rain_pct_change']]
+            for t in data['axes']['temp_delta']
+        ]
+        np.testing.assert_array_equal(data['yields'][seed_name], expected)
+
+
+def test_scenario_cube_rejects_oversized_grid(client):
+    response = client.post('/scenario-cube', json={
+        'temp': 31.0,
+        'rain': 600.0,
+        'temp_deltas': {'min': 0, 'max': 1000, 'step': 0.01},
+    })
+
+    assert response.status_code == 400
+    assert response.get_json()['code'] == 'INVALID_GRID'
+
+    # Rejected while parsing, before an 8 GB axis is allocated
+    huge_axis = client.post('/scenario-cube', json={
+        'temp': 31.0,
+        'rain': 600.0,
+        'rain_pct_changes': {'min': 0, 'max': 1e8, 'step': 0.1},
+    })
+    assert huge_axis.status_code == 400
+    assert 'at most' in huge_axis.get_json()['message']
+
+
+def test_tipping_point_solves_sites_for_both_seeds(client):
+    response = client.post('/tipping-point', json={
+        'crop_type': 'maize',
+        'threshold_pct': 60,
+        'sites': [{'temp': 30.0, 'rain': 800.0}, {'temp': 30.0, 'rain': 200.0}],
+    })
+
+    assert response.status_code == 200
+    sites = response.get_json()['data']['sites']
+    standard, resilient = sites[0]['standard_seed'], sites[0]['resilient_seed']
+    assert standard['temp_delta_status'] == 'crossing'
+    assert resilient['temp_delta'] > standard['temp_delta']
+    assert calculate_yield(30.0, 800.0, 0, 'maize', standard['temp_delta'] + 0.01) < 60
+    assert sites[1]['standard_seed']['temp_delta_status'] == 'below_threshold_everywhere'
+
+
+def test_calculate_financials_monte_carlo_mode(client):
+    payload = {
+        'mode': 'monte_carlo',
+        'standard_yield': 70.0,
+        'resilient_yield': 84.0,
+        'price_per_ton': {'dist': 'normal', 'mean': 40.0, 'std': 10.0},
+        'capex': {'dist': 'triangular', 'low': 1500, 'mode': 2000, 'high': 3000},
+        'opex': {'dist': 'uniform', 'low': 350, 'high': 500},
+        'discount_rate': 0.10,
+        'num_samples': 5000,
+    }
+
+    first = client.post('/calculate-financials', json=payload)
+    second = client.post('/calculate-financials', json=payload)
+
+    assert first.status_code == 200
+    distribution = first.get_json()['data']['distribution']
+    assert distribution == second.get_json()['data']['distribution']
+    assert 0.0 < distribution['probability_npv_positive'] < 1.0
+    assert distribution['npv']['p5'] < distribution['npv']['p50'] < distribution['npv']['p95']
+    assert sum(distribution['npv']['histogram']['counts']) == 5000
+
+
+def test_calculate_financials_rejects_unknown_distribution(client):
+    response = client.post('/calculate-financials', json={
+        'mode': 'monte_carlo',
+        'standard_yield': 70.0,
+        'resilient_yield': 84.0,
+        'capex': {'dist': 'cauchy'},
+    })
+
+    assert response.status_code == 400
+
+
+def test_npv_curve_endpoint(client):
+    response = client.post('/npv-curve', json={'cash_flows': [-1000, 300, 300, 300, 300], 'max_rate': 0.3})
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['num_rates'] == 31
+    assert data['npv'][0] == 200.0
+    [bracket] = data['irr_brackets']
+    assert bracket['low_rate'] < data['irr'] < bracket['high_rate']
+
+    too_many = client.post('/npv-curve', json={'cash_flows': [-1, 1], 'rate_step': 1e-6})
+    assert too_many.status_code == 400
+    assert too_many.get_json()['code'] == 'TOO_MANY_RATES'
+
+    for payload, code in (
+        ({'cash_flows': [-1000, float('nan'), 300]}, 'INVALID_CASH_FLOWS'),
+        ({'cash_flows': [-1000, float('inf'), 300]}, 'INVALID_CASH_FLOWS'),
+        ({'cash_flows': [-1000, 600, 600], 'rates': [0.05, float('nan')]}, 'INVALID_RATES'),
+        ({'cash_flows': [-1000, 600, 600], 'max_rate': float('inf')}, 'INVALID_RATES'),
+    ):
+        rejected = client.post('/npv-curve', json=payload)
+        assert rejected.status_code == 400
+        assert rejected.get_json()['code'] == code
+
+
+def test_calculate_financials_batch_matches_single_requests(client):
+    cash_flows = [[-1000, 300, 300, 300, 300], [-500, 100, 400, -50, 200], [-1000, 0, 0, 0, 0]]
+    response = client.post('/calculate-financials/batch', json={
+        'cash_flows': cash_flows, 'discount_rate': [0.1, 0.05, 0.1], 'include_irr': True
+    })
+
+    assert response.status_code == 200
+    metrics = response.get_json()['data']['metrics']
+    for i, (series, rate) in enumerate(zip(cash_flows, [0.1, 0.05, 0.1])):
+        single = client.post('/calculate-financials', json={'cash_flows': series, 'discount_rate': rate, 'include_irr': True})
+        expected = single.get_json()['data']['metrics']
+        assert metrics['npv'][i] == expected['npv']
+        assert metrics['payback_period_years'][i] == expected['payback_period_years']
+        assert metrics['irr_status'][i] == expected['irr_status']
+
+    default = client.post('/calculate-financials/batch', json={'cash_flows': cash_flows, 'discount_rate': 0.1})
+    assert 'irr' not in default.get_json()['data']['metrics']
+
+    ragged = client.post('/calculate-financials/batch', json={'cash_flows': [[-1, 2], [1]], 'discount_rate': 0.1})
+    assert ragged.status_code == 400
+    assert ragged.get_json()['code'] == 'INVALID_CASH_FLOWS'
+
+
+def test_predict_climate_trajectory_drives_yearly_cash_flows(client):
+    payload = {'temp': 30.0, 'rain': 650.0, 'temp_increase': 1.0}
+    constant = client.post('/predict', json=payload).get_json()['data']['roi_analysis']
+    flat = client.post('/predict', json={**payload, 'climate_trajectory': {'temp_increase': 1.0}}).get_json()['data']['roi_analysis']
+    warming = client.post('/predict', json={
+        **payload, 'climate_trajectory': {'temp_increase': [1.0 + 0.3 * year for year in range(10)]}
+    }).get_json()['data']['roi_analysis']
+
+    assert flat['incremental_cash_flows'] == constant['incremental_cash_flows']
+    assert len(set(warming['incremental_cash_flows'][1:])) > 1
+    assert len(warming['climate_trajectory']['standard_yield_by_year']) == 10
+
+    for bad_values in ([1.0, 2.0], [None] * 10, 'abc'):
+        invalid = client.post('/predict', json={**payload, 'climate_trajectory': {'temp_increase': bad_values}})
+        assert invalid.status_code == 400
+        assert invalid.get_json()['code'] == 'INVALID_CLIMATE_TRAJECTORY'
+
+
+def test_infrastructure_roi_batch_matches_single_asset_roi(client):
+    book = {
+        'flood_depth_m': [1.2, 0.4, 2.6, 0.0],
+        'asset_value': [1e6, 250000, 4e6, 5e5],
+        'daily_revenue': 5000,
+        'capex': [150000, 20000, 600000, 10000],
+        'opex': 2000,
+        'intervention_type': ['sea_wall', 'drainage', 'sea_wall', 'drainage'],
+        'damage_curve': ['generic', 'residential', 'commercial', 'industrial'],
+        'discount_rate': [0.10, 0.08, 0.10, 0.05],
+    }
+    response = client.post('/infrastructure-roi/batch', json=book)
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['num_assets'] == 4
+    for i in range(4):
+        roi = calculate_infrastructure_roi(
+            book['flood_depth_m'][i], book['asset_value'][i], 5000, book['capex'][i], 2000,
+            book['intervention_type'][i], discount_rate=book['discount_rate'][i], damage_curve=book['damage_curve'][i]
+        )
+        assert data['financial_analysis']['npv'][i] == pytest.approx(roi['financial_analysis']['npv'], abs=0.01)
+        assert data['financial_analysis']['bcr'][i] == roi['financial_analysis']['bcr']
+        assert data['financial_analysis']['payback_years'][i] == roi['financial_analysis']['payback_years']
+        assert data['financial_analysis']['invest'][i] == roi['recommendation']['invest']
+        assert data['baseline_scenario']['total_annual_loss'][i] == roi['baseline_scenario']['total_annual_loss']
+
+    invalid = client.post('/infrastructure-roi/batch', json={**book, 'asset_value': [1e6, 2e6]})
+    assert invalid.status_code == 400
+    assert invalid.get_json()['code'] == 'INVALID_ASSET_BOOK'
+
+    negative_depth = client.post('/infrastructure-roi/batch', json={**book, 'flood_depth_m': [1.2, -0.4, 2.6, 0.0]})
+    assert negative_depth.status_code == 400
+    assert 'flood_depth_m must be finite and non-negative (rows 1)' in negative_depth.get_json()['message']
+
+
+def test_tipping_point_flags_zero_rain_and_rejects_negative_rain(client):
+    response = client.post('/tipping-point', json={'sites': [{'temp': 30.0, 'rain': 0.0}, {'temp': 30.0, 'rain': 800.0}]})
+
+    assert response.status_code == 200
+    dry, wet = (site['standard_seed'] for site in response.get_json()['data']['sites'])
+    assert dry['rain_pct_change_lower_status'] == dry['rain_pct_change_upper_status'] == 'undefined_zero_baseline_rain'
+    assert wet['rain_pct_change_upper_status'] != 'undefined_zero_baseline_rain'
+
+    negative = client.post('/tipping-point', json={'sites': [{'temp': 30.0, 'rain': -5.0}]})
+    assert negative.status_code == 400
+    assert negative.get_json()['code'] == 'INVALID_SITES'
+
+
+def test_predict_coastal_flood_rejects_bad_slr_trajectory(client):
+    payload = {
+        'lat': 5.6, 'lon': -0.2, 'slr_projection': 0.5,
+        'intervention_params': {'type': 'sea_wall', 'capex': 50000},
+    }
+    for bad_trajectory in ([0.1] * 5, [0.1] * 19 + [float('nan')], [-0.2] * 20, 'rising'):
+        response = client.post('/predict-coastal-flood', json={
+            **payload, 'infrastructure_params': {'asset_value': 1e6, 'slr_trajectory_m': bad_trajectory}
+        })
+        assert response.status_code == 400
+        assert response.get_json()['code'] == 'INVALID_SLR_TRAJECTORY'
@@ -0,0 +1,210 @@
+import numpy as np
+import pytest
+
+from physics_engine import (
+    CROP_CODES,
+    CROP_NAMES,
+    CROP_PARAMS,
+    MAIZE_HEAT_LOSS_RATE_OPTIMAL,
+    MAIZE_MIN_RAINFALL_MM,
+    MAIZE_OPTIMAL_RAINFALL_MIN_MM,
+    REGIME_DROUGHT,
+    REGIME_HEAT,
+    REGIME_WATERLOG,
+    YieldAccumulator,
+    _calculate_staple_crop_yield,
+    calculate_paired_yield,
+    calculate_paired_yield_batch,
+    calculate_paired_yield_trajectory,
+    calculate_tipping_points,
+    calculate_volatility,
+    calculate_yield,
+    calculate_yield_batch,
+)
+
+
+def _random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "temp": rng.uniform(10.0, 45.0, n),
+        "rain": rng.uniform(0.0, 4000.0, n),
+        "seed_type": rng.integers(0, 2, n),
+        "temp_delta": rng.uniform(-3.0, 5.0, n),
+        "rain_pct_change": rng.uniform(-110.0, 60.0, n),
+    }
+
+
+@pytest.mark.parametrize("crop_type", sorted(CROP_CODES))
+def test_batch_yield_matches_scalar_path(crop_type):
+    inputs = _random_inputs(5000)
+
+    batch = calculate_yield_batch(crop_type=crop_type, **inputs)
+    scalar = np.array([
+        calculate_yield(
+            temp=inputs["temp"][i],
+            rain=inputs["rain"][i],
+            seed_type=int(inputs["seed_type"][i]),
+            crop_type=crop_type,
+            temp_delta=inputs["temp_delta"][i],
+            rain_pct_change=inputs["rain_pct_change"][i],
+        )
+        for i in range(5000)
+    ])
+
+    np.testing.assert_array_equal(batch, scalar)
+
+
+def test_batch_yield_supports_mixed_crops_and_broadcasting():
+    crops = ["maize", "cocoa", "rice", "soy", "wheat"]
+
+    batch = calculate_yield_batch(31.0, 900.0, 1, crops, temp_delta=1.5)
+
+    expected = [calculate_yield(31.0, 900.0, 1, crop, temp_delta=1.5) for crop in crops]
+    np.testing.assert_array_equal(batch, expected)
+    np.testing.assert_array_equal(
+        calculate_yield_batch(31.0, 900.0, 1, [CROP_CODES[c] for c in crops], temp_delta=1.5),
+        expected,
+    )
+
+
+def test_batch_yield_rejects_unknown_crop():
+    with pytest.raises(ValueError):
+        calculate_yield_batch([30.0], [800.0], 0, ["barley"])
+
+
+def test_crop_parameter_table_has_one_row_per_crop_code():
+    for column in CROP_PARAMS:
+        assert column.shape == (len(CROP_NAMES),)
+    assert [CROP_CODES[name] for name in CROP_NAMES] == list(range(len(CROP_NAMES)))
+
+
+def test_keyword_staple_model_matches_registered_maize_row():
+    kwargs = dict(
+        critical_temp_c=CROP_PARAMS.critical_temp_c[CROP_CODES["maize"]],
+        heat_loss_rate_optimal=CROP_PARAMS.heat_loss_rate_optimal[CROP_CODES["maize"]],
+        heat_loss_rate_drought=CROP_PARAMS.heat_loss_rate_drought[CROP_CODES["maize"]],
+        min_rainfall_mm=CROP_PARAMS.min_rainfall_mm[CROP_CODES["maize"]],
+        optimal_rainfall_min_mm=CROP_PARAMS.optimal_rainfall_min_mm[CROP_CODES["maize"]],
+        optimal_rainfall_max_mm=CROP_PARAMS.optimal_rainfall_max_mm[CROP_CODES["maize"]],
+        resilience_delta_c=CROP_PARAMS.resilience_delta_c[CROP_CODES["maize"]],
+        resilience_drought_factor=CROP_PARAMS.resilience_drought_factor[CROP_CODES["maize"]],
+        waterlog_loss_per_100mm=CROP_PARAMS.waterlog_loss_per_100mm[CROP_CODES["maize"]],
+        waterlog_resilience_multiplier=CROP_PARAMS.waterlog_resilience_multiplier[CROP_CODES["maize"]],
+    )
+
+    for temp, rain in [(33.0, 250.0), (31.0, 420.0), (29.0, 900.0), (35.0, 1600.0)]:
+        for seed_type in (0, 1):
+            assert _calculate_staple_crop_yield(
+                temp=temp, rain=rain, seed_type=seed_type, temp_delta=0.5, rain_pct_change=-5.0, **kwargs
+            ) == calculate_yield(temp, rain, seed_type, "maize", 0.5, -5.0)
+
+
+def test_yield_accumulator_streams_and_merges_exactly():
+    rng = np.random.default_rng(3)
+    yields = rng.uniform(0.0, 100.0, 1000)
+
+    streamed = YieldAccumulator()
+    for value in yields[:400]:
+        streamed.update(value)
+    chunked = YieldAccumulator().update_batch(yields[400:700]).update_batch(yields[700:])
+    merged = streamed.merge(YieldAccumulator.from_dict(chunked.to_dict()))
+
+    assert merged.count == 1000
+    assert merged.mean == pytest.approx(yields.mean(), rel=1e-12)
+    assert merged.stdev == pytest.approx(yields.std(ddof=1), rel=1e-12)
+    assert merged.cv() == calculate_volatility(list(yields))
+    assert calculate_volatility([85, 40, 90, 20, 75]) == 49.25
+    assert calculate_volatility([50.0]) == 0.0
+
+
+@pytest.mark.parametrize("crop_type", ["maize", "cocoa"])
+def test_batch_sensitivities_match_finite_differences(crop_type):
+    inputs = _random_inputs(5000, seed=11)
+    result = calculate_yield_batch(crop_type=crop_type, sensitivities=True, **inputs)
+
+    np.testing.assert_array_equal(result.yield_pct, calculate_yield_batch(crop_type=crop_type, **inputs))
+
+    h = 1e-4
+    for name, field in (("temp", "d_yield_d_temp"), ("rain", "d_yield_d_rain")):
+        up = dict(inputs, **{name: inputs[name] + h})
+        down = dict(inputs, **{name: inputs[name] - h})
+        finite_diff = (
+            calculate_yield_batch(crop_type=crop_type, **up) - calculate_yield_batch(crop_type=crop_type, **down)
+        ) / (2 * h)
+        # Points within h of a kink see a blend of two segments
+        agree = np.isclose(finite_diff, getattr(result, field), atol=1e-4)
+        assert agree.mean() > 0.999
+
+
+def test_batch_sensitivities_flag_active_regimes():
+    result = calculate_yield_batch([36.0, 25.0, 25.0], [900.0, 350.0, 1800.0], 0, "maize", sensitivities=True)
+
+    assert list(result.regime) == [REGIME_HEAT, REGIME_DROUGHT, REGIME_WATERLOG]
+    assert result.d_yield_d_temp[0] == -MAIZE_HEAT_LOSS_RATE_OPTIMAL
+    assert result.d_yield_d_rain[1] == pytest.approx(0.5 / (MAIZE_OPTIMAL_RAINFALL_MIN_MM - MAIZE_MIN_RAINFALL_MM) * 100)
+    assert result.d_yield_d_rain[2] < 0
+
+
+@pytest.mark.parametrize("crop_type", ["maize", "cocoa", "rice"])
+def test_tipping_points_match_brute_force_scan(crop_type):
+    rng = np.random.default_rng(4)
+    temps = rng.uniform(18.0, 38.0, 40)
+    rains = rng.uniform(200.0, 3000.0, 40)
+    seeds = rng.integers(0, 2, 40)
+    thresholds = rng.uniform(10.0, 95.0, 40)
+
+    points = calculate_tipping_points(temps, rains, seeds, crop_type, thresholds)
+
+    deltas = np.linspace(-30.0, 30.0, 60001)
+    for i in range(40):
+        below = calculate_yield_batch(temps[i], rains[i], seeds[i], crop_type, temp_delta=deltas) < thresholds[i]
+        if below.all():
+            assert np.isnan(points.temp_delta[i])
+        elif not below.any():
+            assert points.temp_delta[i] > deltas[-1]
+        else:
+            assert points.temp_delta[i] == pytest.approx(deltas[np.argmax(below)], abs=1e-3)
+
+        # Yield at the rainfall bounds sits on the threshold (or stays above it)
+        for bound in (points.rain_pct_change_lower[i], points.rain_pct_change_upper[i]):
+            if np.isfinite(bound):
+                inside = bound + (1e-6 if bound == points.rain_pct_change_lower[i] else -1e-6)
+                outside = bound + (-1e-3 if bound == points.rain_pct_change_lower[i] else 1e-3)
+                assert calculate_yield(temps[i], rains[i], int(seeds[i]), crop_type, 0.0, inside) >= thresholds[i] - 1e-6
+                assert calculate_yield(temps[i], rains[i], int(seeds[i]), crop_type, 0.0, outside) < thresholds[i]
+
+
+def test_paired_yield_matches_two_single_seed_calls():
+    inputs = _random_inputs(3000, seed=9)
+    crops = np.resize(np.arange(len(CROP_NAMES)), 3000)
+
+    paired = calculate_paired_yield_batch(
+        inputs["temp"], inputs["rain"], crops, inputs["temp_delta"], inputs["rain_pct_change"]
+    )
+    for seed_type, yields in ((0, paired.standard_yield), (1, paired.resilient_yield)):
+        np.testing.assert_array_equal(
+            yields,
+            calculate_yield_batch(inputs["temp"], inputs["rain"], seed_type, crops, inputs["temp_delta"], inputs["rain_pct_change"]),
+        )
+
+    for i in range(0, 3000, 97):
+        scalar = calculate_paired_yield(
+            inputs["temp"][i], inputs["rain"][i], CROP_NAMES[crops[i]], inputs["temp_delta"][i], inputs["rain_pct_change"][i]
+        )
+        assert scalar == tuple(field[i] for field in paired)
+
+
+def test_paired_yield_trajectory_is_a_site_by_year_matrix():
+    temp_deltas = np.linspace(0.0, 3.0, 10)
+    rain_changes = np.linspace(0.0, -20.0, 10)
+
+    trajectory = calculate_paired_yield_trajectory([30.0, 34.0], [700.0, 450.0], "maize", temp_deltas, rain_changes)
+
+    assert trajectory.standard_yield.shape == (2, 10)
+    for site, (temp, rain) in enumerate([(30.0, 700.0), (34.0, 450.0)]):
+        for year in (0, 4, 9):
+            expected = calculate_paired_yield(temp, rain, "maize", temp_deltas[year], rain_changes[year])
+            assert trajectory.resilient_yield[site, year] == expected.resilient_yield
+
+    single_site = calculate_paired_yield_trajectory(30.0, 700.0, "cocoa", temp_deltas)
+    assert single_site.standard_yield.shape == (10,)
@@ -0,0 +1,104 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from infrastructure_engine import calculate_infrastructure_roi
+from portfolio_optimizer import (
+    INTERVENTION_OPTIONS,
+    flood_intervention_npv,
+    optimize_intervention_portfolio,
+    resilient_seed_npv,
+)
+
+
+def _best_selection_npv(npv, capex, budget):
+    best = 0.0
+    num_assets, num_options = npv.shape
+    for choice in itertools.product(range(-1, num_options), repeat=num_assets):
+        picked = [(i, j) for i, j in enumerate(choice) if j >= 0]
+        cost = sum(capex[i, j] for i, j in picked)
+        value = sum(npv[i, j] for i, j in picked)
+        if cost <= budget and not np.isnan(value):
+            best = max(best, value)
+    return best
+
+
+def test_selection_stays_within_budget_and_bound_covers_optimum():
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        npv = rng.normal(50.0, 80.0, (4, 3))
+        capex = rng.uniform(0.0, 100.0, (4, 3))
+        npv[rng.random((4, 3)) < 0.1] = np.nan
+        budget = rng.uniform(0.0, 250.0)
+
+        result = optimize_intervention_portfolio(npv, capex, budget)
+        best = _best_selection_npv(npv, capex, budget)
+
+        assert result['total_capex'] <= budget + 1e-9
+        assert result['total_npv'] <= best + 1e-9
+        assert result['upper_bound_npv'] >= best - 1e-9
+        assert result['optimality_gap'] >= result['upper_bound_npv'] - best - 1e-9
+
+
+def test_selection_falls_back_to_options_off_the_greedy_path():
+    # Options 0 and 1 do not fit, option 2 does
+    result = optimize_intervention_portfolio([[72.6, 108.4, 41.1]], [48.2, 19.3, 9.6], budget=10.0)
+    assert result['selected_option'].tolist() == [2]
+    assert result['total_npv'] == pytest.approx(41.1)
+
+    # One large efficient step blocks the budget for a cheaper, better option
+    result = optimize_intervention_portfolio([[1.0, 0.0], [0.0, 90.0]], [[0.1, 0.0], [0.0, 100.0]], budget=100.0)
+    assert result['total_npv'] == pytest.approx(90.0)
+
+    rng = np.random.default_rng(11)
+    for _ in range(100):
+        npv = rng.uniform(0.0, 120.0, (3, 3))
+        capex = rng.uniform(1.0, 60.0, (3, 3))
+        budget = rng.uniform(5.0, 100.0)
+
+        result = optimize_intervention_portfolio(npv, capex, budget)
+        assert result['total_npv'] >= 0.5 * _best_selection_npv(npv, capex, budget) - 1e-9
+
+
+def test_selection_prefers_efficient_options_and_skips_unavailable_ones():
+    npv = np.array([
+        [100.0, 150.0, np.nan],
+        [-10.0, -5.0, 40.0],
+        [30.0, np.nan, 80.0],
+    ])
+    capex = np.array([50.0, 100.0, 20.0])
+
+    result = optimize_intervention_portfolio(npv, capex, budget=90.0, option_names=('a', 'b', 'c'))
+
+    assert result['selected_option'].tolist() == [0, 2, 2]
+    assert result['total_npv'] == pytest.approx(220.0)
+    assert result['budget_remaining'] == pytest.approx(0.0)
+    assert result['option_counts'] == {'a': 1, 'b': 0, 'c': 2}
+
+    nothing = optimize_intervention_portfolio(npv, capex, budget=0.0)
+    assert nothing['selected_option'].tolist() == [-1, -1, -1]
+
+    with pytest.raises(ValueError):
+        optimize_intervention_portfolio(npv, capex, budget=-1.0)
+
+
+def test_flood_intervention_npv_matches_infrastructure_roi():
+    depths = np.array([0.2, 1.4, 3.5])
+    npv = flood_intervention_npv(depths[:, None], np.array([2.0, 0.3]), 1e6, 5000.0, 150000.0, 2000.0)
+
+    for i, depth in enumerate(depths):
+        for j, (intervention, kwargs) in enumerate([
+            ('sea_wall', {'wall_height_m': 2.0}),
+            ('drainage', {'drainage_reduction_m': 0.3}),
+        ]):
+            roi = calculate_infrastructure_roi(depth, 1e6, 5000.0, 150000.0, 2000.0, intervention, **kwargs)
+            assert npv[i, j] == pytest.approx(roi['financial_analysis']['npv'], abs=0.01)
+
+
+def test_resilient_seed_npv_prices_many_sites():
+    npv = resilient_seed_npv(np.array([28.0, 34.0, 38.0]), np.array([800.0, 500.0, 300.0]))
+
+    assert npv.shape == (3,)
+    assert np.all(np.isfinite(npv))
+    assert len(INTERVENTION_OPTIONS) == 5
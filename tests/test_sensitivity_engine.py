@@ -0,0 +1,34 @@
+import pytest
+
+from financial_engine import calculate_npv
+from physics_engine import calculate_paired_yield
+from sensitivity_engine import TORNADO_DRIVERS, run_tornado_analysis
+
+
+def _npv_for(temp, rain, capex=2000.0, opex=425.0, price=4800.0, benefit=30.0, rate=0.10, temp_increase=0.0, rain_change=0.0):
+    yields = calculate_paired_yield(temp, rain, 'maize', temp_increase, rain_change)
+    annual = yields.resilient_yield * (1 + benefit / 100) * price - opex - yields.standard_yield * price
+    return calculate_npv([-capex] + [annual] * 10, rate)
+
+
+def test_tornado_rows_match_one_at_a_time_evaluation():
+    result = run_tornado_analysis(
+        33.0, 450.0, 'maize',
+        bounds={'price_per_ton': {'low': 3000.0, 'high': 6000.0}, 'temp_increase': {'low': -1.0, 'high': 2.5}},
+    )
+
+    rows = {row['driver']: row for row in result['sensitivity']}
+    assert set(rows) == set(TORNADO_DRIVERS)
+    assert result['base_case']['npv'] == pytest.approx(_npv_for(33.0, 450.0), abs=0.01)
+    assert rows['price_per_ton']['npv_at_high'] == pytest.approx(_npv_for(33.0, 450.0, price=6000.0), abs=0.01)
+    assert rows['temp_increase']['npv_at_high'] == pytest.approx(_npv_for(33.0, 450.0, temp_increase=2.5), abs=0.01)
+    assert rows['capex']['low_value'] == pytest.approx(1600.0)
+
+    swings = [row['swing'] for row in result['sensitivity']]
+    assert swings == sorted(swings, reverse=True)
+    assert [row['rank'] for row in result['sensitivity']] == list(range(1, len(TORNADO_DRIVERS) + 1))
+
+
+def test_tornado_rejects_unknown_driver():
+    with pytest.raises(ValueError):
+        run_tornado_analysis(30.0, 600.0, bounds={'fertilizer': {'low': 0, 'high': 1}})
@@ -0,0 +1,42 @@
+import numpy as np
+
+from physics_engine import calculate_yield_batch
+from yield_lookup import build_yield_surfaces, lookup_yield_batch
+
+
+def test_lookup_surfaces_match_exact_kernel_within_reported_error(tmp_path):
+    path = str(tmp_path / "surfaces.npy")
+    report = build_yield_surfaces(path, temp_step=0.5, rain_step=25.0, num_error_samples=20_000)
+
+    assert report["max_abs_error"] < 1.0
+
+    rng = np.random.default_rng(7)
+    n = 10_000
+    temp = rng.uniform(15.0, 40.0, n)
+    rain = rng.uniform(100.0, 3000.0, n)
+    seed_type = rng.integers(0, 2, n)
+    crops = rng.integers(0, 5, n)
+    temp_delta = rng.uniform(0.0, 3.0, n)
+    rain_pct_change = rng.uniform(-20.0, 20.0, n)
+
+    exact = calculate_yield_batch(temp, rain, seed_type, crops, temp_delta, rain_pct_change)
+    approx = lookup_yield_batch(temp, rain, seed_type, crops, temp_delta, rain_pct_change, path=path)
+
+    assert np.max(np.abs(approx - exact)) <= report["max_abs_error"] + 1e-6
+
+    # Grid nodes (including the jump at the optimal rainfall minimum) are exact
+    nodes = lookup_yield_batch([35.0, 35.0], [475.0, 500.0], 0, "maize", path=path)
+    np.testing.assert_allclose(nodes, calculate_yield_batch([35.0, 35.0], [475.0, 500.0], 0, "maize"), atol=1e-4)
+
+
+def test_lookup_falls_back_to_exact_kernel_outside_grid(tmp_path):
+    path = str(tmp_path / "surfaces.npy")
+    build_yield_surfaces(path, temp_step=1.0, rain_step=50.0, num_error_samples=1_000)
+
+    temp = np.array([75.0, -20.0])
+    rain = np.array([800.0, 9000.0])
+
+    np.testing.assert_array_equal(
+        lookup_yield_batch(temp, rain, 1, "wheat", path=path),
+        calculate_yield_batch(temp, rain, 1, "wheat"),
+    )
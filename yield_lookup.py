@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Precomputed yield lookup surfaces.
+
+Builds a dense grid of yields per (crop, seed_type) over *effective*
+temperature and rainfall (i.e. after the climate perturbation has been
+applied), stores it as a `.npy` artifact and answers queries by bilinear
+interpolation.
+
+The model is continuous in temperature but jumps in rainfall at some regime
+boundaries (e.g. the drought heat-loss rate switches off at the optimal
+rainfall minimum). It is right-continuous in rainfall, so each node stores
+both its value and its left limit; a cell interpolates towards the left limit
+of its upper rain node, which keeps jumps that sit on grid lines exact.
+
+The artifact is opened with `mmap_mode='r'`, so every gunicorn worker shares
+the same read-only pages instead of holding its own copy.
+
+Build the artifact:
+  python yield_lookup.py --build
+
+Query it:
+  from physics_engine import calculate_yield_batch
+  calculate_yield_batch(temp, rain, seed_type, 'maize', method='lookup')
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from physics_engine import CROP_NAMES, _to_crop_codes, calculate_yield_batch
+
+
+DEFAULT_SURFACE_PATH = os.environ.get('YIELD_SURFACE_PATH', 'yield_surfaces.npy')
+
+# Grid over effective temperature (°C) and effective rainfall (mm).
+# Every model threshold is a multiple of 0.5°C / 50mm, so the kinks of the
+# piecewise model sit on grid lines.
+TEMP_MIN_C = -10.0
+TEMP_MAX_C = 60.0
+TEMP_STEP_C = 0.1
+RAIN_MIN_MM = 0.0
+RAIN_MAX_MM = 5000.0
+RAIN_STEP_MM = 5.0
+
+NUM_ERROR_SAMPLES = 1_000_000
+
+_loaded_surfaces: dict = {}
+
+
+def _metadata_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.json'
+
+
+def _grid_axes(temp_min, temp_max, temp_step, rain_min, rain_max, rain_step):
+    n_temp = int(round((temp_max - temp_min) / temp_step)) + 1
+    n_rain = int(round((rain_max - rain_min) / rain_step)) + 1
+    temps = temp_min + temp_step * np.arange(n_temp)
+    rains = rain_min + rain_step * np.arange(n_rain)
+    return temps, rains
+
+
+def _interpolate(surfaces: np.ndarray, meta: dict, codes, resilient, sim_temp, sim_rain) -> np.ndarray:
+    """Bilinear interpolation on the surface grid (inputs must lie inside the grid)."""
+    n_temp = meta['n_temp']
+    n_rain = meta['n_rain']
+
+    ti = (sim_temp - meta['temp_min']) / meta['temp_step']
+    ri = (sim_rain - meta['rain_min']) / meta['rain_step']
+    t0 = np.clip(np.floor(ti).astype(np.int64), 0, n_temp - 2)
+    r0 = np.clip(np.floor(ri).astype(np.int64), 0, n_rain - 2)
+    ft = ti - t0
+    fr = ri - r0
+
+    # Side 0 holds node values, side 1 holds left limits in rainfall
+    seed = resilient.astype(np.int64)
+    y00 = surfaces[codes, seed, 0, t0, r0]
+    y01 = surfaces[codes, seed, 1, t0, r0 + 1]
+    y10 = surfaces[codes, seed, 0, t0 + 1, r0]
+    y11 = surfaces[codes, seed, 1, t0 + 1, r0 + 1]
+
+    return (
+        y00 * (1.0 - ft) * (1.0 - fr)
+        + y01 * (1.0 - ft) * fr
+        + y10 * ft * (1.0 - fr)
+        + y11 * ft * fr
+    )
+
+
+def build_yield_surfaces(
+    path: str = DEFAULT_SURFACE_PATH,
+    temp_step: float = TEMP_STEP_C,
+    rain_step: float = RAIN_STEP_MM,
+    num_error_samples: int = NUM_ERROR_SAMPLES,
+    random_seed: int = 42,
+) -> dict:
+    """
+    Build the lookup surfaces, save them and measure the interpolation error.
+
+    Surfaces are stored as float32 with shape (crop, seed_type, side, temp, rain),
+    where side 0 is the node value and side 1 the left limit in rainfall.
+
+    The error is measured against the exact kernel at every cell centre (where
+    bilinear error peaks) plus a seeded random sample of effective inputs.
+
+    Args:
+        path: Output `.npy` path (a `.json` metadata file is written next to it)
+        temp_step: Grid spacing in °C
+        rain_step: Grid spacing in mm
+        num_error_samples: Number of random points used for the error check
+        random_seed: Seed for the random error sample
+
+    Returns:
+        Build report with grid shape and maximum absolute interpolation error
+        (in yield percentage points), overall and per crop/seed type
+    """
+    start = time.perf_counter()
+
+    temps, rains = _grid_axes(TEMP_MIN_C, TEMP_MAX_C, temp_step, RAIN_MIN_MM, RAIN_MAX_MM, rain_step)
+    grid_temp = temps[:, None]
+    grid_rain = rains[None, :]
+
+    grid_rain_left = np.nextafter(grid_rain, -np.inf)
+
+    surfaces = np.empty((len(CROP_NAMES), 2, 2, len(temps), len(rains)), dtype=np.float32)
+    for code in range(len(CROP_NAMES)):
+        for seed_type in (0, 1):
+            surfaces[code, seed_type, 0] = calculate_yield_batch(grid_temp, grid_rain, seed_type, code)
+            surfaces[code, seed_type, 1] = calculate_yield_batch(grid_temp, grid_rain_left, seed_type, code)
+
+    np.save(path, surfaces)
+
+    meta = {
+        'crops': list(CROP_NAMES),
+        'temp_min': float(temps[0]),
+        'temp_step': float(temp_step),
+        'n_temp': int(len(temps)),
+        'rain_min': float(rains[0]),
+        'rain_step': float(rain_step),
+        'n_rain': int(len(rains)),
+    }
+
+    # Interpolation error against the exact kernel
+    rng = np.random.default_rng(random_seed)
+    centre_temp = ((temps[:-1] + temps[1:]) / 2.0)[:, None]
+    centre_rain = ((rains[:-1] + rains[1:]) / 2.0)[None, :]
+    sample_temp = rng.uniform(temps[0], temps[-1], num_error_samples)
+    sample_rain = rng.uniform(rains[0], rains[-1], num_error_samples)
+
+    error_by_crop = {}
+    max_abs_error = 0.0
+    for code, crop_name in enumerate(CROP_NAMES):
+        error_by_crop[crop_name] = {}
+        for seed_type in (0, 1):
+            worst = 0.0
+            for sim_temp, sim_rain in (
+                np.broadcast_arrays(centre_temp, centre_rain),
+                (sample_temp, sample_rain),
+            ):
+                exact = calculate_yield_batch(sim_temp, sim_rain, seed_type, code)
+                approx = _interpolate(
+                    surfaces, meta, np.asarray(code), np.asarray(seed_type == 1), sim_temp, sim_rain
+                )
+                worst = max(worst, float(np.max(np.abs(approx - exact))))
+            error_by_crop[crop_name][str(seed_type)] = round(worst, 6)
+            max_abs_error = max(max_abs_error, worst)
+
+    meta['max_abs_error'] = round(max_abs_error, 6)
+    meta['max_abs_error_by_crop'] = error_by_crop
+    meta['built_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    with open(_metadata_path(path), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+        f.write('\n')
+
+    _loaded_surfaces.pop(path, None)
+
+    return {
+        'path': path,
+        'shape': list(surfaces.shape),
+        'size_mb': round(surfaces.nbytes / 1_000_000, 1),
+        'max_abs_error': meta['max_abs_error'],
+        'max_abs_error_by_crop': error_by_crop,
+        'build_seconds': round(time.perf_counter() - start, 2),
+    }
+
+
+def load_yield_surfaces(path: str = DEFAULT_SURFACE_PATH) -> tuple[np.ndarray, dict]:
+    """
+    Open the lookup surfaces as a read-only memory map (cached per process).
+
+    Raises:
+        FileNotFoundError: If the artifact has not been built
+        ValueError: If the artifact was built for a different crop table
+    """
+    if path not in _loaded_surfaces:
+        with open(_metadata_path(path), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        if tuple(meta['crops']) != CROP_NAMES:
+            raise ValueError(
+                f"Yield surfaces at {path} were built for crops {meta['crops']}; "
+                "rebuild with `python yield_lookup.py --build`"
+            )
+
+        surfaces = np.load(path, mmap_mode='r')
+        _loaded_surfaces[path] = (surfaces, meta)
+
+    return _loaded_surfaces[path]
+
+
+def lookup_yield_batch(
+    temp,
+    rain,
+    seed_type,
+    crop_type='maize',
+    temp_delta=0.0,
+    rain_pct_change=0.0,
+    path: str = DEFAULT_SURFACE_PATH,
+) -> np.ndarray:
+    """
+    Approximate `calculate_yield_batch` by bilinear interpolation on the surfaces.
+
+    Effective inputs outside the grid fall back to the exact kernel, so the
+    lookup never extrapolates.
+
+    Returns:
+        Array of yields as percentage (0-100)
+    """
+    surfaces, meta = load_yield_surfaces(path)
+
+    codes = _to_crop_codes(crop_type)
+    sim_temp = np.asarray(temp, dtype=float) + np.asarray(temp_delta, dtype=float)
+    sim_rain = np.maximum(0.0, np.asarray(rain, dtype=float) * (1 + (np.asarray(rain_pct_change, dtype=float) / 100)))
+    resilient = np.asarray(seed_type) == 1
+
+    codes, resilient, sim_temp, sim_rain = np.broadcast_arrays(codes, resilient, sim_temp, sim_rain)
+
+    temp_max = meta['temp_min'] + meta['temp_step'] * (meta['n_temp'] - 1)
+    rain_max = meta['rain_min'] + meta['rain_step'] * (meta['n_rain'] - 1)
+    inside = (
+        (sim_temp >= meta['temp_min']) & (sim_temp <= temp_max)
+        & (sim_rain >= meta['rain_min']) & (sim_rain <= rain_max)
+    )
+
+    yields = _interpolate(surfaces, meta, codes, resilient, sim_temp, sim_rain)
+
+    if not np.all(inside):
+        outside = ~inside
+        yields = np.array(yields, dtype=float)
+        yields[outside] = calculate_yield_batch(
+            sim_temp[outside], sim_rain[outside], resilient[outside].astype(int), codes[outside]
+        )
+
+    return yields
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Build precomputed yield lookup surfaces')
+    parser.add_argument('--build', action='store_true', required=True,
+                        help='Build the surfaces and report the interpolation error')
+    parser.add_argument('--output', type=str, default=DEFAULT_SURFACE_PATH,
+                        help=f'Output .npy path (default: {DEFAULT_SURFACE_PATH})')
+    parser.add_argument('--temp-step', type=float, default=TEMP_STEP_C,
+                        help=f'Temperature grid spacing in °C (default: {TEMP_STEP_C})')
+    parser.add_argument('--rain-step', type=float, default=RAIN_STEP_MM,
+                        help=f'Rainfall grid spacing in mm (default: {RAIN_STEP_MM})')
+    args = parser.parse_args()
+
+    report = build_yield_surfaces(args.output, temp_step=args.temp_step, rain_step=args.rain_step)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()